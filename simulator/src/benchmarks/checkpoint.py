@@ -0,0 +1,76 @@
+# type: ignore
+"""Checkpoint and restore time of a warmed-up simulation, and the size of the checkpoint file.
+
+Runs the map for --ticks, then per worker count writes Simulation.checkpoint a few times and
+restores it into a freshly started simulation. The restored run continues for --continue-ticks
+next to the original one; both must write the same log from there on.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.checkpoint --map maps/mega_line.json --ticks 1800000 --workers 1 4
+"""
+
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+from sim.engine import NetworkTopologyLoader, Simulation
+
+GUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def read_log(log_path: str) -> Counter:
+    with open(log_path) as f:
+        return Counter(GUID.sub("<guid>", line) for line in f if not line.startswith("---"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--ticks", type=int, default=1_800_000)
+    parser.add_argument("--continue-ticks", type=int, default=300_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    device_neighbors = NetworkTopologyLoader.from_file(args.map)
+    print(f"{args.map}: {len(device_neighbors)} devices, checkpoint at tick {args.ticks}")
+    print(f"{'workers':>7} {'warm-up':>8} {'checkpoint':>11} {'restore':>8} {'size':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_workers in args.workers:
+            path = os.path.join(tmp, f"{n_workers}.ckpt")
+            original = Simulation(log_path=os.path.join(tmp, f"{n_workers}-original.log"), device_neighbors=device_neighbors, n_workers=n_workers)
+            start = time.perf_counter()
+            original.run_for(args.ticks, keep_workers=True)
+            warm_up = time.perf_counter() - start
+
+            checkpoint_times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                original.checkpoint(path)
+                checkpoint_times.append(time.perf_counter() - start)
+
+            restore_times = []
+            for attempt in range(args.repeat):
+                restored = Simulation(log_path=os.path.join(tmp, f"{n_workers}-restored-{attempt}.log"), device_neighbors=device_neighbors, n_workers=n_workers)
+                start = time.perf_counter()
+                restored.restore(path)
+                restore_times.append(time.perf_counter() - start)
+                if attempt < args.repeat - 1:
+                    restored.close()
+
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{n_workers:>7} {warm_up:>7.2f}s {statistics.median(checkpoint_times):>10.3f}s {statistics.median(restore_times):>7.3f}s {size_mb:>7.1f}MB")
+
+            # Continue both and compare what they log after the checkpoint
+            original_log = read_log(original.log.log_path)
+            original.run_for(args.ticks + args.continue_ticks)
+            restored.run_for(args.ticks + args.continue_ticks)
+            assert read_log(original.log.log_path) - original_log == read_log(restored.log.log_path), f"restored run diverged with {n_workers} workers"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# type: ignore
+"""Receive-queue collision resolution: pairwise reference vs. interval-index resolver, by concurrent neighbours.
+
+Every neighbour sends one frame of --airtime ticks at a random start inside a window that grows with the
+neighbour count, so the average number of frames on air at once stays at --density. A few senders cancel
+their frame halfway. Both resolvers must return the same frames and collision flag. Transceivers use
+the pairwise loop up to PAIRWISE_MAX_EVENTS queued events and the index above.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.d2d_collisions --neighbours 8 32 128 512 2048
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from custom_types import EventNet, EventNetTypes, MediumTypes
+from node.transceiver.collision import PAIRWISE_MAX_EVENTS, successful_receptions_indexed, successful_receptions_pairwise
+
+
+def make_queue(rng: random.Random, neighbours: int, airtime: int, density: float) -> list[EventNet]:
+    span = max(airtime, int(neighbours * airtime / density))
+    queue = []
+    for nid in range(neighbours):
+        start = rng.randrange(span)
+        queue.append(EventNet(node_id=nid, time_start=start, time_end=start + airtime, type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D))
+    for sent in rng.sample(queue, k=max(1, neighbours // 50)):
+        queue.append(EventNet(node_id=sent.node_id, time_start=sent.time_start + airtime // 2, time_end=sent.time_end, type=EventNetTypes.CANCELED, type_medium=MediumTypes.LORA_D2D))
+    queue.sort(key=lambda e: e.time_start)
+    return queue
+
+
+def timed(resolve, queue: list[EventNet], current: int, repeat: int) -> tuple[float, tuple]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = resolve(queue, current, 0)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--neighbours", type=int, nargs="+", default=[8, 32, 128, 512, 2048])
+    parser.add_argument("--airtime", type=int, default=50, help="frame length in ticks, ~SF7 for a short D2D frame")
+    parser.add_argument("--density", type=float, default=2.0, help="frames on air at once on average")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"airtime {args.airtime} ticks, {args.density:g} frames on air on average, index used above {PAIRWISE_MAX_EVENTS} events")
+    print(f"{'neighbours':>10} {'received':>9} {'pairwise':>10} {'index':>10} {'speed-up':>9}")
+    for neighbours in args.neighbours:
+        queue = make_queue(rng, neighbours, args.airtime, args.density)
+        current = max(e.time_end for e in queue) + 1
+        pairwise_time, expected = timed(successful_receptions_pairwise, queue, current, args.repeat)
+        index_time, result = timed(successful_receptions_indexed, queue, current, args.repeat)
+        assert result[1] == expected[1] and len(result[0]) == len(expected[0]) and all(a is b for a, b in zip(result[0], expected[0])), f"resolvers disagree for {neighbours} neighbours"
+        print(f"{neighbours:>10} {len(result[0]):>9} {pairwise_time * 1e3:>8.2f}ms {index_time * 1e3:>8.2f}ms {pairwise_time / index_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# type: ignore
+"""Tick-by-tick dispatch: propagate once all workers replied ("barrier") vs. per reply ("pipelined").
+
+Prints the main-side phase breakdown of both modes next to the engine's node tick / propagation /
+log totals. Pipelined dispatch moves medium propagation out of the tick tail and into the time
+otherwise spent waiting on slower workers, so "wait" + "propagation" is the part that shrinks.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.dispatch_phases --map maps/mega_line.json --ticks 3600000 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from ctypes import c_int
+from multiprocessing import Value
+
+from custom_types import SimState
+from sim.engine import DISPATCH_MODES, NetworkTopologyLoader, Simulation
+
+
+def run(map_path: str, stop_tick: int, n_workers: int, dispatch: str, log_path: str) -> tuple[Simulation, float]:
+    status = Value(c_int, SimState.RUNNING.value)
+    sim = Simulation(log_path=log_path, status=status, device_neighbors=NetworkTopologyLoader.from_file(map_path), n_workers=n_workers, dispatch=dispatch)
+    start = time.perf_counter()
+    sim.run_for(stop_tick)
+    return sim, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--ticks", type=int, default=3_600_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for dispatch in DISPATCH_MODES:
+            sim, elapsed = run(args.map, args.ticks, args.workers, dispatch, os.path.join(tmp, f"{dispatch}.log"))
+            stats = sim.stats
+            phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in sim.phase_time.items())
+            print(f"{dispatch:<10} {elapsed:6.2f}s total, node tick {stats['node_tick_time']:.2f}s, propagation {stats['propagation_time']:.2f}s, {stats['ticks']} ticks")
+            print(f"{'':<10} {phases}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# type: ignore
+"""Event queue micro-benchmark: SortedDict DeviceEventQueue vs. two-level timing wheel.
+
+The add/pop sequence of the main process queue is recorded from a real tick-by-tick run and replayed
+against both implementations. --scale N replays N interleaved copies of the network (node ids offset,
+ticks shifted by a few ms per copy) to get 10k+ node queue sizes out of the bundled maps.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.event_queue --map maps/mega_line.json --hours 1 --scale 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from array import array
+from ctypes import c_int
+from multiprocessing import Value
+
+from custom_types import SimState
+from sim.device_event_queue import EVENT_QUEUES, DeviceEventQueue
+from sim.engine import NetworkTopologyLoader, Simulation
+
+_TICKS_PER_HOUR = 3_600_000
+_POP = -1  # op marker in the trace, (node_id, tick) pairs otherwise; ~node_id marks a schedule_next
+_NO_TICK = -1
+_COPY_SHIFT = 7  # ms between scaled network copies
+
+
+class RecordingEventQueue(DeviceEventQueue):
+    """DeviceEventQueue that logs every operation into a flat int array."""
+
+    def __init__(self):
+        super().__init__()
+        self.trace = array("q")
+        self.init_ids: list[int] = []
+        self.start_tick = 0
+
+    def init_tick(self, start_tick: int, node_ids: list[int]) -> None:
+        super().init_tick(start_tick, node_ids)
+        self.start_tick, self.init_ids = start_tick, list(node_ids)
+        self.trace = array("q")  # the initial wakes travel in the header
+
+    def schedule_next(self, node_id: int, tick: int | None) -> None:
+        super().schedule_next(node_id, tick)
+        self.trace.extend((~node_id, _NO_TICK if tick is None else tick))
+
+    def add_event(self, node_id: int, tick: int | None) -> None:
+        super().add_event(node_id, tick)
+        if tick is not None:
+            self.trace.extend((node_id, tick))
+
+    def get_next_events(self):
+        tick, node_ids = super().get_next_events()
+        self.trace.extend((_POP, tick))
+        return tick, node_ids
+
+
+def record(map_path: str, stop_tick: int, trace_path: str) -> None:
+    EVENT_QUEUES["recording"] = RecordingEventQueue
+    device_neighbors = NetworkTopologyLoader.from_file(map_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        status = Value(c_int, SimState.RUNNING.value)
+        sim = Simulation(log_path=os.path.join(tmp, "record.log"), status=status, device_neighbors=device_neighbors, event_queue="recording")
+        sim.run_for(stop_tick)
+
+    queue = sim.event_queue
+    header = array("q", [queue.start_tick, len(queue.init_ids), *queue.init_ids])
+    with open(trace_path, "wb") as f:
+        header.tofile(f)
+        queue.trace.tofile(f)
+
+
+def load(trace_path: str) -> tuple[int, list[int], list[int]]:
+    ops = array("q")
+    with open(trace_path, "rb") as f:
+        ops.frombytes(f.read())
+    start_tick, n_ids = ops[0], ops[1]
+    return start_tick, ops[2 : 2 + n_ids].tolist(), ops[2 + n_ids :].tolist()
+
+
+def describe(start_tick: int, ops: list[int]) -> None:
+    """Summarise the recorded schedule: how far ahead events are placed and how busy ticks are."""
+    now, deltas, pops = start_tick, [], 0
+    for i in range(0, len(ops), 2):
+        nid, tick = ops[i], ops[i + 1]
+        if nid == _POP:
+            now, pops = tick, pops + 1
+        elif tick != _NO_TICK:
+            deltas.append(tick - now)
+    deltas.sort()
+    pct = {p: deltas[min(len(deltas) - 1, int(p / 100 * len(deltas)))] for p in (10, 50, 90, 99, 100)}
+    print(f"recorded: {len(deltas)} adds, {pops} pops, last tick {now}")
+    print(f"schedule_next share of adds: {sum(1 for i in range(0, len(ops), 2) if ops[i] < _POP) / max(1, len(deltas)):.0%}")
+    print("add lead time [ticks]: " + ", ".join(f"p{p} {v}" for p, v in pct.items()))
+
+
+def replay(queue_cls, start_tick: int, init_ids: list[int], ops: list[int], scale: int) -> tuple[float, int]:
+    """Replay the trace; returns (seconds, checksum over popped ticks and set sizes)."""
+    id_offset = max(init_ids) + 1
+    queue = queue_cls()
+    checksum = 0
+    begin = time.perf_counter()
+    queue.init_tick(start_tick, [nid + k * id_offset for k in range(scale) for nid in init_ids])
+    if scale == 1:
+        for i in range(0, len(ops), 2):
+            nid = ops[i]
+            if nid == _POP:
+                tick, node_ids = queue.get_next_events()
+                checksum += tick * len(node_ids)
+            elif nid < 0:
+                tick = ops[i + 1]
+                queue.schedule_next(~nid, None if tick == _NO_TICK else tick)
+            else:
+                queue.add_event(nid, ops[i + 1])
+    else:
+        for i in range(0, len(ops), 2):
+            nid, tick = ops[i], ops[i + 1]
+            if nid == _POP:
+                for t, node_ids in queue.pop_events_until(tick):
+                    checksum += t * len(node_ids)
+            elif nid < 0:
+                for k in range(scale):
+                    queue.schedule_next(~nid + k * id_offset, None if tick == _NO_TICK else tick + k * _COPY_SHIFT)
+            else:
+                for k in range(scale):
+                    queue.add_event(nid + k * id_offset, tick + k * _COPY_SHIFT)
+    elapsed = time.perf_counter() - begin
+    return elapsed, checksum + queue.suppressed_wakeups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--trace", default=None, help="trace file, recorded first if missing")
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    trace_path = args.trace or f"event_queue_{os.path.splitext(os.path.basename(args.map))[0]}_{args.hours:g}h.trace"
+    if not os.path.exists(trace_path):
+        start = time.perf_counter()
+        record(args.map, int(args.hours * _TICKS_PER_HOUR), trace_path)
+        print(f"recorded {trace_path} in {time.perf_counter() - start:.1f} s")
+
+    start_tick, init_ids, ops = load(trace_path)
+    describe(start_tick, ops)
+
+    results = {name: replay(cls, start_tick, init_ids, ops, args.scale) for name, cls in EVENT_QUEUES.items() if name != "recording"}
+    n_ops = len(ops) // 2 * args.scale
+    print(f"replay x{args.scale} ({len(init_ids) * args.scale} nodes)")
+    for name, (elapsed, _) in results.items():
+        print(f"{name:<8} {elapsed:8.3f} s  {elapsed / n_ops * 1e9:7.0f} ns/op")
+    checksums = {checksum for _, checksum in results.values()}
+    print(f"same pop sequence: {len(checksums) == 1}")
+
+
+if __name__ == "__main__":
+    main()
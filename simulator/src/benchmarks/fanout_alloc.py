@@ -0,0 +1,124 @@
+# type: ignore
+"""D2D reception fan-out memory: a frame copy per receiver vs. one shared reception with a per-sender RSSI table, measured with tracemalloc.
+
+Nodes sit on a line --spacing metres apart and reach every node within --range-m, so a transmission
+fans out to about 2 * range / spacing receivers. Every node sends one frame and the receptions are
+kept, as they are until the receivers wake. "copies" is the fan-out before shared receptions (an
+EventNet and a frame per receiver plus a DEBUG line each), "medium" is LoraD2DMedium and "cluster"
+a worker's ClusterMediumService with every receiver in its cluster. Retained is what the queued
+receptions hold, peak the most traced memory at any point while fanning out; both are measured on
+a second round of transmissions, after the first built the per-sender RSSI tables.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.fanout_alloc --nodes 1000 --range-m 50 100 200
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import defaultdict
+from copy import replace
+
+from custom_types import Area, EventNet, EventNetTypes, LoRaD2DFrame, LoRaD2DFrameType, MediumTypes, NodeMediumInfo, Severity
+from logger.simple_logger import SimpleLogger
+from medium.lora_d2d_medium import LoraD2DMedium
+from medium.range_reach import RangePropagation
+from payload_types import PayloadHopCntFull
+from sim.device_event_queue import DeviceEventQueue
+from sim.engine import ClusterMediumService
+
+
+def line_topology(n_nodes: int, spacing_m: float) -> dict[int, NodeMediumInfo]:
+    topology = {nid: NodeMediumInfo(position=(nid * spacing_m, 0), neighbors=[n for n in (nid - 1, nid + 1) if 1 <= n <= n_nodes], gateways_in_range=[]) for nid in range(1, n_nodes + 1)}
+    topology[0] = NodeMediumInfo(position=(0, 0), neighbors=[1], gateways_in_range=[], is_gateway=True)
+    return topology
+
+
+def make_frame(source: int) -> LoRaD2DFrame:
+    payload = PayloadHopCntFull(cnt=3, slot_period_counter=1, use_slot=2, time_offset_from_period_start=5, local_time=100)
+    return LoRaD2DFrame(source_node_id=source, destination_node_id={source + 1}, type=LoRaD2DFrameType.CURRENT_HOP_COUNT, payload=payload)
+
+
+def copies(reach, log):
+    """Reference: the fan-out before shared receptions."""
+
+    def send(senders: list[int]) -> dict:
+        node_receptions = defaultdict(list)
+        for sender in senders:
+            event = EventNet(sender, 0, 60, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, make_frame(sender))
+            for to_node_id, rssi in reach[sender]:
+                node_receptions[to_node_id].append(replace(event, data=replace(event.data, rssi=rssi)))
+                log.add(Severity.DEBUG, Area.MEDIUM, 0, f"Medium {MediumTypes.LORA_D2D} transmitting from node {sender} to node {to_node_id} with data {event.data} from global tick {event.time_start} to global tick {event.time_end}")
+        return node_receptions
+
+    return send
+
+
+def medium(reach, log):
+    d2d = LoraD2DMedium({}, DeviceEventQueue(), log)
+    d2d.set_reach_map(reach)
+
+    def send(senders: list[int]) -> dict:
+        for sender in senders:
+            d2d.add_transmission_event(EventNet(sender, 0, 60, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, make_frame(sender)))
+        d2d.propagate_pending(0)
+        node_receptions, d2d.node_receptions = d2d.node_receptions, defaultdict(list)
+        return node_receptions
+
+    return send
+
+
+def cluster(reach, log):
+    service = ClusterMediumService(frozenset(reach), reach)
+
+    def send(senders: list[int]) -> list:
+        for sender in senders:
+            service.transmit(sender, MediumTypes.LORA_D2D, make_frame(sender), 0, 60)
+        service.flush_d2d(0)
+        service._intra_ongoing.clear()
+        return service.drain_intra_receptions()
+
+    return send
+
+
+def measure(send, senders: list[int]) -> tuple[int, int, int, float]:
+    """(retained bytes, retained blocks, peak bytes, seconds) of one transmission of every sender."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    receptions = send(senders)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+    del receptions
+    return sum(s.size_diff for s in stats), sum(s.count_diff for s in stats), peak, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--spacing", type=float, default=10.0, help="metres between neighbouring nodes")
+    parser.add_argument("--range-m", type=float, nargs="+", default=[50.0, 100.0, 200.0])
+    parser.add_argument("--log-level", choices=[s.value for s in Severity], default="INFO", help="messages below it are dropped, as with the simulator's --log-level")
+    args = parser.parse_args()
+
+    topology = line_topology(args.nodes, args.spacing)
+    senders = list(range(1, args.nodes + 1))
+    log = SimpleLogger("/dev/null", buffer_size=1 << 30, min_severity=Severity(args.log_level))
+    print(f"{args.nodes} node line, {args.spacing:g} m spacing, log level {args.log_level}")
+    print(f"{'range':>7} {'receivers':>9} {'fan-out':<8} {'retained':>10} {'blocks':>8} {'peak':>10} {'time':>8}")
+    for range_m in args.range_m:
+        reach = LoraD2DMedium.build_range_reach_map(topology, RangePropagation(max_range_m=range_m))
+        receivers = sum(len(reach[nid]) for nid in senders)  # also builds every reach map row up front
+        for fan_out in (copies, medium, cluster):
+            send = fan_out(reach, log)
+            send(senders)  # the first transmissions build the per-sender RSSI tables, measure a later round
+            retained, blocks, peak, seconds = measure(send, senders)
+            print(f"{range_m:>6g}m {receivers / args.nodes:>9.1f} {fan_out.__name__:<8} {retained / 1024:>8.0f}KB {blocks:>8} {peak / 1024:>8.0f}KB {seconds * 1e3:>6.1f}ms")
+            log._buffer.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# type: ignore
+"""N variants continued from one warmed-up simulation by fork (run_branches) vs. N cold runs.
+
+Every variant changes the battery recharge rate of all nodes at --warm-ticks and runs to --ticks.
+A cold run builds its own simulation and repeats the warm-up; a branch is a copy-on-write fork of
+one warmed-up simulation, main process and workers. Per variant this prints wall time and the
+resident and private memory of the run's processes (main plus workers) at its end; private is what
+the run does not share with anything else. A branch also reports its private memory right after the
+fork. A branch must log what its cold run logs after the warm-up.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.fork_branches --map maps/mega_line.json --warm-ticks 7200000 --ticks 9000000 --workers 2
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pipe, get_context
+
+from sim.branches import process_memory, run_branches
+from sim.engine import NetworkTopologyLoader, Simulation
+
+GUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def read_log(log_path: str) -> Counter:
+    with open(log_path) as f:
+        return Counter(GUID.sub("<guid>", line) for line in f if not line.startswith("---"))
+
+
+def cold_run(device_neighbors: dict, n_workers: int, recharge_rate: float, warm_ticks: int, stop_tick: int, log_path: str, conn) -> None:
+    start = time.perf_counter()
+    sim = Simulation(log_path=log_path, device_neighbors=device_neighbors, n_workers=n_workers)
+    sim.run_for(warm_ticks, keep_workers=True)
+    sim.reconfigure_batteries(battery_recharge_rate_joule_per_second=recharge_rate)
+    sim.run_for(stop_tick, keep_workers=True)
+    memory = process_memory([os.getpid(), *(p.pid for _, p in sim._workers)])
+    sim.close()
+    conn.send((time.perf_counter() - start, memory))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--warm-ticks", type=int, default=7_200_000)
+    parser.add_argument("--ticks", type=int, default=9_000_000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--recharge-rates", type=float, nargs="+", default=[0.0054, 0.004, 0.003, 0.002])
+    args = parser.parse_args()
+
+    device_neighbors = NetworkTopologyLoader.from_file(args.map)
+    print(f"{args.map}: {len(device_neighbors)} devices, warm-up to tick {args.warm_ticks}, variants to tick {args.ticks}, {args.workers} workers")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Cold runs in a fork of this process each, so their memory is measured the same way as a branch's
+        cold = {}
+        cold_start = time.perf_counter()
+        for rate in args.recharge_rates:
+            recv_conn, send_conn = Pipe(duplex=False)
+            p = get_context("fork").Process(target=cold_run, args=(device_neighbors, args.workers, rate, args.warm_ticks, args.ticks, os.path.join(tmp, f"cold-{rate}.log"), send_conn))
+            p.start()
+            cold[rate] = recv_conn.recv()
+            p.join()
+        cold_total = time.perf_counter() - cold_start
+
+        fork_start = time.perf_counter()
+        warm_log = os.path.join(tmp, "warm.log")
+        sim = Simulation(log_path=warm_log, device_neighbors=device_neighbors, n_workers=args.workers)
+        sim.run_for(args.warm_ticks, keep_workers=True)
+        warm_up = time.perf_counter() - fork_start
+        branches = [{"name": f"rate-{rate}", "battery_recharge_rate_joule_per_second": rate} for rate in args.recharge_rates]
+        results = run_branches(sim, branches, args.ticks, os.path.join(tmp, "branches"), report=lambda message: None)
+        warm_memory = process_memory([os.getpid(), *(p.pid for _, p in sim._workers)])
+        sim.close()
+        fork_total = time.perf_counter() - fork_start
+
+        print(f"{'variant':<14} {'cold':>8} {'rss':>8} {'private':>8} {'branch':>8} {'rss':>8} {'private':>8} {'at fork':>8}")
+        for rate, result in zip(args.recharge_rates, results):
+            elapsed, memory = cold[rate]
+            print(f"{result['name']:<14} {elapsed:>7.2f}s {memory.get('rss_mb', 0):>6.0f}MB {memory.get('private_mb', 0):>6.0f}MB {result['elapsed_s']:>7.2f}s {result.get('rss_mb', 0):>6.0f}MB {result.get('private_mb', 0):>6.0f}MB {result.get('private_at_fork_mb', 0):>6.1f}MB")
+            branch_log = read_log(os.path.join(tmp, "branches", result["name"], "simulation.log"))
+            assert read_log(os.path.join(tmp, f"cold-{rate}.log")) - read_log(warm_log) == branch_log, f"branch {result['name']} diverged from its cold run"
+        print(f"total: {len(results)} cold runs {cold_total:.2f}s, warm-up {warm_up:.2f}s + {len(results)} branches {fork_total - warm_up:.2f}s = {fork_total:.2f}s")
+        print(f"warmed-up simulation the branches share: {warm_memory.get('rss_mb', 0):.0f}MB resident")
+
+
+if __name__ == "__main__":
+    main()
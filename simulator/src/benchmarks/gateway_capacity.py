@@ -0,0 +1,71 @@
+# type: ignore
+"""Gateway uplink capacity: delivered uplinks and resolve time per call, ideal gateway vs. concentrator, by nodes per gateway.
+
+Every node sends one SF7 uplink of --airtime ticks at a random tick of a --period tick window on a
+random one of --channels channels. The gateway's LoRaWan transceiver is driven like the simulation
+drives it: it is ticked the tick after each uplink ends, with every uplink that started by then in
+its receive queue. Pure ALOHA on one channel delivers e^(-2G) of the frames at offered load G per
+channel, which the concentrator should approach while its demodulators keep up.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.gateway_capacity --nodes 100 1000 5000 --demodulators 8 16
+"""
+
+import argparse
+import math
+import random
+import time
+from unittest.mock import Mock
+
+from custom_types import EventNet, EventNetTypes, MediumTypes, NodeConfig
+from loraWanFrameHelper import LoRaWanPHYPayload
+from node.transceiver.LoRaWan import LoRaWan
+
+
+def make_uplinks(rng: random.Random, nodes: int, airtime: int, period: int, channels: int) -> list[EventNet]:
+    uplinks = []
+    for nid in range(nodes):
+        start = rng.randrange(period)
+        data = LoRaWanPHYPayload(mhdr=0x40, channel=rng.randrange(channels))
+        uplinks.append(EventNet(node_id=nid, time_start=start, time_end=start + airtime, type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_WAN, data=data))
+    uplinks.sort(key=lambda e: e.time_start)
+    return uplinks
+
+
+def run_gateway(uplinks: list[EventNet], config: NodeConfig) -> tuple[int, float, int]:
+    gateway = LoRaWan(node_id=-1, medium_service=Mock(), local_event_queue=Mock(), second_to_global_tick=1.0, log=Mock(), config=config, gateway=True)
+    gateway._current_reception_start_global_tick = 0
+    ticks = sorted({e.time_end + 1 for e in uplinks})
+    delivered, arrived = 0, 0
+    start = time.perf_counter()
+    for tick in ticks:
+        while arrived < len(uplinks) and uplinks[arrived].time_start < tick:
+            gateway._receive_queue.append(uplinks[arrived])
+            arrived += 1
+        delivered += len(gateway._get_successful_receptions(tick))
+    return delivered, time.perf_counter() - start, len(ticks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--demodulators", type=int, nargs="+", default=[8, 16])
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument("--airtime", type=int, default=62, help="uplink length in ticks, ~SF7 for a 20 byte payload")
+    parser.add_argument("--period", type=int, default=60_000, help="window the uplinks start in, ticks")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.channels} channels, airtime {args.airtime} ticks, uplinks within {args.period} ticks")
+    print(f"{'nodes':>6} {'G/channel':>9} {'ALOHA':>6} {'gateway':<16} {'delivered':>9} {'per call':>9}")
+    for nodes in args.nodes:
+        uplinks = make_uplinks(random.Random(args.seed), nodes, args.airtime, args.period, args.channels)
+        load = nodes * args.airtime / args.period / args.channels
+        configs = [("ideal", NodeConfig())] + [(f"concentrator/{n}", NodeConfig(gateway_reception="concentrator", gateway_demodulators=n, wan_channels=args.channels)) for n in args.demodulators]
+        for name, config in configs:
+            delivered, seconds, calls = run_gateway(uplinks, config)
+            print(f"{nodes:>6} {load:>9.3f} {math.exp(-2 * load):>6.1%} {name:<16} {delivered / nodes:>9.1%} {seconds / calls * 1e6:>7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# type: ignore
+"""Intra-cluster D2D cancellation under mass die-off: list rebuild per receiver vs. (sender, time_start) index.
+
+Models the tick in which a low recharge rate drains many batteries at once: --senders nodes of a
+single cluster start a D2D transmission in the same tick and --dying of them lose power and cancel
+it straight away. The reference flush is the former ClusterMediumService.flush_d2d, which rebuilt
+the pending reception list once per cancelled receiver. Both must drain identical receptions.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.intra_cancel --nodes 20000 --senders 500 --dying 250
+"""
+
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from custom_types import EventNet, EventNetTypes, LoRaD2DFrame, MediumTypes
+from medium.lora_d2d_medium import LoraD2DMedium
+from sim.engine import ClusterMediumService
+
+
+class ListClusterMediumService(ClusterMediumService):
+    """ClusterMediumService with the pending intra receptions kept as one flat list."""
+
+    def __init__(self, owned_nodes: frozenset, reach_map: dict):
+        super().__init__(owned_nodes, reach_map)
+        self._intra_receptions = []
+
+    def flush_d2d(self, current_time: int) -> None:
+        for entry in self._pending_d2d:
+            if entry[0] == "TX":
+                _, sender, data, t_start, t_end = entry
+                receivers = self._reach_map.get(sender, [])
+                if receivers and all(r in self._owned_nodes for r, _ in receivers):
+                    self._intra_ongoing[sender] = ([r for r, _ in receivers], t_end)
+                    for recv_id, rssi in receivers:
+                        rx_data = replace(data, rssi=rssi) if isinstance(data, LoRaD2DFrame) else data
+                        rx_event = EventNet(node_id=sender, time_start=t_start, time_end=t_end, type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D, data=rx_data)
+                        self._intra_receptions.append((recv_id, rx_event, t_end + 1))
+                else:
+                    self._cross_transmissions.append((sender, MediumTypes.LORA_D2D, data, t_start, t_end))
+            elif entry[0] == "CX":
+                _, sender, t_start, t_end = entry
+                if sender in self._intra_ongoing:
+                    recv_ids, _ = self._intra_ongoing.pop(sender)
+                    for recv_id in recv_ids:
+                        self._intra_receptions = [(r, e, w) for r, e, w in self._intra_receptions if not (r == recv_id and e.node_id == sender and e.time_start == t_start)]
+                        cx_event = EventNet(node_id=sender, time_start=t_start, time_end=t_end, type=EventNetTypes.CANCELED, type_medium=MediumTypes.LORA_D2D, data=[])
+                        self._intra_receptions.append((recv_id, cx_event, t_start + 1))
+                else:
+                    self._cross_cancellations.append((sender, MediumTypes.LORA_D2D, t_start, t_end))
+        self._pending_d2d.clear()
+
+    def drain_intra_receptions(self) -> list:
+        out = self._intra_receptions[:]
+        self._intra_receptions.clear()
+        return out
+
+
+def die_off_tick(medium: ClusterMediumService, senders: list[int], dying: list[int], tick: int) -> tuple[float, list]:
+    for sender in senders:
+        medium.transmit(sender, MediumTypes.LORA_D2D, b"payload", tick, tick + 50)
+    for sender in dying:
+        medium.cancel_transmission(sender, MediumTypes.LORA_D2D, tick, tick + 50)
+    start = time.perf_counter()
+    medium.flush_d2d(tick)
+    elapsed = time.perf_counter() - start
+    return elapsed, medium.drain_intra_receptions()
+
+
+def main() -> None:
+    from benchmarks.reach_map import random_topology
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--senders", type=int, default=500)
+    parser.add_argument("--dying", type=int, default=250)
+    args = parser.parse_args()
+
+    topology = random_topology(args.nodes, 8)
+    reach_map = LoraD2DMedium.build_reach_map(topology)
+    owned = frozenset(topology)
+    rng = random.Random(0)
+    senders = rng.sample(sorted(reach_map), args.senders)
+    dying = rng.sample(senders, args.dying)
+    receptions = sum(len(reach_map[s]) for s in senders)
+    print(f"{args.nodes} nodes, {args.senders} senders ({receptions} pending receptions), {args.dying} cancel in the same tick")
+
+    results = {}
+    for name, cls in (("list", ListClusterMediumService), ("indexed", ClusterMediumService)):
+        elapsed, drained = die_off_tick(cls(owned, reach_map), senders, dying, 1_000)
+        results[name] = [(r, e.node_id, e.type, e.time_start, w) for r, e, w in drained]
+        print(f"{name:<8} flush_d2d {elapsed * 1000:>10.1f} ms, {len(drained)} receptions drained")
+    assert results["list"] == results["indexed"], "indexed flush drained different receptions"
+
+
+if __name__ == "__main__":
+    main()
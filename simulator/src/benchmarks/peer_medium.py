@@ -0,0 +1,59 @@
+# type: ignore
+"""Cross-cluster D2D routed through the main process ("main") vs. straight between workers ("peer").
+
+With peer routing the main process only runs the tick barrier and LoRaWAN: workers propagate their
+own cross-cluster transmissions and send the receptions over pipes to the workers owning the
+receivers. Per worker count this prints the wall time, main's time blocked on replies and spent in
+medium propagation, and the number of peer links. Both routings must write the same log.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.peer_medium --map maps/mega_line.json --ticks 1800000 --workers 2 4 8 16
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from ctypes import c_int
+from multiprocessing import Value
+
+from custom_types import SimState
+from sim.engine import NetworkTopologyLoader, Simulation
+from sim.peer_exchange import D2D_ROUTINGS
+
+GUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def run(device_neighbors: dict, stop_tick: int, n_workers: int, d2d_routing: str, log_path: str) -> tuple[Simulation, float, list[str]]:
+    status = Value(c_int, SimState.RUNNING.value)
+    sim = Simulation(log_path=log_path, status=status, device_neighbors=device_neighbors, n_workers=n_workers, d2d_routing=d2d_routing)
+    start = time.perf_counter()
+    sim.run_for(stop_tick)
+    elapsed = time.perf_counter() - start
+    with open(log_path) as f:
+        return sim, elapsed, sorted(GUID.sub("<guid>", line) for line in f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--ticks", type=int, default=1_800_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8, 16])
+    args = parser.parse_args()
+
+    device_neighbors = NetworkTopologyLoader.from_file(args.map)
+    print(f"{args.map}: {len(device_neighbors)} devices, {args.ticks} ticks")
+    print(f"{'workers':>7} {'routing':<7} {'total':>8} {'wait':>8} {'propagation':>12} {'cut edges':>10} {'barriers':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_workers in args.workers:
+            logs = {}
+            for d2d_routing in D2D_ROUTINGS:
+                sim, elapsed, logs[d2d_routing] = run(device_neighbors, args.ticks, n_workers, d2d_routing, os.path.join(tmp, f"{n_workers}-{d2d_routing}.log"))
+                q = sim.partition_quality
+                print(f"{n_workers:>7} {d2d_routing:<7} {elapsed:>7.2f}s {sim.phase_time['wait']:>7.2f}s {sim.stats['propagation_time']:>11.2f}s {q['edge_cut']:>10} {sim.stats['barriers']:>9}")
+            assert logs["peer"] == logs["main"], f"peer routing wrote a different log with {n_workers} workers"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# type: ignore
+"""Range propagation startup: grid-hash reach map vs. all-pairs reference, and per-transmission lookup.
+
+Topologies come from benchmarks.reach_map.random_topology (uniform positions in metres, --degree
+nodes in range on average). The grid hash is built once per run; each transmission then looks up
+its sender's receivers in the cached map, which is timed over --lookups random senders. The all-pairs
+reference is skipped above --brute-force-max nodes.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.range_reach --nodes 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.reach_map import random_topology, timed
+from medium.lora_d2d_medium import LoraD2DMedium
+from medium.range_reach import RangePropagation, build_range_reach_brute_force
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--degree", type=float, default=8.0, help="nodes in radio range of a sender on average")
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--brute-force-max", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>7} {'range':>7} {'links':>9} {'all pairs':>10} {'grid':>8} {'lookup':>8}")
+    for n_nodes in args.nodes:
+        topology = random_topology(n_nodes, args.degree)
+        side = 1000.0 * (n_nodes / 1000) ** 0.5
+        propagation = RangePropagation(max_range_m=side * (args.degree / (np.pi * n_nodes)) ** 0.5)
+
+        grid_time, reach = timed(LoraD2DMedium.build_range_reach_map, topology, propagation)
+        senders = random.Random(0).choices(list(reach), k=args.lookups)
+        start = time.perf_counter()
+        for sender in senders:
+            reach[sender]
+        lookup_time = (time.perf_counter() - start) / args.lookups
+
+        brute = "-"
+        if n_nodes <= args.brute_force_max:
+            brute_time, expected = timed(build_range_reach_brute_force, topology, propagation)
+            assert dict(reach) == expected, f"grid hash and all pairs disagree for {n_nodes} nodes"
+            brute = f"{brute_time:.2f}s"
+        links = sum(len(reach[nid]) for nid in reach)
+        print(f"{n_nodes:>7} {propagation.range_m:>6.1f}m {links:>9} {brute:>10} {grid_time:>7.2f}s {lookup_time * 1e6:>6.2f}us")
+
+
+if __name__ == "__main__":
+    main()
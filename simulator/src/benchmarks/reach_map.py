@@ -0,0 +1,77 @@
+# type: ignore
+"""Reach map startup: recursive per-node traversal vs. batched NumPy builder.
+
+The bundled maps are small, so besides them a random geometric topology of --nodes nodes is
+generated (uniform positions, links below --radius, one gateway per ~500 nodes).
+
+Run from the simulator folder:
+    uv run python -m benchmarks.reach_map --nodes 100000
+"""
+
+import argparse
+import glob
+import random
+import time
+
+import numpy as np
+
+from custom_types import NodeMediumInfo
+from medium.lora_d2d_medium import LoraD2DMedium
+from sim.engine import NetworkTopologyLoader
+
+
+def random_topology(n_nodes: int, mean_degree: float = 8.0, seed: int = 0, duplicate_links: bool = False) -> dict[int, NodeMediumInfo]:
+    """Nodes uniform on a square, linked when closer than the radius giving mean_degree neighbours."""
+    rng = random.Random(seed)
+    side = 1000.0 * (n_nodes / 1000) ** 0.5
+    radius = side * (mean_degree / (np.pi * n_nodes)) ** 0.5
+    positions = np.array([(round(rng.uniform(0, side)), round(rng.uniform(0, side))) for _ in range(n_nodes)], dtype=np.float64)
+
+    cell = np.floor(positions / radius).astype(np.int64)
+    buckets: dict[tuple, list[int]] = {}
+    for i, key in enumerate(map(tuple, cell.tolist())):
+        buckets.setdefault(key, []).append(i)
+
+    neighbors: list[list[int]] = [[] for _ in range(n_nodes)]
+    for (cx, cy), members in buckets.items():
+        near = [j for dx in (-1, 0, 1) for dy in (-1, 0, 1) for j in buckets.get((cx + dx, cy + dy), ())]
+        near_pos = positions[near]
+        for i in members:
+            close = np.flatnonzero(((near_pos - positions[i]) ** 2).sum(axis=1) <= radius**2)
+            neighbors[i] = [near[j] + 1 for j in close if near[j] != i]
+            rng.shuffle(neighbors[i])
+            if duplicate_links and neighbors[i] and rng.random() < 0.05:
+                neighbors[i].append(neighbors[i][0])
+
+    n_gateways = max(1, n_nodes // 500)
+    topology = {}
+    for i in range(n_nodes):
+        topology[i + 1] = NodeMediumInfo(position=tuple(positions[i].astype(int).tolist()), neighbors=neighbors[i], gateways_in_range=[], is_gateway=i < n_gateways)
+    return topology
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--degree", type=float, default=8.0)
+    args = parser.parse_args()
+
+    topologies = {path: NetworkTopologyLoader.from_file(path) for path in sorted(glob.glob("maps/*.json"))}
+    topologies[f"random {args.nodes} nodes, degree {args.degree:g}"] = random_topology(args.nodes, args.degree)
+
+    print(f"{'topology':<48} {'recursive':>10} {'numpy':>8} {'csr only':>9} {'entries':>9} same")
+    for name, topology in topologies.items():
+        recursive_time, recursive = timed(LoraD2DMedium.build_reach_map_recursive, topology)
+        numpy_time, vectorised = timed(LoraD2DMedium.build_reach_map, topology)
+        csr_time, csr = timed(LoraD2DMedium.build_reach_csr, topology)
+        print(f"{name:<48} {recursive_time:>9.3f}s {numpy_time:>7.3f}s {csr_time:>8.3f}s {len(csr.receivers):>9} {recursive == vectorised}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# type: ignore
+"""Worker load imbalance: static BFS partition vs. runtime re-partitioning.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.rebalance --map maps/mega_line.json --hours 2 --workers 4
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from ctypes import c_int
+from multiprocessing import Value
+
+from custom_types import SimState
+from sim.engine import NetworkTopologyLoader, Simulation
+from sim.rebalance import RebalancePolicy
+
+_TICKS_PER_HOUR = 3_600_000
+_GUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def run(map_path: str, stop_tick: int, n_workers: int | None, lookahead: bool, rebalance: RebalancePolicy, log_path: str) -> tuple[Simulation, float, list[str]]:
+    device_neighbors = NetworkTopologyLoader.from_file(map_path)
+    status = Value(c_int, SimState.RUNNING.value)
+    sim = Simulation(log_path=log_path, status=status, device_neighbors=device_neighbors, n_workers=n_workers, lookahead=lookahead, rebalance=rebalance)
+
+    start = time.perf_counter()
+    sim.run_for(stop_tick)
+    elapsed = time.perf_counter() - start
+
+    with open(log_path) as f:
+        lines = [_GUID.sub("<guid>", line) for line in f]
+    return sim, elapsed, lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lookahead", action="store_true")
+    parser.add_argument("--interval", type=int, default=RebalancePolicy.interval_ticks)
+    parser.add_argument("--threshold", type=float, default=RebalancePolicy.imbalance_threshold)
+    parser.add_argument("--max-moves", type=int, default=RebalancePolicy.max_moves)
+    args = parser.parse_args()
+
+    stop_tick = int(args.hours * _TICKS_PER_HOUR)
+    # Never moves anything, but measures the static partition's imbalance at the same check points
+    observe = RebalancePolicy(interval_ticks=args.interval, imbalance_threshold=float("inf"))
+    policy = RebalancePolicy(interval_ticks=args.interval, imbalance_threshold=args.threshold, max_moves=args.max_moves)
+    with tempfile.TemporaryDirectory() as tmp:
+        static, static_elapsed, static_lines = run(args.map, stop_tick, args.workers, args.lookahead, observe, os.path.join(tmp, "static.log"))
+        adaptive, adaptive_elapsed, adaptive_lines = run(args.map, stop_tick, args.workers, args.lookahead, policy, os.path.join(tmp, "adaptive.log"))
+
+    print(f"map: {args.map}, simulated: {args.hours} h, workers: {args.workers}, lookahead: {args.lookahead}, policy: {policy}")
+    print(f"{'tick':>10} {'static':>8} {'measured':>9} {'projected':>10} {'moved':>6}")
+    for (tick, static_imbalance, _, _), (_, before, after, moved) in zip(static.rebalance_report, adaptive.rebalance_report):
+        print(f"{tick:>10} {static_imbalance:>8.2f} {before:>9.2f} {after:>10.2f} {moved:>6}")
+    for name, sim, elapsed in (("static", static, static_elapsed), ("adaptive", adaptive, adaptive_elapsed)):
+        print(f"{name:<9} wall {elapsed:7.2f} s, barriers {sim.stats['barriers']}, migrated nodes {sim.stats['migrated_nodes']}")
+    print(f"same events: {sorted(static_lines) == sorted(adaptive_lines)} ({len(static_lines)} lines)")
+
+
+if __name__ == "__main__":
+    main()
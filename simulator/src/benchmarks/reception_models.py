@@ -0,0 +1,70 @@
+# type: ignore
+"""D2D reception models: boolean overlap vs. capture effect, time per resolved window and frames received.
+
+Queues are built like benchmarks.d2d_collisions, each frame carrying the RSSI the reach map gives its
+sender: -40 dBm one hop away, -52 dBm two hops away. The overlap model drops every frame that overlaps
+another; the capture model keeps a frame 6 dB above the summed interference. Both pick their pairwise
+loop up to PAIRWISE_MAX_EVENTS queued events, the overlap model its interval index and the capture
+model its NumPy prefix sums above.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.reception_models --neighbours 2 4 8 32 128 512 2048
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from custom_types import EventNet, EventNetTypes, LoRaD2DFrame, LoRaD2DFrameType, MediumTypes
+from medium.lora_d2d_medium import LoraD2DMedium
+from node.transceiver.collision import PAIRWISE_MAX_EVENTS, CaptureModel, successful_receptions
+
+
+def make_queue(rng: random.Random, neighbours: int, airtime: int, density: float) -> list[EventNet]:
+    span = max(airtime, int(neighbours * airtime / density))
+    hop_rssi = [LoraD2DMedium._estimate_rssi(hop) for hop in (1, 2)]
+    queue = []
+    for nid in range(neighbours):
+        start = rng.randrange(span)
+        data = LoRaD2DFrame(source_node_id=nid, destination_node_id=set(), type=LoRaD2DFrameType.CURRENT_HOP_COUNT, payload=None, rssi=rng.choice(hop_rssi))
+        queue.append(EventNet(node_id=nid, time_start=start, time_end=start + airtime, type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D, data=data))
+    for sent in rng.sample(queue, k=max(1, neighbours // 50)):
+        queue.append(EventNet(node_id=sent.node_id, time_start=sent.time_start + airtime // 2, time_end=sent.time_end, type=EventNetTypes.CANCELED, type_medium=MediumTypes.LORA_D2D))
+    queue.sort(key=lambda e: e.time_start)
+    return queue
+
+
+def timed(resolve, queue: list[EventNet], current: int, repeat: int) -> tuple[float, tuple]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = resolve(queue, current, 0)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--neighbours", type=int, nargs="+", default=[2, 4, 8, 32, 128, 512, 2048])
+    parser.add_argument("--airtime", type=int, default=50, help="frame length in ticks, ~SF7 for a short D2D frame")
+    parser.add_argument("--density", type=float, default=2.0, help="frames on air at once on average")
+    parser.add_argument("--repeat", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    capture = CaptureModel(sf=7, bandwidth_hz=125_000)
+    print(f"airtime {args.airtime} ticks, {args.density:g} frames on air on average, vectorized above {PAIRWISE_MAX_EVENTS} events")
+    print(f"{'neighbours':>10} {'overlap rx':>10} {'capture rx':>10} {'overlap':>10} {'capture':>10} {'cost':>7}")
+    for neighbours in args.neighbours:
+        queue = make_queue(rng, neighbours, args.airtime, args.density)
+        current = max(e.time_end for e in queue) + 1
+        overlap_time, (overlap_rx, _) = timed(successful_receptions, queue, current, args.repeat)
+        capture_time, (capture_rx, _) = timed(capture, queue, current, args.repeat)
+        assert {id(e) for e in overlap_rx} <= {id(e) for e in capture_rx}, f"capture lost a frame the overlap model received at {neighbours} neighbours"
+        print(f"{neighbours:>10} {len(overlap_rx):>10} {len(capture_rx):>10} {overlap_time * 1e6:>8.1f}us {capture_time * 1e6:>8.1f}us {capture_time / overlap_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# type: ignore
+"""Topology loading: json.load + dict analysis vs. streaming into arrays, time and peak memory.
+
+Each loader runs twice in a fresh process: once untraced for time and maximum RSS, once under
+tracemalloc for the high-water mark of Python allocations (peak) and what the result keeps alive
+(retained). For a full allocation profile use memray:
+    uv run memray run -o stream.bin -m benchmarks.topology_loader --map maps/mega_line.json --only stream
+    uv run memray stats stream.bin
+
+Run from the simulator folder:
+    uv run python -m benchmarks.topology_loader --map maps/mega_line.json
+    uv run python -m benchmarks.topology_loader --nodes 200000   # generated map
+"""
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from multiprocessing import get_context
+
+from sim.engine import NetworkTopologyLoader
+from sim.topology_stream import read_topology
+
+LOADERS = {
+    "json.load": lambda path: json.load(open(path)),
+    "read_topology": read_topology,
+    "eager": NetworkTopologyLoader.from_json_eager,
+    "stream": NetworkTopologyLoader.from_json,
+}
+
+
+def measure(name: str, path: str, traced: bool, results) -> None:
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = LOADERS[name](path)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory() if traced else (0, 0)
+    results.put((elapsed, peak, retained, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024))
+    del result
+
+
+def run(ctx, name: str, path: str, traced: bool) -> tuple:
+    results = ctx.Queue()
+    p = ctx.Process(target=measure, args=(name, path, traced, results))
+    p.start()
+    result = results.get()
+    p.join()
+    return result
+
+
+def write_random_map(n_nodes: int, path: str) -> None:
+    from benchmarks.reach_map import random_topology
+
+    topology = random_topology(n_nodes, 8)
+    n_gateways = max(1, n_nodes // 500)
+    nodes = {str(nid): {"point": list(info.position), "neighbours": [nb for nb in info.neighbors if nb > n_gateways]} for nid, info in topology.items() if nid > n_gateways}
+    gateways = {str(nid): {"point": list(topology[nid].position)} for nid in range(1, n_gateways + 1)}
+    with open(path, "w") as f:
+        json.dump({"metadata": {"total_nodes": len(nodes), "m_per_svg_x": 1, "m_per_svg_y": 1}, "nodes": nodes, "gateways": gateways}, f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default=None)
+    parser.add_argument("--nodes", type=int, default=100_000, help="size of the generated map when --map is not given")
+    parser.add_argument("--only", choices=list(LOADERS), default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.map
+        if path is None:
+            path = os.path.join(tmp, "generated.json")
+            write_random_map(args.nodes, path)
+        size = os.path.getsize(path)
+        print(f"map: {path}, {size / 2**20:.1f} MiB")
+
+        ctx = get_context("spawn")
+        print(f"{'loader':<14} {'time':>8} {'max RSS':>10} {'peak':>10} {'retained':>10} {'peak/file':>10}")
+        for name in [args.only] if args.only else LOADERS:
+            elapsed, _, _, rss = run(ctx, name, path, traced=False)
+            _, peak, retained, _ = run(ctx, name, path, traced=True)
+            print(f"{name:<14} {elapsed:>7.2f}s {rss / 2**20:>8.1f}Mi {peak / 2**20:>8.1f}Mi {retained / 2**20:>8.1f}Mi {peak / size:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
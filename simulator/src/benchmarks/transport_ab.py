@@ -0,0 +1,97 @@
+# type: ignore
+"""Main <-> worker transport A/B: pickled Pipe messages vs. shared memory ring records.
+
+Run from the simulator folder:
+    uv run python -m benchmarks.transport_ab --map maps/mega_line.json --hours 1 --workers 4
+"""
+
+import argparse
+import os
+import pickle
+import re
+import tempfile
+import time
+from copy import replace
+from ctypes import c_int
+from multiprocessing import Value
+
+from custom_types import EventNet, EventNetTypes, LoRaD2DFrame, LoRaD2DFrameType, MediumTypes, SimState
+from payload_types import PayloadHopCntFull
+from sim.engine import NetworkTopologyLoader, Simulation
+from sim.transport import TRANSPORTS, WORKER_TICK, decode_result, encode_result, encode_task
+
+_TICKS_PER_HOUR = 3_600_000
+_GUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def run(map_path: str, stop_tick: int, transport: str, lookahead: bool, n_workers: int | None, log_path: str) -> tuple[dict, float, list[str]]:
+    device_neighbors = NetworkTopologyLoader.from_file(map_path)
+    status = Value(c_int, SimState.RUNNING.value)
+    sim = Simulation(log_path=log_path, status=status, device_neighbors=device_neighbors, lookahead=lookahead, n_workers=n_workers, transport=transport)
+
+    start = time.perf_counter()
+    sim.run_for(stop_tick)
+    elapsed = time.perf_counter() - start
+
+    with open(log_path) as f:
+        lines = [_GUID.sub("<guid>", line) for line in f]
+    return sim.stats, elapsed, lines
+
+
+def _frame(source: int) -> LoRaD2DFrame:
+    payload = PayloadHopCntFull(cnt=3, slot_period_counter=1, use_slot=2, time_offset_from_period_start=5, local_time=100)
+    return LoRaD2DFrame(source_node_id=source, destination_node_id={source + 1}, type=LoRaD2DFrameType.CURRENT_HOP_COUNT, payload=payload)
+
+
+def _relay(result: tuple) -> tuple:
+    """What main does with a tick result: fan every transmission out to 3 receivers and ship them on."""
+    incoming = [(from_id * 10 + k, [EventNet(from_id, t_start, t_end, EventNetTypes.TRANSMIT, medium, replace(data, rssi=-40.0 - k))]) for from_id, medium, data, t_start, t_end in result[2] for k in range(3)]
+    return (WORKER_TICK, 1000, [nid for nid, _ in incoming], incoming, [])
+
+
+def codec_micro(repeat: int = 20_000) -> None:
+    """Main process serialization cost per tick result: decode it, relay its frames, encode the next task."""
+    idle = (WORKER_TICK, [(n, n * 1000) for n in range(8)], [], [], [], [])
+    busy = (WORKER_TICK, [(n, n * 1000) for n in range(8)], [(n, MediumTypes.LORA_D2D, _frame(n), 100, 160) for n in range(4)], [], ["[INFO] (SIMULATOR) @ 1: line, \n"] * 3, [])
+    for name, result in (("idle tick", idle), ("4 tx, 12 rx", busy)):
+        pickled = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            pickle.dumps(_relay(pickle.loads(pickled)), protocol=pickle.HIGHEST_PROTOCOL)
+        pipe = time.perf_counter() - start
+
+        records = encode_result(result)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            encode_task(_relay(decode_result(records)))
+        shm = time.perf_counter() - start
+        print(f"main process, {name:<12} pipe {pipe / repeat * 1e6:7.2f} us   shm {shm / repeat * 1e6:7.2f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--map", default="maps/mega_line.json")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--lookahead", action="store_true")
+    args = parser.parse_args()
+
+    stop_tick = int(args.hours * _TICKS_PER_HOUR)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for transport in TRANSPORTS:
+            results[transport] = run(args.map, stop_tick, transport, args.lookahead, args.workers, os.path.join(tmp, f"{transport}.log"))
+
+    print(f"map: {args.map}, simulated: {args.hours} h, workers: {args.workers or 'auto'}, lookahead: {args.lookahead}")
+    print(f"{'transport':<10} {'barriers':>10} {'wall [s]':>10} {'dispatch [s]':>13} {'us/barrier':>11}")
+    for transport, (stats, elapsed, _) in results.items():
+        per_barrier = stats["node_tick_time"] / stats["barriers"] * 1e6 if stats["barriers"] else 0.0
+        print(f"{transport:<10} {stats['barriers']:>10} {elapsed:>10.2f} {stats['node_tick_time']:>13.2f} {per_barrier:>11.1f}")
+
+    reference = results[TRANSPORTS[0]][2]
+    print(f"logs identical: {all(lines == reference for _, _, lines in results.values())} ({len(reference)} lines)")
+    codec_micro()
+
+
+if __name__ == "__main__":
+    main()
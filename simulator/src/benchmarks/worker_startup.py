@@ -0,0 +1,115 @@
+# type: ignore
+"""Worker start-up: whole topology per worker vs. a TopologyTable slice vs. one shared mapping.
+
+"full" hands every worker the complete NodeMediumInfo dict and reach map, as the engine used to;
+"slice" hands it only its partition's rows and reach rows plus the halo around them; "shared"
+writes the table and reach map once to a memory-mapped file that every worker maps read-only.
+Workers are spawned (as main.py does), so everything they get is pickled.
+
+  prepare  main-side work before the first Process.start(): slicing, or writing the shared file
+  launch   main blocked in Process.start(), which pickles the arguments
+  ready    from the first start() until every worker has built its nodes and answered a request
+  PSS      proportional set size summed over the workers, shared pages counted once
+
+Run from the simulator folder:
+    uv run python -m benchmarks.worker_startup --nodes 20000 --workers 1 2 4 8 16 32
+"""
+
+import argparse
+import pickle
+import time
+from multiprocessing import get_context
+
+from medium.lora_d2d_medium import LoraD2DMedium
+from medium.reach_map import ReachCSR
+from sim.engine import _worker_run_loop
+from sim.graph_partitioner import PARTITIONERS, expected_activity
+from sim.shared_topology import SharedTopology
+from sim.topology_table import TopologyTable
+from sim.transport import WORKER_STATS, WORKER_STOP, create_channel_pair
+
+MODES = ("full", "slice", "shared")
+
+
+def pss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def worker_args(mode: str, device_neighbors: dict, reach_map: dict, partitions: list[list[int]]) -> tuple[list[tuple], SharedTopology | None]:
+    table = TopologyTable.from_infos(device_neighbors)
+    shared = SharedTopology.publish(table, ReachCSR.from_dict(reach_map)) if mode == "shared" else None
+    args = []
+    for w_ids in partitions:
+        owned = frozenset(w_ids)
+        if mode == "full":
+            args.append((w_ids, device_neighbors, owned, reach_map))
+        elif mode == "shared":
+            args.append((w_ids, shared, owned, None))
+        else:
+            w_reach = {nid: reach_map[nid] for nid in w_ids if nid in reach_map}
+            args.append((w_ids, table.subset(owned | table.halo(owned, w_reach)), owned, w_reach))
+    return args, shared
+
+
+def start_workers(args: list[tuple]) -> tuple[float, float, int]:
+    ctx = get_context("spawn")
+    workers = []
+    start = time.perf_counter()
+    for w_args in args:
+        channel, child_channel = create_channel_pair("pipe")
+        p = ctx.Process(target=_worker_run_loop, args=(*w_args, child_channel), daemon=True)
+        p.start()
+        child_channel.close()
+        workers.append((channel, p))
+    launch = time.perf_counter() - start
+    for channel, _ in workers:
+        channel.send((WORKER_STATS, 0))
+    for channel, _ in workers:
+        channel.recv()
+    ready = time.perf_counter() - start
+
+    pss = sum(pss_kib(p.pid) for _, p in workers)
+    for channel, p in workers:
+        channel.send(WORKER_STOP)
+        p.join()
+    return launch, ready, pss
+
+
+def main() -> None:
+    from benchmarks.reach_map import random_topology
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--only", choices=MODES, default=None)
+    args = parser.parse_args()
+
+    device_neighbors = random_topology(args.nodes, 8)
+    reach_map = LoraD2DMedium.build_reach_map(device_neighbors)
+    activity = expected_activity(device_neighbors, reach_map)
+    print(f"{args.nodes} nodes, spawned workers")
+
+    print(f"{'workers':>7} {'mode':<6} {'prepare':>8} {'launch':>8} {'ready':>8} {'pickled/worker':>15} {'PSS total':>10}")
+    for n_workers in args.workers:
+        node_to_cluster = PARTITIONERS["bfs"](device_neighbors, reach_map, n_workers, activity)
+        partitions = [[] for _ in range(n_workers)]
+        for nid, cid in node_to_cluster.items():
+            partitions[cid].append(nid)
+
+        for mode in [args.only] if args.only else MODES:
+            start = time.perf_counter()
+            w_args, shared = worker_args(mode, device_neighbors, reach_map, partitions)
+            prepare = time.perf_counter() - start
+            pickled = sum(len(pickle.dumps(a, protocol=pickle.HIGHEST_PROTOCOL)) for a in w_args) / n_workers
+            launch, ready, pss = start_workers(w_args)
+            if shared is not None:
+                shared.close()
+            print(f"{n_workers:>7} {mode:<6} {prepare:>7.2f}s {launch:>7.2f}s {ready:>7.2f}s {pickled / 2**10:>13.1f}Ki {pss / 2**10:>8.1f}Mi")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum, IntEnum
-from typing import Any, List, Set
+from typing import Any, List, Mapping, Set
 
 from crc import Calculator, Configuration
 
@@ -78,6 +78,19 @@ class EventNet:
     type: EventNetTypes
     type_medium: MediumTypes
     data: List[Any] = field(default_factory=list)
+    rssi: Mapping[int, float] | None = field(default=None, repr=False)  # receiver_id -> RSSI when one reception is shared by every receiver
+
+    def rssi_at(self, receiver_id: int) -> float | None:
+        """RSSI receiver_id hears the frame with: from the shared side table, else the frame's own."""
+        if self.rssi is not None:
+            return self.rssi[receiver_id]
+        return getattr(self.data, "rssi", None)
+
+    def data_for(self, receiver_id: int) -> Any:
+        """The frame as receiver_id gets it, a shallow copy with its RSSI when the frame is shared."""
+        if self.rssi is None:
+            return self.data
+        return replace(self.data, rssi=self.rssi[receiver_id])
 
 
 class LocalEventTypes(Enum):
@@ -115,6 +128,24 @@ class NodeMediumInfo:
     is_gateway: bool = False
 
 
+@dataclass(frozen=True)
+class NodeConfig:
+    """Node parameters that vary between runs; the defaults are the values the nodes always used."""
+
+    seed: int = 0  # mixed into the per-node Random streams, 0 keeps Random(node_id)
+    slot_count: int = 18
+    slot_duration: int = 220
+    battery_capacity_joule: float = 7.9
+    battery_recharge_rate_joule_per_second: float = 0.0054
+    reception_model: str = "overlap"  # D2D receive-queue resolver, see node.transceiver.collision.RECEPTION_MODELS
+    gateway_reception: str = "ideal"  # see node.transceiver.gateway_reception.GATEWAY_RECEPTIONS
+    gateway_demodulators: int = 8
+    wan_channels: int = 8
+
+    def rng_seed(self, node_id: int) -> int:
+        return (self.seed << 32) | node_id
+
+
 @dataclass
 class LogMessage:
     global_time: int
@@ -3,7 +3,7 @@ from collections import defaultdict
 
 from pyparsing import cast
 
-from custom_types import Area, LocalEventTypes, MediumTypes, Severity, TransceiverState
+from custom_types import Area, LocalEventTypes, MediumTypes, NodeConfig, Severity, TransceiverState
 from Interfaces import IDevice
 from logger import ILogger
 from loraWanFrameHelper import LoRaWanPHYPayload, make_downlink_ack
@@ -16,13 +16,13 @@ from payload_types import MegaSync, MegaSyncReq
 
 
 class Gateway(IDevice):
-    def __init__(self, gateway_id: int, second_to_global_tick: float, medium_service: MediumService, log: ILogger):
+    def __init__(self, gateway_id: int, second_to_global_tick: float, medium_service: MediumService, log: ILogger, config: NodeConfig = NodeConfig()):
         self.gateway_id = gateway_id
         self.log = log
         self.local_event_queue = LocalEventQueue()
         self.accumulated_state = AccumulatedState()
 
-        self.transceiver = TransceiverService(self.gateway_id, medium_service, self.local_event_queue, second_to_global_tick, log)
+        self.transceiver = TransceiverService(self.gateway_id, medium_service, self.local_event_queue, second_to_global_tick, log, config, gateway=True)
         self.second_to_global_tick = second_to_global_tick
         self.rx_at_tick: dict[int, list[LoRaWanPHYPayload]] = defaultdict(list)
         self._tx_window_time = 1000
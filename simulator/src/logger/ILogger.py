@@ -15,6 +15,10 @@ class ILogger(ABC):
     def add(self, severity: Severity, area: Area, global_time: int, msg: str, data: Any = None) -> None:
         """Append a log message to the logger's buffer."""
 
+    def enabled_for(self, severity: Severity) -> bool:
+        """Whether add keeps messages of this severity; callers skip formatting messages it would drop."""
+        return True
+
     @abstractmethod
     def get(self) -> List[str]:
         """Get log buffer"""
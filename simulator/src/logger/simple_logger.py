@@ -6,6 +6,14 @@ from custom_types import Area, Severity
 from logger.ILogger import ILogger
 
 
+def severities_below(min_severity: Severity | None) -> frozenset[Severity]:
+    """Severities a logger with this threshold drops; none without a threshold."""
+    if min_severity is None:
+        return frozenset()
+    order = list(Severity)
+    return frozenset(order[: order.index(min_severity)])
+
+
 class SimpleLogger(ILogger):
     """Lightweight logger that buffers messages and flushes them to a file.
 
@@ -16,7 +24,7 @@ class SimpleLogger(ILogger):
 
     _log_caller_filename = False  # BEWARE, performance killer
 
-    def __init__(self, log_path: str, buffer_size: int = 10) -> None:
+    def __init__(self, log_path: str, buffer_size: int = 10, min_severity: Severity | None = None) -> None:
         """Create a logger.
 
         Parameters
@@ -25,10 +33,15 @@ class SimpleLogger(ILogger):
                 Path to the file in which flushed messages will be appended.
         buffer_size:
                 Number of messages to accumulate before an automatic flush.
+        min_severity:
+                Messages below it are dropped as they are added. By default everything
+                is buffered (the GUI shows DEBUG lines) and only DEBUG is kept out of the file.
         """
 
         self.log_path = log_path
         self.buffer_size = buffer_size
+        self.min_severity = min_severity
+        self._dropped = severities_below(min_severity)
         self._buffer: List[str] = []
         self._first_flush_done = False
 
@@ -37,7 +50,12 @@ class SimpleLogger(ILogger):
         """Enable/disable automatic caller filename tracking in logs."""
         cls._log_caller_filename = enabled
 
+    def enabled_for(self, severity: Severity) -> bool:
+        return severity not in self._dropped
+
     def add(self, severity: Severity, area: Area, global_time: int, info: str, data: Any = None) -> None:
+        if severity in self._dropped:
+            return
         caller_filename = ""
         if self._log_caller_filename:
             frame = inspect.currentframe()
@@ -61,6 +79,9 @@ class SimpleLogger(ILogger):
     def _filter_blacklisted_severities(self, lines: List[str]) -> List[str]:
         """Remove blacklisted severities from log output."""
 
+        if self.min_severity is not None:
+            return lines  # filtered in add()
+
         blocked = {
             "DEBUG",
         }
@@ -140,6 +140,10 @@ class LoRaWanPHYPayload(ILength):
 
     mic: bytes = b"\x00\x00\x00\x00"  # 4 bytes
 
+    # Radio parameters, not part of the frame bytes (kept out of the logged repr)
+    channel: int = field(default=0, repr=False)
+    sf: int = field(default=7, repr=False)
+
     # ---- Derived ----
 
     @property
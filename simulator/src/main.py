@@ -28,6 +28,7 @@ from PySide6.QtWidgets import (
 from custom_types import Area, Severity, SimState
 from sim.engine import GUI_LOG_DISPLAY_LINES, Engine
 from sim.global_time import GlobalTime
+from sim.topology_cache import DEFAULT_CACHE_DIR
 
 REFRESH_RATE_MS = 50
 
@@ -106,7 +107,7 @@ class GUI(QMainWindow):
         log_path = os.path.join(run_folder, "simulation.log")
 
         topology_path = getattr(self, "_topology_path", TOPOLOGY_OPTIONS[0])
-        self.engine = Engine(log_path=log_path, topology_json_path=topology_path)
+        self.engine = Engine(log_path=log_path, topology_json_path=topology_path, topology_cache_dir=DEFAULT_CACHE_DIR, worker_topology="shared", dispatch="pipelined")
         self._sim_state = SimState.STOPPED
         self._latest_tick = 0
         self._target_tick = None
@@ -3,8 +3,10 @@ from collections import defaultdict
 from copy import replace
 from typing import List
 
-from custom_types import Area, EventNet, EventNetTypes, LoRaD2DFrame, MediumTypes, Severity
+from custom_types import Area, EventNet, EventNetTypes, MediumTypes, Severity
+from Interfaces import IRSSI
 from logger.ILogger import ILogger
+from medium.reach_map import RSSITables
 from sim.device_event_queue import DeviceEventQueue
 
 
@@ -17,14 +19,19 @@ class BaseMedium(ABC):
         self.transmit_event_queue: List[EventNet] = []
         self.ongoing_transmissions: dict[int, tuple[int, List[int]]] = {}  # key: from_node_id, value: (globaltick_end_transmission, [received node_ids])
         self.node_receptions: dict[int, List[EventNet]] = defaultdict(list[EventNet])  # key: to_node_id, value: List[EventNet]
+        self._rssi_tables = RSSITables()
 
     def propagate_queue(self, current_global_tick: int):
+        self.propagate_pending(current_global_tick)
+        self.__housekeep_ongoing_transmissions(current_global_tick)
+
+    def propagate_pending(self, current_global_tick: int):
+        # Ongoing transmissions are only expired by propagate_queue, so this can run several times within a tick
         for event in self.transmit_event_queue:
             self.__propagate_canceled_transmission(event)
             self.__propagate_transmission(current_global_tick, event)
 
         self.transmit_event_queue.clear()  # Clear the transmit event queue after processing all events
-        self.__housekeep_ongoing_transmissions(current_global_tick)
 
     def __propagate_canceled_transmission(self, event: EventNet):
         if event.type != EventNetTypes.CANCELED:
@@ -45,13 +52,16 @@ class BaseMedium(ABC):
         # TODO: what if a transmission is started before a previous transmission from the same node is cancelled?
         received_node_ids = self._get_reception_node_ids(event)
         self.ongoing_transmissions[event.node_id] = (event.time_end, [item[0] for item in received_node_ids])
-        for to_node_id, rssi in received_node_ids:
-            if isinstance(event.data, LoRaD2DFrame):
-                reception_event = replace(event, data=replace(event.data, rssi=rssi))  # Create a copy of the event with rssi set for D2D
-            else:
-                reception_event = event  # Don't set rssi for LoRaWAN
+        if isinstance(event.data, IRSSI):
+            # One reception for all receivers (also packed D2D frames relayed by the shm transport), each receiver's rssi is in the side table
+            reception_event = replace(event, rssi=self._rssi_tables(event.node_id, received_node_ids))
+        else:
+            reception_event = event  # Don't set rssi for LoRaWAN
+        debug = self.log.enabled_for(Severity.DEBUG)
+        for to_node_id, _ in received_node_ids:
             self.__add_reception_event_for_node(to_node_id, reception_event)
-            self.log.add(Severity.DEBUG, Area.MEDIUM, current_global_tick, f"Medium {self.type} transmitting from node {event.node_id} to node {to_node_id} with data {event.data} from global tick {event.time_start} to global tick {event.time_end}")
+            if debug:
+                self.log.add(Severity.DEBUG, Area.MEDIUM, current_global_tick, f"Medium {self.type} transmitting from node {event.node_id} to node {to_node_id} with data {event.data} from global tick {event.time_start} to global tick {event.time_end}")
 
     def __housekeep_ongoing_transmissions(self, current_global_tick: int):
         # Remove any ongoing transmissions that have ended
@@ -76,7 +86,8 @@ class BaseMedium(ABC):
     def pop_received_event_for_node(self, to_node_id: int) -> List[EventNet]:
         events = []
         if to_node_id in self.node_receptions:
-            self.log.add(Severity.DEBUG, Area.MEDIUM, 0, f"node receptions: {self.node_receptions}")
+            if self.log.enabled_for(Severity.DEBUG):
+                self.log.add(Severity.DEBUG, Area.MEDIUM, 0, f"node receptions: {self.node_receptions}")
             events = self.node_receptions[to_node_id]
             del self.node_receptions[to_node_id]  # Clear the reception queue for this node after popping the events
 
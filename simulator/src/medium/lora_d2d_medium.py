@@ -4,6 +4,8 @@ from typing import List, Set, Tuple
 from custom_types import MediumTypes, NodeMediumInfo
 from logger.ILogger import ILogger
 from medium.base_medium import BaseMedium
+from medium.range_reach import RangePropagation, build_range_csr
+from medium.reach_map import ReachCSR, ReachMapView, build_reach_csr
 from sim.device_event_queue import DeviceEventQueue
 
 
@@ -22,6 +24,25 @@ class LoraD2DMedium(BaseMedium):
     @staticmethod
     def build_reach_map(node_neighbors: dict, max_hop_count: int = 2, max_angle: float = 45.0) -> dict[int, list[tuple[int, float]]]:
         """Pre-compute D2D receiver lists for all regular nodes. O(N) startup, O(1) per transmission."""
+        return LoraD2DMedium.build_reach_csr(node_neighbors, max_hop_count, max_angle).to_dict() if max_hop_count <= 2 else LoraD2DMedium.build_reach_map_recursive(node_neighbors, max_hop_count, max_angle)
+
+    @staticmethod
+    def build_range_reach_map(node_neighbors: dict, propagation: RangePropagation) -> ReachMapView:
+        """D2D receivers by radio range from node positions instead of the neighbour graph; a sender's list is built on first use and kept."""
+        return ReachMapView(build_range_csr(node_neighbors, propagation))
+
+    @staticmethod
+    def build_reach_csr(node_neighbors: dict, max_hop_count: int = 2, max_angle: float = 45.0) -> ReachCSR:
+        """Vectorised reach map over a CSR adjacency, up to two hops; same receivers and order as the recursive traversal."""
+        if max_hop_count > 2:
+            raise ValueError("build_reach_csr supports at most 2 hops")
+        FIX_PRECISION_FACTOR = 1 / (10**9)
+        hop_rssi = [LoraD2DMedium._estimate_rssi(hop) for hop in range(1, max_hop_count + 1)]
+        return build_reach_csr(node_neighbors, hop_rssi, max_angle + FIX_PRECISION_FACTOR)
+
+    @staticmethod
+    def build_reach_map_recursive(node_neighbors: dict, max_hop_count: int = 2, max_angle: float = 45.0) -> dict[int, list[tuple[int, float]]]:
+        """Reference reach map: one _compute_receivers traversal per regular node."""
         FIX_PRECISION_FACTOR = 1 / (10**9)
         angle = max_angle + FIX_PRECISION_FACTOR
         return {
@@ -18,6 +18,11 @@ class MediumService:
         for medium in self._mediums_by_type.values():
             medium.propagate_queue(current_global_tick)
 
+    def propagate_pending(self, current_global_tick: int):
+        """Propagate what has been queued so far in this tick; propagate_mediums still has to close the tick."""
+        for medium in self._mediums_by_type.values():
+            medium.propagate_pending(current_global_tick)
+
     def transmit(self, from_node_id: int, medium_type: MediumTypes, data: List[int], time_start_global_tick: int, time_end_global_tick: int):
         event = EventNet(node_id=from_node_id, time_start=time_start_global_tick, time_end=time_end_global_tick, data=data, type=EventNetTypes.TRANSMIT, type_medium=medium_type)
         self._mediums_by_type[medium_type].add_transmission_event(event)
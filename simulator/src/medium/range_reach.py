@@ -0,0 +1,109 @@
+"""D2D reach map by radio range instead of the neighbour graph.
+
+Every regular node reaches every other regular node within range_m of it, with the RSSI of a
+log-distance path loss model (the model of mathing/gateway_coverage/coverage_calc.py). Receivers are
+found through a uniform grid hash with one range-sized cell per axis: a sender only looks at its own
+and the eight surrounding cells, so building the map is O(N k) for k nodes in range instead of
+O(N²). The result is a ReachCSR, used wherever the graph reach map is.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from medium.reach_map import ReachCSR, _topology_arrays
+
+_SPEED_OF_LIGHT = 299_792_458
+
+
+@dataclass(frozen=True)
+class RangePropagation:
+    """Log-distance link between two nodes and the map scale to measure it in.
+
+    Defaults are the coverage calculation's scenario: 14 dBm at 868 MHz, urban line of sight
+    (path loss exponent 3), 1 m reference distance and the SF7 sensitivity. max_range_m caps the
+    range the link budget allows, which is kilometres for maps drawn in metres.
+    """
+
+    m_per_svg_x: float = 1.0
+    m_per_svg_y: float = 1.0
+    tx_power_dbm: float = 14.0
+    frequency_hz: float = 868e6
+    path_loss_exponent: float = 3.0
+    reference_m: float = 1.0
+    sensitivity_dbm: float = -123.0
+    max_range_m: float | None = None
+
+    @property
+    def range_m(self) -> float:
+        """Distance at which the RSSI reaches the sensitivity, or max_range_m when that is shorter."""
+        link_budget = self.tx_power_dbm - self.sensitivity_dbm
+        budget_range = self.reference_m * 10 ** ((link_budget - self._reference_loss_db()) / (10 * self.path_loss_exponent))
+        return budget_range if self.max_range_m is None else min(budget_range, self.max_range_m)
+
+    def rssi_dbm(self, distance_m: np.ndarray) -> np.ndarray:
+        """Received power over distance_m; distances below the reference distance get its power."""
+        d_eff = np.maximum(distance_m, self.reference_m)
+        return self.tx_power_dbm - self._reference_loss_db() - 10 * self.path_loss_exponent * np.log10(d_eff / self.reference_m)
+
+    def _reference_loss_db(self) -> float:
+        # Free-space loss at the reference distance
+        return 20 * math.log10(4 * math.pi * self.reference_m * self.frequency_hz / _SPEED_OF_LIGHT)
+
+
+def build_range_csr(node_neighbors: dict, propagation: RangePropagation) -> ReachCSR:
+    """Receivers of every regular node within propagation.range_m, nearest first, ties by node id."""
+    ids, positions, is_gateway, _, _, n_known = _topology_arrays(node_neighbors)
+    ids, positions, is_gateway = ids[:n_known], positions[:n_known], is_gateway[:n_known]
+    nodes = np.flatnonzero(~is_gateway)
+    xy = positions[nodes] * np.array([propagation.m_per_svg_x, propagation.m_per_svg_y])
+    range_m = propagation.range_m
+    if not range_m > 0:
+        raise ValueError(f"Radio range must be positive, got {range_m} m")
+
+    # Grid hash: nodes sorted by cell, a cell's nodes are one contiguous run of the sorted order
+    cell = np.floor((xy - xy.min(axis=0, initial=0.0)) / range_m).astype(np.int64) if len(nodes) else np.zeros((0, 2), dtype=np.int64)
+    width = int(cell[:, 1].max(initial=0)) + 3  # room for the -1 and +1 neighbour cells
+    key = (cell[:, 0] + 1) * width + cell[:, 1] + 1
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+
+    senders, receivers = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            target = key + dx * width + dy
+            lo = np.searchsorted(sorted_key, target, side="left")
+            counts = np.searchsorted(sorted_key, target, side="right") - lo
+            sender = np.repeat(np.arange(len(nodes)), counts)
+            offset = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+            senders.append(sender)
+            receivers.append(order[lo[sender] + offset])
+    sender, receiver = np.concatenate(senders), np.concatenate(receivers)
+
+    distance = np.hypot(*(xy[receiver] - xy[sender]).T)
+    in_range = (sender != receiver) & (distance <= range_m)
+    sender, receiver, distance = sender[in_range], receiver[in_range], distance[in_range]
+
+    by_link = np.lexsort((ids[nodes][receiver], distance, sender))
+    sender, receiver, distance = sender[by_link], receiver[by_link], distance[by_link]
+    return ReachCSR(
+        node_ids=ids[nodes],
+        indptr=np.concatenate(([0], np.cumsum(np.bincount(sender, minlength=len(nodes))))),
+        receivers=ids[nodes][receiver],
+        rssi=propagation.rssi_dbm(distance),
+    )
+
+
+def build_range_reach_brute_force(node_neighbors: dict, propagation: RangePropagation) -> dict[int, list[tuple[int, float]]]:
+    """Reference: every pair of regular nodes, O(N²)."""
+    nodes = [(nid, info.position) for nid, info in node_neighbors.items() if not info.is_gateway]
+    reach = {}
+    for nid, (x, y) in nodes:
+        links = []
+        for other, (ox, oy) in nodes:
+            distance = float(np.hypot(ox * propagation.m_per_svg_x - x * propagation.m_per_svg_x, oy * propagation.m_per_svg_y - y * propagation.m_per_svg_y))
+            if other != nid and distance <= propagation.range_m:
+                links.append((distance, other))
+        reach[nid] = [(other, float(propagation.rssi_dbm(np.float64(distance)))) for distance, other in sorted(links)]
+    return reach
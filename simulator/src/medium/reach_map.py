@@ -0,0 +1,222 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import chain
+
+import numpy as np
+
+from sim.topology_table import TopologyTable
+
+_MIN_MAGNITUDE = 1e-9
+
+
+@dataclass(frozen=True)
+class ReachCSR:
+    """D2D receivers of every regular node in compressed sparse row form.
+
+    The receivers of node_ids[i] are receivers[indptr[i]:indptr[i + 1]] with matching rssi values,
+    in the order the recursive traversal finds them.
+    """
+
+    node_ids: np.ndarray
+    indptr: np.ndarray
+    receivers: np.ndarray
+    rssi: np.ndarray
+
+    @classmethod
+    def from_dict(cls, reach_map: dict[int, list[tuple[int, float]]]) -> "ReachCSR":
+        if isinstance(reach_map, ReachMapView):
+            return reach_map.csr
+        rows = list(reach_map.values())
+        n_edges = sum(map(len, rows))
+        return cls(
+            node_ids=np.fromiter(reach_map.keys(), dtype=np.int64, count=len(rows)),
+            indptr=np.concatenate(([0], np.cumsum([len(row) for row in rows], dtype=np.int64))),
+            receivers=np.fromiter((r for row in rows for r, _ in row), dtype=np.int64, count=n_edges),
+            rssi=np.fromiter((rssi for row in rows for _, rssi in row), dtype=np.float64, count=n_edges),
+        )
+
+    def to_dict(self) -> dict[int, list[tuple[int, float]]]:
+        pairs = list(zip(self.receivers.tolist(), self.rssi.tolist()))
+        bounds = self.indptr.tolist()
+        return {nid: pairs[bounds[i] : bounds[i + 1]] for i, nid in enumerate(self.node_ids.tolist())}
+
+
+class ReachMapView(Mapping):
+    """Read-only reach map over a ReachCSR; a node's receiver list is only built on first access.
+
+    Drop-in for the dict from LoraD2DMedium.build_reach_map where building millions of tuples up
+    front would dominate start-up, e.g. for a reach map loaded from the topology cache.
+    """
+
+    def __init__(self, csr: ReachCSR):
+        self._csr = csr
+        self._row = {nid: i for i, nid in enumerate(csr.node_ids.tolist())}
+        self._receivers: dict[int, list[tuple[int, float]]] = {}
+
+    @property
+    def csr(self) -> ReachCSR:
+        return self._csr
+
+    def __getitem__(self, node_id: int) -> list[tuple[int, float]]:
+        receivers = self._receivers.get(node_id)
+        if receivers is None:
+            i = self._row[node_id]
+            start, stop = int(self._csr.indptr[i]), int(self._csr.indptr[i + 1])
+            receivers = self._receivers[node_id] = list(zip(self._csr.receivers[start:stop].tolist(), self._csr.rssi[start:stop].tolist()))
+        return receivers
+
+    def __iter__(self):
+        return iter(self._row)
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+
+class RSSITables:
+    """{receiver_id: rssi} of a sender, the side table a shared reception carries in EventNet.rssi.
+
+    Reach map rows are the same list on every transmission, so a sender's table is built once and
+    reused until its row changes.
+    """
+
+    def __init__(self):
+        self._tables: dict[int, tuple[list[tuple[int, float]], dict[int, float]]] = {}
+
+    def __call__(self, sender: int, receivers: list[tuple[int, float]]) -> dict[int, float]:
+        cached = self._tables.get(sender)
+        if cached is None or cached[0] is not receivers:
+            cached = self._tables[sender] = (receivers, dict(receivers))
+        return cached[1]
+
+
+def _topology_arrays(node_neighbors: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """Flatten the topology into (ids, positions, is_gateway, indptr, neighbor indices, n_known).
+
+    Neighbours missing from node_neighbors become trailing phantom entries without neighbours, the
+    recursive traversal also records them on the first hop but never expands them.
+    """
+    if isinstance(node_neighbors, TopologyTable):
+        # Already columnar, no NodeMediumInfo is materialised
+        n = len(node_neighbors)
+        ids = node_neighbors.node_ids.astype(np.int64)
+        degree = np.diff(node_neighbors.neighbor_ptr)
+        flat = node_neighbors.neighbors.astype(np.int64)
+        positions, is_gateway = node_neighbors.positions, node_neighbors.is_gateway
+    else:
+        infos = list(node_neighbors.values())
+        n = len(infos)
+        ids = np.fromiter(node_neighbors.keys(), dtype=np.int64, count=n)
+        degree = np.fromiter((len(info.neighbors) for info in infos), dtype=np.int64, count=n)
+        flat = np.fromiter(chain.from_iterable(info.neighbors for info in infos), dtype=np.int64, count=int(degree.sum()))
+        positions = np.fromiter(chain.from_iterable(info.position for info in infos), dtype=np.float64, count=2 * n).reshape(n, 2)
+        is_gateway = np.fromiter((info.is_gateway for info in infos), dtype=bool, count=n)
+
+    phantoms = np.setdiff1d(flat, ids)
+    if len(phantoms):
+        ids = np.concatenate((ids, phantoms))
+        degree = np.concatenate((degree, np.zeros(len(phantoms), dtype=np.int64)))
+        positions = np.concatenate((positions, np.full((len(phantoms), 2), np.nan)))
+
+    order = np.argsort(ids, kind="stable")
+    indices = order[np.searchsorted(ids, flat, sorter=order)]
+    indptr = np.concatenate(([0], np.cumsum(degree)))
+    return ids, positions, is_gateway, indptr, indices, n
+
+
+def _gather_links(indptr: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Links of rows in row order: (entry -> position in rows, entry -> rank in its row, link index)."""
+    counts = indptr[rows + 1] - indptr[rows]
+    owner = np.repeat(np.arange(len(rows)), counts)
+    rank = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, rank, indptr[rows][owner] + rank
+
+
+def build_reach_csr(node_neighbors: dict, hop_rssi: list[float], max_propagation_angle: float) -> ReachCSR:
+    """Batched equivalent of LoraD2DMedium._compute_receivers for one or two hops.
+
+    The recursive traversal is depth first with one visited set per sender: the k-th direct
+    neighbour is recorded, then its cone-filtered neighbours, before the (k+1)-th direct neighbour
+    is looked at. A later direct neighbour already reached over two hops keeps the two-hop RSSI and
+    is not expanded again. All candidate paths are enumerated and cone-tested at once, laid out in
+    traversal order; only the visited bookkeeping then steps through the neighbour ranks, handling
+    all senders per step.
+    """
+    ids, positions, is_gateway, indptr, indices, n_known = _topology_arrays(node_neighbors)
+    n_total = len(ids)
+    senders = np.flatnonzero(~is_gateway)
+
+    # Direction of every link, computed once instead of per path
+    source = np.repeat(np.arange(n_total), np.diff(indptr))
+    dx = positions[indices, 0] - positions[source, 0]
+    dy = positions[indices, 1] - positions[source, 1]
+    magnitude = np.sqrt(dx**2 + dy**2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ux, uy = dx / magnitude, dy / magnitude
+
+    # First hops: (sender slot, neighbour rank, link), ordered by slot then rank
+    slot, rank, link = _gather_links(indptr, senders)
+    node = indices[link]
+    n_first = len(node)
+
+    if len(hop_rssi) >= 2 and n_first:
+        # Incoming direction sender -> first hop, zero when both sit on the same spot
+        moving = magnitude[link] > _MIN_MAGNITUDE
+        in_x, in_y = np.where(moving, ux[link], 0.0), np.where(moving, uy[link], 0.0)
+
+        expandable = np.flatnonzero(node < n_known)
+        owner, _, second_link = _gather_links(indptr, node[expandable])
+        owner = expandable[owner]
+        with np.errstate(invalid="ignore"):
+            dot = np.clip(in_x[owner] * ux[second_link] + in_y[owner] * uy[second_link], -1.0, 1.0)
+            in_cone = (magnitude[second_link] < _MIN_MAGNITUDE) | ~(np.degrees(np.arccos(dot)) >= np.float64(max_propagation_angle))
+        owner, second_link = owner[in_cone], second_link[in_cone]
+
+        # Interleave: each first hop is followed by its second hops, as the traversal finds them
+        kids = np.bincount(owner, minlength=n_first)
+        kids_before = np.cumsum(kids) - kids
+        first_at = np.arange(n_first) + kids_before
+        second_at = first_at[owner] + 1 + np.arange(len(owner)) - kids_before[owner]
+        n_paths = n_first + len(owner)
+        path_slot, path_rank, path_node = (np.empty(n_paths, dtype=np.int64) for _ in range(3))
+        path_hop = np.full(n_paths, 2, dtype=np.int8)
+        parent = np.full(n_paths, -1)
+        path_slot[first_at], path_rank[first_at], path_node[first_at], path_hop[first_at] = slot, rank, node, 1
+        path_slot[second_at], path_rank[second_at], path_node[second_at], parent[second_at] = slot[owner], rank[owner], indices[second_link], first_at[owner]
+        slot, rank, node, hop = path_slot, path_rank, path_node, path_hop
+    else:
+        hop = np.ones(n_first, dtype=np.int8)
+        parent = np.full(n_first, -1)
+
+    # Dense id per (sender, node); the sender itself counts as visited from the start
+    sender = senders[slot]
+    _, key = np.unique(sender * n_total + node, return_inverse=True)
+    taken = np.zeros(len(key), dtype=bool)
+    accepted = node != sender
+    # Stable sort on the rank keeps traversal order inside a rank; small ints sort by radix
+    max_rank = int(rank.max(initial=0))
+    by_rank = np.argsort(rank.astype(np.min_scalar_type(max_rank)), kind="stable")
+    bounds = np.searchsorted(rank[by_rank], np.arange(max_rank + 2))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        step = by_rank[start:stop]
+        is_first = hop[step] == 1
+        first = step[is_first]
+        accepted[first] &= ~taken[key[first]]
+        taken[key[first[accepted[first]]]] = True
+
+        second = step[~is_first]
+        accepted[second] &= accepted[parent[second]] & ~taken[key[second]]
+        second = second[accepted[second]]
+        # A neighbour listed twice is only recorded the first time
+        _, first_seen = np.unique(key[second], return_index=True)
+        accepted[second] = False
+        accepted[second[first_seen]] = True
+        taken[key[second]] = True
+
+    result = np.flatnonzero(accepted)
+    counts = np.bincount(slot[result], minlength=len(senders))
+    return ReachCSR(
+        node_ids=ids[senders],
+        indptr=np.concatenate(([0], np.cumsum(counts))),
+        receivers=ids[node[result]],
+        rssi=np.asarray(hop_rssi, dtype=np.float64)[hop[result] - 1],
+    )
@@ -42,6 +42,11 @@ class Battery(IModule):
     def reset(self, current_global_tick: int) -> None:
         pass
 
+    # new constants take effect at the next evaluation, the charge is clamped to the new capacity there
+    def reconfigure(self, capacity_joule: float, recharge_rate_joule_per_second: float, second_to_global_tick: float) -> None:
+        self.capacity = capacity_joule
+        self.recharge_rate = recharge_rate_joule_per_second * second_to_global_tick
+
     def is_dead(self) -> bool:
         return self.current_charge <= 0
 
@@ -12,7 +12,7 @@ from .kalmanClock import KalmanFilterAR1Trend as Kalman
 
 # log = Logger()
 class Clock(IModule):
-    def __init__(self, log: ILogger, node_id: int, local_event_queue: LocalEventQueue, second_to_global_tick: float): 
+    def __init__(self, log: ILogger, node_id: int, local_event_queue: LocalEventQueue, second_to_global_tick: float, rng_seed: int | None = None): 
         self.node_id = node_id
         self.local_event_queue = local_event_queue
         self.log = log
@@ -31,7 +31,7 @@ class Clock(IModule):
         self.scheduled_global_tick: int | None = None
         self.earliest_next_local_time: int | None = None
 
-        self.rng = np.random.default_rng(node_id)
+        self.rng = np.random.default_rng(node_id if rng_seed is None else rng_seed)
         self.trend: float =  self.rng.uniform(-40e-6, 40e-6)
         self.noise_std: float = np.sqrt(20.970167331917025 * 3.915e-15)
         self.ar_constant: float = 0.9087642375247008
@@ -1,7 +1,7 @@
 # type: ignore
 from enum import Enum
 
-from custom_types import Area, LocalEventTypes, Severity
+from custom_types import Area, LocalEventTypes, NodeConfig, Severity
 from Interfaces import IDevice
 from logger import ILogger
 from medium.medium_service import MediumService
@@ -21,16 +21,16 @@ class State(Enum):
 
 
 class Node(IDevice):
-    def __init__(self, node_id: int, second_to_global_tick: float, medium_service: MediumService, log: ILogger):
+    def __init__(self, node_id: int, second_to_global_tick: float, medium_service: MediumService, log: ILogger, config: NodeConfig = NodeConfig()):
         self.node_id = node_id
         self.local_event_queue = LocalEventQueue()
         self.accumulated_state = AccumulatedState()
 
-        self.battery = Battery(capacity_joule=7.9, recharge_rate_joule_per_second=0.0054, second_to_global_tick=second_to_global_tick)
-        self.clock = Clock(log, self.node_id, self.local_event_queue, second_to_global_tick)
-        self.transceiver = TransceiverService(self.node_id, medium_service, self.local_event_queue, second_to_global_tick, log)
+        self.battery = Battery(capacity_joule=config.battery_capacity_joule, recharge_rate_joule_per_second=config.battery_recharge_rate_joule_per_second, second_to_global_tick=second_to_global_tick)
+        self.clock = Clock(log, self.node_id, self.local_event_queue, second_to_global_tick, rng_seed=config.rng_seed(node_id))
+        self.transceiver = TransceiverService(self.node_id, medium_service, self.local_event_queue, second_to_global_tick, log, config)
         # self.protocol = PingPongProtocol(self.node_id, self.local_event_queue, second_to_global_tick, log)
-        self.protocol = V02(self.node_id, self.local_event_queue, second_to_global_tick, log)
+        self.protocol = V02(self.node_id, self.local_event_queue, second_to_global_tick, log, config)
         self.state = State.WAKE
         self.log = log
         self.second_to_global_tick = second_to_global_tick
@@ -17,12 +17,13 @@ class AppState(Enum):
 
 
 class APP:
-    def __init__(self, node_id: int, local_event_queue: LocalEventQueue, log: ILogger, app_to_dll_tx: list[PayloadData], dll_to_app_rx: list[PayloadData]):
+    def __init__(self, node_id: int, local_event_queue: LocalEventQueue, log: ILogger, app_to_dll_tx: list[PayloadData], dll_to_app_rx: list[PayloadData], rng_seed: int | None = None):
         self.node_id = node_id
+        self.rng_seed = node_id if rng_seed is None else rng_seed
         self.local_event_queue = local_event_queue
         self.log = log
         self.state = AppState.INITIAL_SLEEP
-        self.random = Random(self.node_id)
+        self.random = Random(self.rng_seed)
         self.app_to_dll_tx = app_to_dll_tx
         self.dll_to_app_rx = dll_to_app_rx
         self.sensor_buffer: list[tuple[int, int]] = []
@@ -107,6 +108,6 @@ class APP:
         self.state = AppState.INITIAL_SLEEP
         self.app_to_dll_tx.clear()
         self.dll_to_app_rx.clear()
-        self.random = Random(self.node_id)
+        self.random = Random(self.rng_seed)
         self.sensor_buffer.clear()
         self.last_measurement_time = None
@@ -37,9 +37,10 @@ class D2DDLL:
     NEIGHBOR_DEAD_THREASHHOLD_MS = PERIOD_MS * 2
     MAX_HOPCOUNT = 65535
 
-    def __init__(self, node_id: int, local_event_queue: LocalEventQueue, log: ILogger, slot_duration: int = 220, slot_count: int = 18):
+    def __init__(self, node_id: int, local_event_queue: LocalEventQueue, log: ILogger, slot_duration: int = 220, slot_count: int = 18, rng_seed: int | None = None):
 
         self._node_id = node_id
+        self._rng_seed = node_id if rng_seed is None else rng_seed
         self._local_event_queue = local_event_queue
         self._log = log
         self._slot_duration = slot_duration
@@ -66,7 +67,7 @@ class D2DDLL:
         self._offset_for_req_ack: int = 0
         self._tx_start_end_buffer: int = 20
         self._tx_offset_done = False
-        self._rnd = Random(self._node_id)
+        self._rnd = Random(self._rng_seed)
         self._slot_period_start: int = 0
 
     @property
@@ -1,4 +1,4 @@
-from custom_types import LocalEventTypes
+from custom_types import LocalEventTypes, NodeConfig
 from logger.ILogger import ILogger
 from node.event_local_queue import LocalEventQueue
 from node.Imodule import IModule
@@ -10,7 +10,7 @@ from payload_types import PayloadData
 
 
 class V02(IModule):
-    def __init__(self, node_id: int, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger):
+    def __init__(self, node_id: int, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger, config: NodeConfig = NodeConfig()):
         self.node_id = node_id
         self.local_event_queue = local_event_queue
         self.second_to_global_tick = second_to_global_tick
@@ -19,8 +19,8 @@ class V02(IModule):
         self.app_to_dll_tx: list[PayloadData] = []
         self.dll_to_app_rx: list[PayloadData] = []
 
-        self.app = APP(node_id, local_event_queue, log, self.app_to_dll_tx, self.dll_to_app_rx)
-        self.d2d = D2DDLL(node_id, local_event_queue, log)
+        self.app = APP(node_id, local_event_queue, log, self.app_to_dll_tx, self.dll_to_app_rx, rng_seed=config.rng_seed(node_id))
+        self.d2d = D2DDLL(node_id, local_event_queue, log, slot_duration=config.slot_duration, slot_count=config.slot_count, rng_seed=config.rng_seed(node_id))
         self.wan = WANDLL(node_id, local_event_queue, log)
         self.dll = DLL(node_id, local_event_queue, second_to_global_tick, log, self.d2d, self.wan, self.app_to_dll_tx, self.dll_to_app_rx)
 
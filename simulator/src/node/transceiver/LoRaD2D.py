@@ -1,16 +1,17 @@
 from typing import List
 
-from custom_types import EventNet, EventNetTypes, MediumTypes
+from custom_types import EventNet, MediumTypes
 from Interfaces import ILength
 from logger.ILogger import ILogger
 from medium.medium_service import MediumService
 from node.event_local_queue import LocalEventQueue
 from node.transceiver.base_transceiver import BaseTransceiver
+from node.transceiver.collision import reception_model
 from node.transceiver.lora_tx_duration_calculator import LoRaTxDurationCalculator
 
 
 class LoRaD2D(BaseTransceiver):
-    def __init__(self, node_id: int, medium_service: MediumService, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger):
+    def __init__(self, node_id: int, medium_service: MediumService, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger, reception_model_name: str = "overlap"):
         joules_per_second_consumption_transmit = 0.396
         joules_per_second_consumption_receive = 0.03564
         joules_per_second_consumption_idle = 0  # 0.66E-6 moved new estimate into WAKE in node.py
@@ -23,6 +24,7 @@ class LoRaD2D(BaseTransceiver):
         self.__preamble_length = 8  # Preamble length in symbols
 
         self.__calculator = LoRaTxDurationCalculator(second_to_global_tick, self.__sf, self.__bandwidth, self.__coding_rate, self.__preamble_length)
+        self.__resolve = reception_model(reception_model_name, self.__sf, self.__bandwidth, node_id)
 
         self._collision_this_tick = False
 
@@ -37,56 +39,19 @@ class LoRaD2D(BaseTransceiver):
         return had
 
     def _get_successful_receptions(self, current_global_tick: int) -> List[EventNet]:
-        successful_receptions: List[EventNet] = []
         if self._current_reception_start_global_tick is None:
-            return successful_receptions
+            return []
 
         self._receive_queue.sort(key=lambda x: x.time_start)
 
-        cancellations = [e for e in self._receive_queue if e.type == EventNetTypes.CANCELED]
-        canc_by_node: dict[int, List[EventNet]] = {}
-        for c in cancellations:
-            canc_by_node.setdefault(c.node_id, []).append(c)
-
-        for event in self._receive_queue:
-            if event.type == EventNetTypes.CANCELED:
-                continue
-
-            if event.time_end >= current_global_tick:
-                continue
-
-            if self._current_reception_start_global_tick is not None and self._current_reception_start_global_tick > event.time_start:
-                continue
-
-            if event.node_id in canc_by_node:
-                continue
-
-            overlap_found = False
-            for other in self._receive_queue:
-                if other is event:
-                    continue
-                if other.type == EventNetTypes.CANCELED:
-                    continue
-
-                other_effective_end = other.time_end
-
-                for c in canc_by_node.get(other.node_id, []):
-                    if c.time_end > event.time_start:
-                        other_effective_end = min(other_effective_end, c.time_start)
-
-                if other.time_start <= event.time_end and other_effective_end >= event.time_start:
-                    overlap_found = True
-                    break
-
-            if not overlap_found:
-                successful_receptions.append(event)
-            else:
-                self._collision_this_tick = True
+        received, collided = self.__resolve(self._receive_queue, current_global_tick, self._current_reception_start_global_tick)
+        if collided:
+            self._collision_this_tick = True
 
         max_time_end = 0
-        for event in successful_receptions:
+        for event in received:
             max_time_end = max(max_time_end, event.time_end)
 
         self._receive_queue = [e for e in self._receive_queue if e.time_start > max_time_end]
 
-        return successful_receptions
+        return received
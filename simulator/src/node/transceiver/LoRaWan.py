@@ -1,16 +1,20 @@
+import random
+from copy import replace
 from typing import List
 
-from custom_types import EventNet, EventNetTypes, MediumTypes
+from custom_types import EventNet, EventNetTypes, MediumTypes, NodeConfig
 from Interfaces import ILength
 from logger.ILogger import ILogger
 from medium.medium_service import MediumService
 from node.event_local_queue import LocalEventQueue
 from node.transceiver.base_transceiver import BaseTransceiver
+from node.transceiver.collision import reception_model
+from node.transceiver.gateway_reception import GATEWAY_RECEPTIONS, GatewayReception, keep_undecided
 from node.transceiver.lora_tx_duration_calculator import LoRaTxDurationCalculator
 
 
 class LoRaWan(BaseTransceiver):
-    def __init__(self, node_id: int, medium_service: MediumService, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger):
+    def __init__(self, node_id: int, medium_service: MediumService, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger, config: NodeConfig = NodeConfig(), gateway: bool = False):
         joules_per_second_consumption_transmit = 0.396
         joules_per_second_consumption_receive = 0.03564
         joules_per_second_consumption_idle = 0  # 0.66E-6 moved new estimate into WAKE in node.py
@@ -24,47 +28,37 @@ class LoRaWan(BaseTransceiver):
 
         self.__calculator = LoRaTxDurationCalculator(second_to_global_tick, self.__sf, self.__bandwidth, self.__coding_rate, self.__preamble_length)
 
+        # The ideal gateway checks no collisions; the concentrator hops uplinks over wan_channels and
+        # demodulates them in gateway_demodulators parallel paths
+        if config.gateway_reception not in GATEWAY_RECEPTIONS:
+            raise ValueError(f"Unknown gateway reception '{config.gateway_reception}', expected one of {GATEWAY_RECEPTIONS}")
+        concentrator = config.gateway_reception == "concentrator"
+        self.__channels = config.wan_channels
+        self.__channel_rng = random.Random(f"{config.rng_seed(node_id)}-wan-channel") if concentrator else None
+        self.__gateway_reception = GatewayReception(config.gateway_demodulators, reception_model(config.reception_model, self.__sf, self.__bandwidth)) if concentrator and gateway else None
+
     def _calculate_transmission_duration_ticks(self, data: ILength) -> int:
         return self.__calculator.get_duration(data.length)
 
-    def _get_successful_receptions(self, current_global_tick: int) -> List[EventNet]:
-        successful_receptions: List[EventNet] = []
+    def _on_air(self, data: ILength) -> ILength:
+        if self.__channel_rng is None:
+            return data
+        return replace(data, channel=self.__channel_rng.randrange(self.__channels), sf=self.__sf)
 
+    def _get_successful_receptions(self, current_global_tick: int) -> List[EventNet]:
         if self._current_reception_start_global_tick is None:
-            return successful_receptions
-
-        cancellations = [e for e in self._receive_queue if e.type == EventNetTypes.CANCELED]
-        canc_by_node: dict[int, List[EventNet]] = {}
-        for c in cancellations:
-            canc_by_node.setdefault(c.node_id, []).append(c)
-
-        for event in self._receive_queue:
-            if event.type == EventNetTypes.CANCELED:
-                continue
-
-            if event.time_end >= current_global_tick:
-                continue
-
-            if self._current_reception_start_global_tick is not None and self._current_reception_start_global_tick > event.time_start:
-                continue
-
-            if event.node_id in canc_by_node:
-                continue
-
-            for other in self._receive_queue:
-                if other is event:
-                    continue
-                if other.type == EventNetTypes.CANCELED:
-                    continue
-                if other.time_start > current_global_tick:
-                    continue
-
-                other_effective_end = other.time_end
-                for c in canc_by_node.get(other.node_id, []):
-                    if c.time_end > event.time_start:
-                        other_effective_end = min(other_effective_end, c.time_start)
-
-            successful_receptions.append(event)
+            return []
+
+        if self.__gateway_reception is not None:
+            self._receive_queue.sort(key=lambda x: x.time_start)
+            received, _ = self.__gateway_reception(self._receive_queue, current_global_tick, self._current_reception_start_global_tick)
+            self._receive_queue = keep_undecided(self._receive_queue, current_global_tick)
+            return received
+
+        # Ideal receiver: overlaps are not checked, but frames that started before a received frame
+        # ended leave the queue with it
+        canc_by_node = {e.node_id for e in self._receive_queue if e.type == EventNetTypes.CANCELED}
+        successful_receptions = [e for e in self._receive_queue if e.type != EventNetTypes.CANCELED and e.time_end < current_global_tick and self._current_reception_start_global_tick <= e.time_start and e.node_id not in canc_by_node]
 
         max_time_end = 0
         for event in successful_receptions:
@@ -66,7 +66,7 @@ class BaseTransceiver(IModule):
                 self.state = TransceiverState.TRANSMITTING
 
                 for e, duration in zip(transmit_data_events, durations):
-                    self._medium_service.transmit(self._node_id, self.medium_type, e.data, current_global_tick, current_global_tick + duration)
+                    self._medium_service.transmit(self._node_id, self.medium_type, self._on_air(e.data), current_global_tick, current_global_tick + duration)
                     self.log.add(Severity.DEBUG, Area.TRANCEIVER, current_global_tick, f"Node {self._node_id} started transmitting on {self.medium_type} with data {e.data} for a duration of {duration} ticks (until global tick {current_global_tick + duration})")
 
         if self.state == TransceiverState.TRANSMITTING:
@@ -83,8 +83,9 @@ class BaseTransceiver(IModule):
 
             received_events = self._get_successful_receptions(current_global_tick)
             for event in received_events:
-                self._local_event_queue.add_event_to_current_tick(LocalEventTypes.TRANCEIVER_RECEIVED_DATA, event.data, sub_type=self.medium_type)
-                self.log.add(Severity.DEBUG, Area.TRANCEIVER, current_global_tick, f"Node {self._node_id} successfully received data {event.data} on {self.medium_type} from node {event.node_id}")  # TODO add guid to track payload between nodes?
+                data = event.data_for(self._node_id)  # frames shared by all receivers are only copied once actually received
+                self._local_event_queue.add_event_to_current_tick(LocalEventTypes.TRANCEIVER_RECEIVED_DATA, data, sub_type=self.medium_type)
+                self.log.add(Severity.DEBUG, Area.TRANCEIVER, current_global_tick, f"Node {self._node_id} successfully received data {data} on {self.medium_type} from node {event.node_id}")  # TODO add guid to track payload between nodes?
 
             if self._had_collision():
                 self._local_event_queue.add_event_to_current_tick(LocalEventTypes.TRANCEIVER_COLLISION, None, sub_type=self.medium_type)
@@ -110,6 +111,11 @@ class BaseTransceiver(IModule):
     def _calculate_transmission_duration_ticks(self, data: ILength) -> int:
         pass
 
+    def _on_air(self, data: ILength) -> ILength:
+        # transceivers that pick radio parameters per transmission (e.g. the uplink channel) return
+        # the frame as the medium should see it. default: the data as handed over by the protocol.
+        return data
+
     def _cancel_transmission(self, current_global_tick):
         # Logic to determine if a transmission can be cancelled (e.g., if the node dies during transmission)
         if self._current_transmission_end_global_tick == 0:
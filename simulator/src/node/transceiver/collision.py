@@ -0,0 +1,294 @@
+"""Collision resolution for a transceiver's receive queue.
+
+A frame is received when it ended before the current tick, started after the reception began, its
+sender cancelled nothing and no other frame in the queue overlaps it. Another frame counts with its
+effective end: a cancellation of that frame's sender that ends after the candidate starts cuts it
+short at the cancellation's start.
+
+successful_receptions_indexed answers the overlap question with interval indexes built once per
+call, O(n log n) plus one lookup per candidate and sender with cancellations.
+successful_receptions_pairwise is the reference, comparing every candidate with every other frame;
+it stays the faster one for the handful of frames a receiver usually holds, so
+successful_receptions picks by queue length.
+
+That is the "overlap" reception model. The "capture" model (CaptureModel) keeps the same candidates
+and effective ends but decides on power: a candidate is received when its RSSI reaches the spreading
+factor's sensitivity and exceeds the summed power of every frame overlapping it by the capture
+threshold, so the stronger of two colliding frames survives. reception_model() builds either from
+its name.
+"""
+
+import math
+from bisect import bisect_right
+from typing import Callable, List
+
+import numpy as np
+
+from custom_types import EventNet, EventNetTypes
+
+# Up to this many queued events the pairwise loop beats building the indexes
+PAIRWISE_MAX_EVENTS = 12
+
+RECEPTION_MODELS = ("overlap", "capture")
+
+CAPTURE_THRESHOLD_DB = 6.0  # SIR at which the stronger of two same-SF frames is still demodulated
+NOISE_FIGURE_DB = 6.0
+REQUIRED_SNR_DB = {7: -7.5, 8: -10.0, 9: -12.5, 10: -15.0, 11: -17.5, 12: -20.0}  # demodulator floor per SF (SX1276)
+DEFAULT_RSSI = -40.0  # frames without an RSSI, the value LoraWanMedium reports
+
+Resolver = Callable[[List[EventNet], int, int], tuple[List[EventNet], bool]]
+
+
+class OverlapIndex:
+    """Frames sorted by start with a running top two of their ends.
+
+    overlaps() finds whether any indexed frame other than the given one starts at or before end and
+    ends at or after start with one binary search.
+    """
+
+    def __init__(self, frames: List[EventNet]):
+        self._starts = [f.time_start for f in frames]
+        self._best: list[tuple[int, EventNet, float]] = []  # per prefix: (longest end, its frame, longest end of any other frame)
+        end1, frame1, end2 = float("-inf"), None, float("-inf")
+        for f in frames:
+            if f.time_end > end1:
+                if f is not frame1:
+                    end2 = end1
+                end1, frame1 = f.time_end, f
+            elif f is not frame1 and f.time_end > end2:
+                end2 = f.time_end
+            self._best.append((end1, frame1, end2))
+
+    def overlaps(self, frame: EventNet, start: int, end: int) -> bool:
+        i = bisect_right(self._starts, end)
+        if i == 0:
+            return False
+        end1, frame1, end2 = self._best[i - 1]
+        return (end2 if frame1 is frame else end1) >= start
+
+
+class CancellationCut:
+    """Earliest start among one sender's cancellations that end after a given tick."""
+
+    def __init__(self, cancellations: List[EventNet]):
+        ordered = sorted(cancellations, key=lambda c: c.time_end)
+        self._ends = [c.time_end for c in ordered]
+        self._min_start = [float("inf")] * (len(ordered) + 1)
+        for i in range(len(ordered) - 1, -1, -1):
+            self._min_start[i] = min(ordered[i].time_start, self._min_start[i + 1])
+
+    def cut(self, tick: int) -> float:
+        return self._min_start[bisect_right(self._ends, tick)]
+
+    def cuts(self, ticks: np.ndarray) -> np.ndarray:
+        return np.asarray(self._min_start)[np.searchsorted(self._ends, ticks, side="right")]
+
+
+def _candidates(receive_queue: List[EventNet], current_global_tick: int, reception_start: int, cancelled: dict) -> List[EventNet]:
+    return [e for e in receive_queue if e.type != EventNetTypes.CANCELED and e.time_end < current_global_tick and reception_start <= e.time_start and e.node_id not in cancelled]
+
+
+def successful_receptions(receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+    """(received frames in queue order, whether a candidate was lost to an overlap)."""
+    if len(receive_queue) <= PAIRWISE_MAX_EVENTS:
+        return successful_receptions_pairwise(receive_queue, current_global_tick, reception_start)
+    return successful_receptions_indexed(receive_queue, current_global_tick, reception_start)
+
+
+def successful_receptions_indexed(receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+    """successful_receptions through interval indexes."""
+    canc_by_node: dict[int, List[EventNet]] = {}
+    frames_by_node: dict[int, List[EventNet]] = {}
+    clean: List[EventNet] = []
+    for e in receive_queue:
+        if e.type == EventNetTypes.CANCELED:
+            canc_by_node.setdefault(e.node_id, []).append(e)
+    for e in receive_queue:
+        if e.type == EventNetTypes.CANCELED:
+            continue
+        if e.node_id in canc_by_node:
+            frames_by_node.setdefault(e.node_id, []).append(e)
+        else:
+            clean.append(e)
+
+    # Frames of a sender with cancellations keep their own end for a candidate unless a cancellation
+    # cuts them before the candidate starts, and then they cannot overlap it at all
+    clean_index = OverlapIndex(sorted(clean, key=lambda e: e.time_start))
+    cut_senders = [(CancellationCut(canc_by_node[nid]), OverlapIndex(sorted(frames, key=lambda e: e.time_start))) for nid, frames in frames_by_node.items()]
+
+    received: List[EventNet] = []
+    collision = False
+    for event in _candidates(receive_queue, current_global_tick, reception_start, canc_by_node):
+        start, end = event.time_start, event.time_end
+        if clean_index.overlaps(event, start, end) or any(index.overlaps(event, start, end) for cut, index in cut_senders if cut.cut(start) >= start):
+            collision = True
+        else:
+            received.append(event)
+    return received, collision
+
+
+def successful_receptions_pairwise(receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+    """successful_receptions by comparing every candidate with every other frame, O(n²)."""
+    canc_by_node: dict[int, List[EventNet]] = {}
+    for c in receive_queue:
+        if c.type == EventNetTypes.CANCELED:
+            canc_by_node.setdefault(c.node_id, []).append(c)
+
+    received: List[EventNet] = []
+    collision = False
+    for event in _candidates(receive_queue, current_global_tick, reception_start, canc_by_node):
+        overlap_found = False
+        for other in receive_queue:
+            if other is event or other.type == EventNetTypes.CANCELED:
+                continue
+
+            other_effective_end = other.time_end
+            for c in canc_by_node.get(other.node_id, []):
+                if c.time_end > event.time_start:
+                    other_effective_end = min(other_effective_end, c.time_start)
+
+            if other.time_start <= event.time_end and other_effective_end >= event.time_start:
+                overlap_found = True
+                break
+
+        if not overlap_found:
+            received.append(event)
+        else:
+            collision = True
+    return received, collision
+
+
+def sensitivity_dbm(sf: int, bandwidth_hz: float, noise_figure_db: float = NOISE_FIGURE_DB) -> float:
+    """Weakest RSSI a receiver demodulates at this spreading factor: thermal noise + noise figure + required SNR."""
+    return -174.0 + 10 * math.log10(bandwidth_hz) + noise_figure_db + REQUIRED_SNR_DB[sf]
+
+
+def _rssi(event: EventNet, receiver_id: int | None) -> float:
+    rssi = event.rssi_at(receiver_id)
+    return DEFAULT_RSSI if rssi is None else rssi
+
+
+class CaptureModel:
+    """Capture effect reception: (received frames in queue order, whether a candidate was lost to interference).
+
+    Interference is the summed power of the frames that overlap a candidate under the overlap model's
+    rule, so the model receives a superset of what the overlap model receives among frames above the
+    sensitivity. Candidates below the sensitivity are dropped without counting as a collision.
+    """
+
+    def __init__(self, sf: int, bandwidth_hz: float, capture_threshold_db: float = CAPTURE_THRESHOLD_DB, receiver_id: int | None = None):
+        self.receiver_id = receiver_id  # whose RSSI to read from receptions shared by several receivers
+        self.sensitivity_dbm = sensitivity_dbm(sf, bandwidth_hz)
+        self.capture_ratio = 10 ** (capture_threshold_db / 10)
+
+    def __call__(self, receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+        if len(receive_queue) <= PAIRWISE_MAX_EVENTS:
+            return self.resolve_pairwise(receive_queue, current_global_tick, reception_start)
+        return self.resolve_vectorized(receive_queue, current_global_tick, reception_start)
+
+    def resolve_vectorized(self, receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+        """Interference of every candidate at once from power prefix sums over frame starts and ends."""
+        canc_by_node: dict[int, List[EventNet]] = {}
+        for e in receive_queue:
+            if e.type == EventNetTypes.CANCELED:
+                canc_by_node.setdefault(e.node_id, []).append(e)
+        candidates = _candidates(receive_queue, current_global_tick, reception_start, canc_by_node)
+        if not candidates:
+            return [], False
+
+        clean: List[EventNet] = []
+        frames_by_node: dict[int, List[EventNet]] = {}
+        for e in receive_queue:
+            if e.type == EventNetTypes.CANCELED:
+                continue
+            if e.node_id in canc_by_node:
+                frames_by_node.setdefault(e.node_id, []).append(e)
+            else:
+                clean.append(e)
+
+        starts = np.array([e.time_start for e in candidates], dtype=np.int64)
+        ends = np.array([e.time_end for e in candidates], dtype=np.int64)
+        rssi = np.array([_rssi(e, self.receiver_id) for e in candidates], dtype=np.float64)
+        power = 10 ** (rssi / 10)
+
+        # A candidate is in the clean set once per time it is queued and never interferes with itself
+        copies = {}
+        for e in clean:
+            copies[id(e)] = copies.get(id(e), 0) + 1
+        own = np.array([copies[id(e)] for e in candidates])
+        interference, overlapping = _overlapping_power(clean, starts, ends, self.receiver_id)
+        interference -= power * own
+        overlapping -= own
+        if frames_by_node:
+            # Few frames belong to senders with cancellations: one row per frame, one column per candidate
+            cut_frames = [f for frames in frames_by_node.values() for f in frames]
+            counted = np.concatenate([np.tile(CancellationCut(canc_by_node[nid]).cuts(starts) >= starts, (len(frames), 1)) for nid, frames in frames_by_node.items()])
+            hits = counted & (np.array([f.time_start for f in cut_frames])[:, None] <= ends) & (np.array([f.time_end for f in cut_frames])[:, None] >= starts)
+            interference += 10 ** (np.array([_rssi(f, self.receiver_id) for f in cut_frames]) / 10) @ hits
+            overlapping += hits.sum(axis=0)
+
+        # The counts are exact, the power differences carry rounding
+        interfered = overlapping > 0
+        interference = np.where(interfered, interference, 0.0)
+        captured = ~interfered | (power >= self.capture_ratio * interference)
+        received = (rssi >= self.sensitivity_dbm) & captured
+        return [e for e, ok in zip(candidates, received.tolist()) if ok], bool((interfered & ~captured).any())
+
+    def resolve_pairwise(self, receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+        """The capture decision by summing every other frame's power per candidate, O(n²)."""
+        canc_by_node: dict[int, List[EventNet]] = {}
+        for c in receive_queue:
+            if c.type == EventNetTypes.CANCELED:
+                canc_by_node.setdefault(c.node_id, []).append(c)
+
+        frames = [(e, 10 ** (_rssi(e, self.receiver_id) / 10)) for e in receive_queue if e.type != EventNetTypes.CANCELED]
+
+        received: List[EventNet] = []
+        collision = False
+        for event in _candidates(receive_queue, current_global_tick, reception_start, canc_by_node):
+            interference = 0.0
+            for other, other_power in frames:
+                if other is event:
+                    continue
+
+                other_effective_end = other.time_end
+                for c in canc_by_node.get(other.node_id, []):
+                    if c.time_end > event.time_start:
+                        other_effective_end = min(other_effective_end, c.time_start)
+
+                if other.time_start <= event.time_end and other_effective_end >= event.time_start:
+                    interference += other_power
+
+            rssi = _rssi(event, self.receiver_id)
+            captured = interference == 0.0 or 10 ** (rssi / 10) >= self.capture_ratio * interference
+            if rssi >= self.sensitivity_dbm and captured:
+                received.append(event)
+            elif not captured:
+                collision = True
+        return received, collision
+
+
+def _overlapping_power(frames: List[EventNet], starts: np.ndarray, ends: np.ndarray, receiver_id: int | None) -> tuple[np.ndarray, np.ndarray]:
+    """Summed power and number of the frames starting at or before each end and ending at or after each start.
+
+    Every frame that ends before a start also starts before the matching end, so the overlap sum is
+    the power started by end minus the power already ended before start.
+    """
+    frame_power = 10 ** (np.array([_rssi(f, receiver_id) for f in frames], dtype=np.float64) / 10)
+    frame_starts = np.array([f.time_start for f in frames], dtype=np.int64)
+    frame_ends = np.array([f.time_end for f in frames], dtype=np.int64)
+    by_start, by_end = np.argsort(frame_starts, kind="stable"), np.argsort(frame_ends, kind="stable")
+    started = np.concatenate(([0.0], np.cumsum(frame_power[by_start])))
+    ended = np.concatenate(([0.0], np.cumsum(frame_power[by_end])))
+    n_started = np.searchsorted(frame_starts[by_start], ends, side="right")
+    n_ended = np.searchsorted(frame_ends[by_end], starts, side="left")
+    return started[n_started] - ended[n_ended], n_started - n_ended
+
+
+def reception_model(name: str, sf: int, bandwidth_hz: float, receiver_id: int | None = None) -> Resolver:
+    """Receive-queue resolver for a NodeConfig.reception_model name, for the transceiver of node receiver_id."""
+    if name == "overlap":
+        return successful_receptions
+    if name == "capture":
+        return CaptureModel(sf, bandwidth_hz, receiver_id=receiver_id)
+    raise ValueError(f"Unknown reception model '{name}', expected one of {RECEPTION_MODELS}")
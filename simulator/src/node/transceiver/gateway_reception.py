@@ -0,0 +1,96 @@
+"""Gateway uplink reception through a multi-channel concentrator (SX1301-style).
+
+Uplinks only interfere with uplinks on the same channel and spreading factor; different spreading
+factors are treated as orthogonal. Within one channel and SF the receive queue is resolved like a D2D
+receive queue, by the configured reception model (node.transceiver.collision).
+
+A frame is only demodulated when one of the gateway's parallel demodulators locks onto its preamble
+as it starts. The demodulator then stays with the frame until its announced end, whether the frame
+survives or its sender stops early; a frame starting while all demodulators are locked is lost.
+Demodulators are handed out in start order with a heap of lock ends, so both halves stay
+O(n log n) in the frames on air and a gateway scales to thousands of nodes.
+"""
+
+import heapq
+from typing import List
+
+from custom_types import EventNet, EventNetTypes
+from node.transceiver.collision import Resolver
+
+GATEWAY_RECEPTIONS = ("ideal", "concentrator")
+
+
+def _channel_key(event: EventNet) -> tuple[int, int]:
+    return getattr(event.data, "channel", 0), getattr(event.data, "sf", 7)
+
+
+class GatewayReception:
+    """(newly received frames in queue order, whether a frame that ended since the last call was lost).
+
+    Keeps the demodulator locks and the frames already decided between calls, because the queue keeps
+    ended frames as long as they overlap a frame still on air (keep_undecided); frames leave this
+    bookkeeping when they leave the queue.
+    """
+
+    def __init__(self, demodulators: int, resolve: Resolver):
+        if demodulators < 1:
+            raise ValueError(f"A gateway needs at least one demodulator, got {demodulators}")
+        self.demodulators = demodulators
+        self._resolve = resolve
+        self._lock_ends: list[int] = []  # heap of the ends of the frames holding a demodulator
+        self._seen: List[EventNet] = []  # frames that were offered a demodulator
+        self._unlocked: List[EventNet] = []  # frames that found every demodulator locked
+        self._decided: List[EventNet] = []  # frames that ended before an earlier call
+
+    def __call__(self, receive_queue: List[EventNet], current_global_tick: int, reception_start: int) -> tuple[List[EventNet], bool]:
+        self._forget(receive_queue)
+        self._lock_demodulators(receive_queue, reception_start)
+
+        by_channel: dict[tuple[int, int], List[EventNet]] = {}
+        cancellations: List[EventNet] = []
+        for e in receive_queue:
+            if e.type == EventNetTypes.CANCELED:
+                cancellations.append(e)
+            else:
+                by_channel.setdefault(_channel_key(e), []).append(e)
+
+        received_ids: set[int] = set()
+        for frames in by_channel.values():
+            # A cancellation marks its sender in every group, like it does in a single queue
+            received, _ = self._resolve(sorted(frames + cancellations, key=lambda e: e.time_start), current_global_tick, reception_start)
+            received_ids.update(id(e) for e in received)
+
+        # Frames that ended before an earlier call stay queued as interferers but were already decided
+        decided_ids = {id(e) for e in self._decided}
+        unlocked_ids = {id(e) for e in self._unlocked}
+        cancelled = {c.node_id for c in cancellations}
+        ended = [e for e in receive_queue if e.type != EventNetTypes.CANCELED and e.time_end < current_global_tick and id(e) not in decided_ids]
+        self._decided.extend(ended)
+        candidates = [e for e in ended if e.time_start >= reception_start and e.node_id not in cancelled]
+        received = [e for e in candidates if id(e) in received_ids and id(e) not in unlocked_ids]
+        return received, len(received) < len(candidates)
+
+    def _forget(self, receive_queue: List[EventNet]) -> None:
+        queued_ids = {id(e) for e in receive_queue}
+        self._seen = [e for e in self._seen if id(e) in queued_ids]
+        self._unlocked = [e for e in self._unlocked if id(e) in queued_ids]
+        self._decided = [e for e in self._decided if id(e) in queued_ids]
+
+    def _lock_demodulators(self, receive_queue: List[EventNet], reception_start: int) -> None:
+        # Frames that started before the gateway listened never reach a demodulator
+        seen_ids = {id(e) for e in self._seen}
+        arrived = sorted((e for e in receive_queue if e.type != EventNetTypes.CANCELED and e.time_start >= reception_start and id(e) not in seen_ids), key=lambda e: e.time_start)
+        for frame in arrived:
+            while self._lock_ends and self._lock_ends[0] < frame.time_start:
+                heapq.heappop(self._lock_ends)
+            if len(self._lock_ends) < self.demodulators:
+                heapq.heappush(self._lock_ends, frame.time_end)
+            else:
+                self._unlocked.append(frame)
+            self._seen.append(frame)
+
+
+def keep_undecided(receive_queue: List[EventNet], current_global_tick: int) -> List[EventNet]:
+    """Drop every event that can no longer overlap a frame still on air."""
+    horizon = min((e.time_start for e in receive_queue if e.type != EventNetTypes.CANCELED and e.time_end >= current_global_tick), default=current_global_tick)
+    return [e for e in receive_queue if e.time_end >= horizon]
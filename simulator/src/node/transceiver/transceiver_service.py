@@ -1,7 +1,7 @@
 # type: ignore
 from typing import List
 
-from custom_types import Area, LocalEventTypes, MediumTypes, Severity, TransceiverState
+from custom_types import Area, LocalEventTypes, MediumTypes, NodeConfig, Severity, TransceiverState
 from logger.ILogger import ILogger
 from medium.medium_service import MediumService
 from node.event_local_queue import LocalEventQueue
@@ -13,7 +13,7 @@ from node.transceiver.LoRaWan import LoRaWan
 
 
 class TransceiverService(IModule):
-    def __init__(self, node_id: int, medium_service: MediumService, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger):
+    def __init__(self, node_id: int, medium_service: MediumService, local_event_queue: LocalEventQueue, second_to_global_tick: float, log: ILogger, config: NodeConfig = NodeConfig(), gateway: bool = False):
         self.node_id = node_id
         self.medium_service = medium_service
         self.local_event_queue = local_event_queue
@@ -21,7 +21,7 @@ class TransceiverService(IModule):
         # self.second_to_global_tick = second_to_global_tick
 
         self.accumulated_state: AccumulatedState = AccumulatedState()
-        self.transceivers: List[BaseTransceiver] = [LoRaD2D(node_id, medium_service, local_event_queue, second_to_global_tick, log), LoRaWan(node_id, medium_service, local_event_queue, second_to_global_tick, log)]
+        self.transceivers: List[BaseTransceiver] = [LoRaD2D(node_id, medium_service, local_event_queue, second_to_global_tick, log, config.reception_model), LoRaWan(node_id, medium_service, local_event_queue, second_to_global_tick, log, config, gateway)]
 
     def tick(self, current_global_tick: int) -> float:
         self.accumulated_state.reset()
@@ -54,7 +54,7 @@ class TestEngine:
             node_start_time = time.time()
             for node_id in node_ids:
                 next_evaluation = self.nodes[node_id - 1].tick(current_time)
-                self.event_queue.add_event(node_id, next_evaluation)
+                self.event_queue.schedule_next(node_id, next_evaluation)
 
             node_tick_time += time.time() - node_start_time
 
@@ -0,0 +1,194 @@
+"""Headless command line for the simulator.
+
+    run    simulate one map up to a fixed tick, without the GUI, its log queue or TPS updates
+    sweep  run a parameter sweep file (see sim.sweep)
+
+Exit codes: 0 the run reached its end tick (or ran out of events), 1 the simulation raised,
+2 invalid arguments, 130 interrupted.
+
+Run from the simulator folder:
+    uv run python -m sim run --map maps/y.json --until 48h --workers 4 --log-level INFO
+    uv run python -m sim run --map maps/y.json --until 96h --workers 4 --restore results/y-48h.ckpt
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from custom_types import NodeConfig, Severity
+from medium.range_reach import RangePropagation
+from node.transceiver.collision import RECEPTION_MODELS
+from node.transceiver.gateway_reception import GATEWAY_RECEPTIONS
+
+from . import sweep
+from .device_event_queue import EVENT_QUEUES
+from .engine import DISPATCH_MODES, NetworkTopologyLoader, Simulation
+from .graph_partitioner import PARTITIONERS
+from .peer_exchange import D2D_ROUTINGS
+from .shared_topology import WORKER_TOPOLOGIES
+from .topology_cache import DEFAULT_CACHE_DIR, TopologyCache
+from .transport import TRANSPORTS
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+_TICKS_PER_SECOND = 1000  # one global tick is a millisecond
+_UNIT_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h|d)")
+
+
+def parse_duration(text: str) -> int:
+    """Ticks in a duration such as "48h", "1h30m", "250ms" or a bare tick count."""
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(value + unit for value, unit in parts) != text:
+        raise argparse.ArgumentTypeError(f"invalid duration '{text}', expected e.g. 48h, 1h30m, 90s or a tick count")
+    return round(sum(float(value) * _UNIT_SECONDS[unit] for value, unit in parts) * _TICKS_PER_SECOND)
+
+
+def _run_parser(subparsers) -> None:
+    parser = subparsers.add_parser("run", help="simulate one map up to a fixed tick")
+    parser.add_argument("--map", required=True, help="topology JSON, e.g. maps/y.json")
+    parser.add_argument("--until", type=parse_duration, required=True, help="simulated time to stop at: 48h, 1h30m, 90s, 250ms or a tick count")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default half the logical CPUs")
+    parser.add_argument("--log-level", choices=[s.value for s in Severity], default=Severity.INFO.value, help="lowest severity written to the log file")
+    parser.add_argument("--out", default=None, help="folder for simulation.log and stats.json, default results/run-<map name>")
+    parser.add_argument("--dispatch", choices=DISPATCH_MODES, default="pipelined")
+    parser.add_argument("--d2d-routing", choices=D2D_ROUTINGS, default="main")
+    parser.add_argument("--d2d-propagation", choices=("graph", "range"), default="graph", help="graph follows the map's neighbour lists, range reaches every node in radio range of the sender")
+    parser.add_argument("--d2d-range-m", type=float, default=None, help="with range propagation, cap the link budget range (m)")
+    parser.add_argument("--path-loss-exponent", type=float, default=RangePropagation.path_loss_exponent)
+    parser.add_argument("--worker-topology", choices=WORKER_TOPOLOGIES, default="shared")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="pipe", help="shm is experimental and not faster than pipe")
+    parser.add_argument("--event-queue", choices=tuple(EVENT_QUEUES), default="sorted")
+    parser.add_argument("--partitioner", choices=tuple(PARTITIONERS), default="bfs")
+    parser.add_argument("--lookahead", action="store_true", help="evaluate lookahead windows instead of single ticks")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--seed", type=int, default=NodeConfig.seed)
+    parser.add_argument("--slot-count", type=int, default=NodeConfig.slot_count)
+    parser.add_argument("--slot-duration", type=int, default=NodeConfig.slot_duration)
+    parser.add_argument("--reception-model", choices=RECEPTION_MODELS, default=NodeConfig.reception_model, help="overlap drops every overlapping D2D frame, capture keeps the stronger one")
+    parser.add_argument("--gateway-reception", choices=GATEWAY_RECEPTIONS, default=NodeConfig.gateway_reception, help="ideal checks no uplink collisions, concentrator models channels, SFs and parallel demodulators")
+    parser.add_argument("--gateway-demodulators", type=int, default=NodeConfig.gateway_demodulators)
+    parser.add_argument("--wan-channels", type=int, default=NodeConfig.wan_channels)
+    parser.add_argument("--checkpoint", default=None, help="write the simulation state here when the run ends")
+    parser.add_argument("--checkpoint-every", type=parse_duration, default=None, help="also checkpoint at this simulated interval, e.g. 6h")
+    parser.add_argument("--restore", default=None, help="continue from a checkpoint file; its node parameters replace --seed/--slot-* and the reception options")
+
+
+def run(args: argparse.Namespace) -> int:
+    if not os.path.isfile(args.map):
+        print(f"error: map file '{args.map}' not found", file=sys.stderr)
+        return EXIT_USAGE
+    if args.restore is not None and not os.path.isfile(args.restore):
+        print(f"error: checkpoint file '{args.restore}' not found", file=sys.stderr)
+        return EXIT_USAGE
+    if args.checkpoint_every is not None and args.checkpoint is None:
+        print("error: --checkpoint-every needs --checkpoint", file=sys.stderr)
+        return EXIT_USAGE
+
+    out_dir = Path(args.out or os.path.join("results", f"run-{Path(args.map).stem}"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    log_path = out_dir / "simulation.log"
+    log_path.unlink(missing_ok=True)  # the logger appends
+    stats_path = out_dir / "stats.json"
+
+    start = time.perf_counter()
+    cache = None if args.no_cache else TopologyCache(args.cache_dir).entry(args.map, NetworkTopologyLoader.LORA_WAN_RADIUS_M)
+    device_neighbors = NetworkTopologyLoader.from_file(args.map, cache=cache)
+    d2d_range = RangePropagation(*NetworkTopologyLoader.scale(args.map), path_loss_exponent=args.path_loss_exponent, max_range_m=args.d2d_range_m) if args.d2d_propagation == "range" else None
+    node_config = NodeConfig(seed=args.seed, slot_count=args.slot_count, slot_duration=args.slot_duration, reception_model=args.reception_model, gateway_reception=args.gateway_reception, gateway_demodulators=args.gateway_demodulators, wan_channels=args.wan_channels)
+    try:
+        sim = Simulation(
+            log_path=str(log_path),
+            device_neighbors=device_neighbors,
+            lookahead=args.lookahead,
+            n_workers=args.workers,
+            transport=args.transport,
+            event_queue=args.event_queue,
+            partitioner=args.partitioner,
+            topology_cache=cache,
+            worker_topology=args.worker_topology,
+            dispatch=args.dispatch,
+            d2d_routing=args.d2d_routing,
+            node_config=node_config,
+            log_level=Severity(args.log_level),
+            checkpoint_path=args.checkpoint,
+            checkpoint_interval_ticks=args.checkpoint_every,
+            d2d_range=d2d_range,
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.restore is not None:
+        try:
+            sim.restore(args.restore)
+        except ValueError as e:
+            sim.close()
+            print(f"error: {e}", file=sys.stderr)
+            return EXIT_USAGE
+    start_tick = sim.global_time.get_time()
+    setup = time.perf_counter() - start
+
+    exit_code = EXIT_OK
+    try:
+        sim.run_for(args.until)
+    except KeyboardInterrupt:
+        exit_code = EXIT_INTERRUPTED
+    if sim.error is not None:
+        exit_code = EXIT_ERROR
+    elapsed = time.perf_counter() - start - setup
+
+    final_tick = sim.global_time.get_time()
+    stats = {
+        "map": args.map,
+        "until_tick": args.until,
+        "start_tick": start_tick,
+        "final_tick": final_tick,
+        "exit_code": exit_code,
+        "error": repr(sim.error) if sim.error is not None else None,
+        "workers": len(sim._workers),
+        "options": {key: value for key, value in vars(args).items() if key not in ("command", "map", "until")},
+        "setup_s": round(setup, 3),
+        "elapsed_s": round(elapsed, 3),
+        "simulated_ticks_per_s": round((final_tick - start_tick) / elapsed) if elapsed > 0 else None,
+        "stats": sim.stats,
+        "phase_time_s": {phase: round(seconds, 4) for phase, seconds in sim.phase_time.items()},
+        "partition": sim.partition_quality,
+    }
+    with open(stats_path, "w") as f:
+        json.dump(stats, f, indent=2)
+
+    print(f"{args.map}: tick {final_tick} of {args.until} in {elapsed:.2f}s (+{setup:.2f}s setup), {sim.stats['ticks']} ticks evaluated over {sim.stats['barriers']} barriers on {len(sim._workers)} workers")
+    print(f"node tick {sim.stats['node_tick_time']:.2f}s, propagation {sim.stats['propagation_time']:.2f}s")
+    print(f"phases ({args.dispatch}): " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in sim.phase_time.items()))
+    print(f"log: {log_path}, stats: {stats_path}" + (f", checkpoint: {args.checkpoint}" if args.checkpoint else ""))
+    if sim.error is not None:
+        print(f"error: {sim.error!r}", file=sys.stderr)
+    return exit_code
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sim", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _run_parser(subparsers)
+    subparsers.add_parser("sweep", help="run a parameter sweep file", add_help=False)
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["sweep"]:
+        sweep.main(argv[1:])
+        return EXIT_OK
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -268,3 +268,38 @@ class BFSTopologyAnalyzer:
             node_to_cluster[gw_id] = max(votes, key=votes.get) if votes else 0
 
         return node_to_cluster
+
+    @staticmethod
+    def lookahead_distances(node_neighbors: dict, reach_map: dict, node_to_cluster: dict[int, int]) -> dict[int, int]:
+        """Minimum number of ticks before activity at a node can reach another cluster.
+
+        A node is a boundary node (distance 0) when any of its transmissions is resolved by the
+        main process: gateways, nodes with LoRaWAN receivers and nodes with a D2D receiver in
+        another cluster. Every other node needs at least one tick per intra-cluster D2D hop before
+        a boundary node can react (a reception or cancellation wakes the receiver the tick after).
+
+        Returns {node_id: distance}; nodes that can never influence a boundary node are omitted.
+        """
+        boundary: list[int] = []
+        reverse: dict[int, list[int]] = defaultdict(list)  # receiver_id -> [sender_ids]
+
+        for nid, info in node_neighbors.items():
+            wan_receivers = info.neighbors if info.is_gateway else info.gateways_in_range
+            receivers = reach_map.get(nid, [])
+            cid = node_to_cluster.get(nid)
+            if info.is_gateway or wan_receivers or any(node_to_cluster.get(r) != cid for r, _ in receivers):
+                boundary.append(nid)
+                continue
+            for r, _ in receivers:
+                reverse[r].append(nid)
+
+        distances = {nid: 0 for nid in boundary}
+        queue = deque(boundary)
+        while queue:
+            nid = queue.popleft()
+            for sender in reverse.get(nid, []):
+                if sender not in distances:
+                    distances[sender] = distances[nid] + 1
+                    queue.append(sender)
+
+        return distances
@@ -0,0 +1,134 @@
+"""Copy-on-write branches: many variants continued from one warmed-up simulation in memory.
+
+run_branches forks a warmed-up Simulation, its main process and every worker, once per branch
+(Simulation.fork). A branch only pays for the memory pages it changes and never repeats the
+warm-up, unlike a cold run or a restored checkpoint. Each branch is a dict:
+
+    {"name": "no-recharge", "battery_recharge_rate_joule_per_second": 0.0, "injections": [{"node_id": 10, "tick": 3_700_000, "payload": payload}]}
+
+"injections" are appended to the simulation's injection tasks, the battery keys are applied to
+every node with Simulation.reconfigure_batteries. Each branch writes simulation.log (its lines from
+the fork on) and result.json into its own folder, like a sweep run.
+
+    sim = Simulation(log_path="warm.log", device_neighbors=device_neighbors, n_workers=4)
+    sim.run_for(3_600_000, keep_workers=True)
+    results = run_branches(sim, branches, stop_tick=7_200_000, out_dir="results/branches")
+    sim.close()
+"""
+
+import json
+import os
+import time
+import traceback
+from pathlib import Path
+
+from .engine import Simulation
+from .sweep import summarize_log, write_json
+
+BATTERY_KEYS = ("battery_capacity_joule", "battery_recharge_rate_joule_per_second")
+BRANCH_KEYS = ("name", "injections", *BATTERY_KEYS)
+
+_RESULT = "result.json"
+_LOG = "simulation.log"
+_MEMORY_FIELDS = {"Rss": "rss_mb", "Pss": "pss_mb", "Private_Clean": "private_mb", "Private_Dirty": "private_mb"}
+
+
+def process_memory(pids: list[int]) -> dict[str, float]:
+    """Resident, proportional and private megabytes summed over pids, from /proc; empty where that is missing.
+
+    Private memory is what a process does not share with any other, so for a branch it is the cost
+    of the pages it changed since the fork.
+    """
+    totals = dict.fromkeys(_MEMORY_FIELDS.values(), 0.0)
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in _MEMORY_FIELDS:
+                        totals[_MEMORY_FIELDS[key]] += int(value.split()[0]) / 1024
+        except OSError:
+            return {}
+    return {key: round(value, 1) for key, value in totals.items()}
+
+
+def _run_branch(sim: Simulation, branch: dict, stop_tick: int, run_dir: Path) -> None:
+    start_tick = sim.global_time.get_time()
+    pids = [os.getpid(), *(p.pid for _, p in sim._workers)]
+    forked = process_memory(pids)
+    start = time.perf_counter()
+    sim.injection_tasks.extend(branch.get("injections", ()))
+    battery = {key: branch[key] for key in BATTERY_KEYS if key in branch}
+    if battery:
+        sim.reconfigure_batteries(**battery)
+    sim.run_for(stop_tick, keep_workers=True)
+    elapsed = time.perf_counter() - start
+    memory = process_memory(pids)
+    sim.close()
+
+    result = {"name": run_dir.name, **battery, "injections": len(branch.get("injections", ())), "start_tick": start_tick, "final_tick": sim.global_time.get_time(), "elapsed_s": round(elapsed, 3), "error": repr(sim.error) if sim.error is not None else None}
+    result.update(memory)
+    if forked:
+        result["private_at_fork_mb"] = forked["private_mb"]
+    result.update(summarize_log(run_dir / _LOG))
+    write_json(run_dir / _RESULT, result)
+
+
+def _wait_one(running: dict[int, str], report) -> None:
+    # Only wait for branches: the simulation's own workers are children of this process as well
+    while True:
+        for pid, name in list(running.items()):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                del running[pid]
+                code = os.waitstatus_to_exitcode(status)
+                report(f"done   {name}" if code == 0 else f"failed {name}: exit code {code}")
+                return
+        time.sleep(0.01)
+
+
+def run_branches(sim: Simulation, branches: list[dict], stop_tick: int, out_dir: str | Path, jobs: int = 1, report=print) -> list[dict]:
+    """Continue sim up to stop_tick once per branch, at most jobs at a time; returns the results in branch order.
+
+    sim itself stays at the tick it was forked at, with its workers running.
+    """
+    out_dir = Path(out_dir)
+    names = [branch.get("name", f"branch-{idx}") for idx, branch in enumerate(branches)]
+    if len(set(names)) != len(names):
+        raise ValueError("Branch names have to be unique")
+    for branch in branches:
+        unknown = branch.keys() - set(BRANCH_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown branch keys {sorted(unknown)}, expected {BRANCH_KEYS}")
+
+    running: dict[int, str] = {}
+    for branch, name in zip(branches, names):
+        while len(running) >= jobs:
+            _wait_one(running, report)
+        run_dir = out_dir / name
+        run_dir.mkdir(parents=True, exist_ok=True)
+        (run_dir / _RESULT).unlink(missing_ok=True)
+        (run_dir / _LOG).unlink(missing_ok=True)  # the logger appends
+
+        pid = sim.fork(run_dir / _LOG)
+        if pid == 0:
+            # Never return into the caller from the copy
+            code = 1
+            try:
+                _run_branch(sim, branch, stop_tick, run_dir)
+                code = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        running[pid] = name
+    while running:
+        _wait_one(running, report)
+
+    results = []
+    for name in names:
+        result_path = out_dir / name / _RESULT
+        if result_path.exists():
+            with open(result_path) as f:
+                results.append(json.load(f))
+    return results
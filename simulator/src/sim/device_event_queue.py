@@ -1,16 +1,336 @@
+import heapq
+from abc import ABC, abstractmethod
+from typing import Iterator
+
 from sortedcontainers import SortedDict
 
 
-class DeviceEventQueue:
+class BaseEventQueue(ABC):
+    """Node wakeup bookkeeping shared by the event queue implementations.
+
+    A node has one authoritative next wake: the tick its last evaluation returned, set with
+    schedule_next(). Other wake reasons, such as a reception or an injection, are added with
+    add_event() on top of it. Rescheduling a node takes its previous next wake out of the queue
+    right away unless another reason still needs the node at that tick, so stale wakeups are never
+    dispatched. They are counted in suppressed_wakeups.
+    """
+
     def __init__(self):
-        self.events: SortedDict = SortedDict()
+        self._next_wake: dict[int, int] = {}  # kept after the pop until the node reschedules
+        self._extra_wakes: dict[int, set[int]] = {}  # tick -> node ids woken for another reason
+        self.suppressed_wakeups = 0
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def _insert(self, node_id: int, tick: int) -> None: ...
+
+    @abstractmethod
+    def _discard(self, node_id: int, tick: int) -> bool:
+        """Remove node_id from tick, dropping the tick once empty. False if it was not scheduled there."""
+
+    @abstractmethod
+    def _first_tick(self) -> int | None: ...
+
+    @abstractmethod
+    def _pop_first(self) -> tuple[int, set[int]]: ...
+
+    @abstractmethod
+    def iter_events(self) -> Iterator[tuple[int, set[int]]]:
+        """Iterate scheduled (tick, node_ids) in ascending tick order without removing them."""
 
     def init_tick(self, start_tick: int, node_ids: list[int]) -> None:
-        self.events = SortedDict({start_tick: set(node_ids)})
+        self.__init__()
+        for nid in node_ids:
+            self.schedule_next(nid, start_tick)
+
+    def schedule_next(self, node_id: int, tick: int | None) -> None:
+        """Set the node's authoritative next wake (None: nothing scheduled), superseding the previous one."""
+        previous = self._next_wake.get(node_id)
+        if previous is not None and previous != tick:
+            extra = self._extra_wakes.get(previous)
+            if (extra is None or node_id not in extra) and self._discard(node_id, previous):
+                self.suppressed_wakeups += 1
+        if tick is None:
+            self._next_wake.pop(node_id, None)
+        else:
+            self._next_wake[node_id] = tick
+            self._insert(node_id, tick)
 
     def add_event(self, node_id: int, tick: int | None) -> None:
+        """Wake the node at tick for a reason other than its own schedule, e.g. a reception."""
         if tick is not None:
-            self.events.setdefault(tick, default=set()).add(node_id)
+            extra = self._extra_wakes.get(tick)
+            if extra is None:
+                self._extra_wakes[tick] = {node_id}
+            else:
+                extra.add(node_id)
+            self._insert(node_id, tick)
+
+    def next_wake(self, node_id: int) -> int | None:
+        return self._next_wake.get(node_id)
+
+    def peek_tick(self) -> int | None:
+        """Earliest scheduled tick without removing it; None when nothing is scheduled."""
+        return self._first_tick()
+
+    def get_next_events(self) -> tuple[int, set[int]]:
+        tick, node_ids = self._pop_first()
+        self._extra_wakes.pop(tick, None)
+        return tick, node_ids
 
-    def get_next_events(self) -> tuple[int, list[int]]:
+    def pop_events_until(self, tick: int) -> list[tuple[int, set[int]]]:
+        """Remove and return every scheduled (tick, node_ids) up to and including tick."""
+        popped = []
+        while True:
+            next_tick = self._first_tick()
+            if next_tick is None or next_tick > tick:
+                return popped
+            popped.append(self.get_next_events())
+
+
+class DeviceEventQueue(BaseEventQueue):
+    def __init__(self):
+        super().__init__()
+        self.events: SortedDict = SortedDict()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _insert(self, node_id: int, tick: int) -> None:
+        self.events.setdefault(tick, default=set()).add(node_id)
+
+    def _discard(self, node_id: int, tick: int) -> bool:
+        node_ids = self.events.get(tick)
+        if node_ids is None or node_id not in node_ids:
+            return False
+        node_ids.discard(node_id)
+        if not node_ids:
+            del self.events[tick]
+        return True
+
+    def _first_tick(self) -> int | None:
+        return self.events.peekitem(0)[0] if self.events else None
+
+    def _pop_first(self) -> tuple[int, set[int]]:
         return self.events.popitem(0)
+
+    def iter_events(self) -> Iterator[tuple[int, set[int]]]:
+        """Iterate scheduled (tick, node_ids) in ascending tick order without removing them."""
+        return iter(self.events.items())
+
+
+class TimingWheelEventQueue(BaseEventQueue):
+    """Two-level timing wheel with the DeviceEventQueue API, tuned for 1 ms ticks.
+
+    - near wheel: one slot per tick for the current block of NEAR_SLOTS ticks (~4 s)
+    - far wheel:  one dict per block for the next FAR_SLOTS blocks (~71 min, covers the 50 min APP sleep)
+    - overflow:   anything further out, in a dict plus a heap of its blocks
+    - late:       ticks before the current block (only if a caller schedules into the past)
+
+    Occupied slots are tracked in int bitmaps, so finding the next tick is a lowest-set-bit lookup
+    instead of an ordered insert per new tick.
+    """
+
+    NEAR_BITS = 12
+    FAR_BITS = 10
+    NEAR_SLOTS = 1 << NEAR_BITS
+    FAR_SLOTS = 1 << FAR_BITS
+
+    def __init__(self):
+        super().__init__()
+        self._block = 0  # index of the block held by the near wheel (tick >> NEAR_BITS)
+        self._near: list[set[int] | None] = [None] * self.NEAR_SLOTS
+        self._near_bits = 0
+        self._far: list[dict[int, set[int]] | None] = [None] * self.FAR_SLOTS
+        self._far_bits = 0
+        self._overflow: dict[int, dict[int, set[int]]] = {}  # block -> {tick: node_ids}
+        self._overflow_blocks: list[int] = []
+        self._late: dict[int, set[int]] = {}
+        self._late_ticks: list[int] = []
+        self._count = 0  # distinct scheduled ticks
+
+    def __len__(self) -> int:
+        return self._count
+
+    def init_tick(self, start_tick: int, node_ids: list[int]) -> None:
+        self.__init__()
+        self._block = start_tick >> self.NEAR_BITS
+        for nid in node_ids:
+            self.schedule_next(nid, start_tick)
+
+    def _insert(self, node_id: int, tick: int) -> None:
+        block = tick >> self.NEAR_BITS
+        offset = block - self._block
+
+        if offset == 0:
+            idx = tick & (self.NEAR_SLOTS - 1)
+            slot = self._near[idx]
+            if slot is None:
+                self._near[idx] = {node_id}
+                self._near_bits |= 1 << idx
+                self._count += 1
+            else:
+                slot.add(node_id)
+        elif 0 < offset < self.FAR_SLOTS:
+            idx = block & (self.FAR_SLOTS - 1)
+            bucket = self._far[idx]
+            if bucket is None:
+                bucket = self._far[idx] = {}
+                self._far_bits |= 1 << idx
+            self._add_to(bucket, node_id, tick)
+        elif offset > 0:
+            bucket = self._overflow.get(block)
+            if bucket is None:
+                bucket = self._overflow[block] = {}
+                heapq.heappush(self._overflow_blocks, block)
+            self._add_to(bucket, node_id, tick)
+        else:
+            if tick not in self._late:
+                heapq.heappush(self._late_ticks, tick)
+            self._add_to(self._late, node_id, tick)
+
+    def _add_to(self, bucket: dict[int, set[int]], node_id: int, tick: int) -> None:
+        node_ids = bucket.get(tick)
+        if node_ids is None:
+            bucket[tick] = {node_id}
+            self._count += 1
+        else:
+            node_ids.add(node_id)
+
+    def _discard(self, node_id: int, tick: int) -> bool:
+        block = tick >> self.NEAR_BITS
+        offset = block - self._block
+
+        if offset == 0:
+            idx = tick & (self.NEAR_SLOTS - 1)
+            slot = self._near[idx]
+            if slot is None or node_id not in slot:
+                return False
+            slot.discard(node_id)
+            if not slot:
+                self._near[idx] = None
+                self._near_bits &= ~(1 << idx)
+                self._count -= 1
+            return True
+
+        # Emptied overflow blocks stay in place until _advance reaches them; late ticks are skipped lazily
+        if 0 < offset < self.FAR_SLOTS:
+            bucket = self._far[block & (self.FAR_SLOTS - 1)]
+        elif offset > 0:
+            bucket = self._overflow.get(block)
+        else:
+            bucket = self._late
+        node_ids = bucket.get(tick) if bucket else None
+        if node_ids is None or node_id not in node_ids:
+            return False
+        node_ids.discard(node_id)
+        if not node_ids:
+            del bucket[tick]
+            self._count -= 1
+            if not bucket and 0 < offset < self.FAR_SLOTS:
+                idx = block & (self.FAR_SLOTS - 1)
+                self._far[idx] = None
+                self._far_bits &= ~(1 << idx)
+        return True
+
+    def _skip_stale_late(self) -> None:
+        while self._late_ticks and self._late_ticks[0] not in self._late:
+            heapq.heappop(self._late_ticks)
+
+    def _far_offsets(self) -> int:
+        """Far wheel bitmap rotated so bit k is the block k + 1 after the current one."""
+        start = (self._block + 1) & (self.FAR_SLOTS - 1)
+        return ((self._far_bits >> start) | (self._far_bits << (self.FAR_SLOTS - start))) & ((1 << self.FAR_SLOTS) - 1)
+
+    def _next_far_offset(self) -> int | None:
+        """Blocks from the current one to the next occupied far slot."""
+        if not self._far_bits:
+            return None
+        rotated = self._far_offsets()
+        return (rotated & -rotated).bit_length()
+
+    def _advance(self) -> bool:
+        """Move the near wheel to the next occupied block. Returns False when nothing is scheduled."""
+        while not self._near_bits:
+            offset = self._next_far_offset()
+            if offset is not None:
+                self._block += offset
+                idx = self._block & (self.FAR_SLOTS - 1)
+                bucket = self._far[idx]
+                self._far[idx] = None
+                self._far_bits &= ~(1 << idx)
+            elif self._overflow_blocks:
+                self._block = heapq.heappop(self._overflow_blocks)
+                bucket = self._overflow.pop(self._block)
+            else:
+                return False
+
+            for tick, node_ids in bucket.items():
+                idx = tick & (self.NEAR_SLOTS - 1)
+                self._near[idx] = node_ids
+                self._near_bits |= 1 << idx
+
+            # Overflow blocks that now fit in the far wheel
+            while self._overflow_blocks and self._overflow_blocks[0] - self._block < self.FAR_SLOTS:
+                block = heapq.heappop(self._overflow_blocks)
+                idx = block & (self.FAR_SLOTS - 1)
+                self._far[idx] = self._overflow.pop(block)
+                self._far_bits |= 1 << idx
+        return True
+
+    def _first_tick(self) -> int | None:
+        self._skip_stale_late()
+        if self._late_ticks:
+            return self._late_ticks[0]
+        if not self._advance():
+            return None
+        bits = self._near_bits
+        return (self._block << self.NEAR_BITS) | ((bits & -bits).bit_length() - 1)
+
+    def _pop_first(self) -> tuple[int, set[int]]:
+        self._skip_stale_late()
+        if self._late_ticks:
+            tick = heapq.heappop(self._late_ticks)
+            self._count -= 1
+            return tick, self._late.pop(tick)
+        if not self._advance():
+            raise IndexError("pop from empty event queue")
+        bits = self._near_bits
+        lowest = bits & -bits
+        idx = lowest.bit_length() - 1
+        self._near_bits = bits ^ lowest
+        node_ids = self._near[idx]
+        self._near[idx] = None
+        self._count -= 1
+        return (self._block << self.NEAR_BITS) | idx, node_ids
+
+    def iter_events(self) -> Iterator[tuple[int, set[int]]]:
+        """Iterate scheduled (tick, node_ids) in ascending tick order without removing them."""
+        for tick in sorted(self._late):
+            yield tick, self._late[tick]
+
+        base = self._block << self.NEAR_BITS
+        bits = self._near_bits
+        while bits:
+            lowest = bits & -bits
+            idx = lowest.bit_length() - 1
+            bits ^= lowest
+            yield base | idx, self._near[idx]
+
+        bits = self._far_offsets() if self._far_bits else 0
+        while bits:
+            lowest = bits & -bits
+            bits ^= lowest
+            bucket = self._far[(self._block + lowest.bit_length()) & (self.FAR_SLOTS - 1)]
+            for tick in sorted(bucket):
+                yield tick, bucket[tick]
+
+        for block in sorted(self._overflow):
+            bucket = self._overflow[block]
+            for tick in sorted(bucket):
+                yield tick, bucket[tick]
+
+
+EVENT_QUEUES = {"sorted": DeviceEventQueue, "wheel": TimingWheelEventQueue}
@@ -1,27 +1,54 @@
 # type: ignore
+import gc
 import json
 import os
+import pickle
+import signal
 import time
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
+from collections.abc import Mapping
 from copy import replace
 from ctypes import c_int, c_long
 from multiprocessing import Lock, Pipe, Process, Queue, Value
+from multiprocessing.connection import Connection
 from multiprocessing.connection import wait as mp_wait
+from multiprocessing.reduction import recv_handle, send_handle
 from pathlib import Path
 
-from custom_types import Area, EventNet, EventNetTypes, LocalEventTypes, LoRaD2DFrame, MediumTypes, NodeMediumInfo, Severity, SimState
+from custom_types import Area, EventNet, EventNetTypes, LocalEventTypes, LoRaD2DFrame, MediumTypes, NodeConfig, NodeMediumInfo, Severity, SimState
 from gateway.gateway import Gateway
+from Interfaces import IRSSI
 from logger.ILogger import ILogger
-from logger.simple_logger import SimpleLogger
+from logger.simple_logger import SimpleLogger, severities_below
 from loraWanFrameHelper import LoRaWanPHYPayload, MACPayload
 from medium.lora_d2d_medium import LoraD2DMedium
 from medium.medium_service import MediumService
+from medium.range_reach import RangePropagation
+from medium.reach_map import ReachCSR, RSSITables
 from node.node import Node
 from payload_types import MegaSync, PayloadData
 
 from .bfs_topology_analyzer import BFSTopologyAnalyzer
-from .device_event_queue import DeviceEventQueue
+from .device_event_queue import EVENT_QUEUES, DeviceEventQueue
 from .global_time import GlobalTime
+from .graph_partitioner import PARTITIONERS, expected_activity, partition_quality
+from .peer_exchange import D2D_ROUTINGS, PeerExchange, peer_links, split_by_worker
+from .rebalance import RebalancePolicy, export_nodes, imbalance, import_nodes, plan_migration, snapshot_nodes, worker_loads
+from .shared_topology import WORKER_TOPOLOGIES, SharedTopology
+from .topology_cache import CachedTopology, TopologyCache
+from .topology_stream import analyze_topology, read_topology
+from .topology_table import TopologyTable
+from .transport import WORKER_BATTERY as _WORKER_BATTERY
+from .transport import WORKER_EXPORT as _WORKER_EXPORT
+from .transport import WORKER_FORK as _WORKER_FORK
+from .transport import WORKER_IMPORT as _WORKER_IMPORT
+from .transport import WORKER_RESTORE as _WORKER_RESTORE
+from .transport import WORKER_SNAPSHOT as _WORKER_SNAPSHOT
+from .transport import WORKER_STATS as _WORKER_STATS
+from .transport import WORKER_STOP as _WORKER_STOP
+from .transport import WORKER_TICK as _WORKER_TICK
+from .transport import WORKER_WINDOW as _WORKER_WINDOW
+from .transport import PipeChannel, create_channel_pair
 
 global_time = GlobalTime()
 
@@ -30,6 +57,16 @@ GUI_LOG_DISPLAY_LINES = 75
 
 _SECOND_TO_GLOBAL_TICK = 0.001
 
+# Upper bound on a lookahead window so pause/stop and GUI updates stay responsive (one slot period)
+_MAX_WINDOW_TICKS = 60_000
+
+# "barrier" propagates a tick once every worker has replied, "pipelined" as each reply comes in
+DISPATCH_MODES = ("barrier", "pipelined")
+_PHASES = ("dispatch", "wait", "apply", "streamed_propagation", "propagation")
+
+# Bumped whenever the layout written by Simulation.checkpoint changes
+CHECKPOINT_VERSION = 1
+
 
 # ── Worker-side proxy classes ──────────────────────────────────────────────────
 
@@ -42,18 +79,26 @@ class ClusterMediumService:
     and all LoRaWAN traffic are forwarded to main as plain tuples (same protocol as before).
     """
 
-    def __init__(self, owned_nodes: frozenset, reach_map: dict):
+    def __init__(self, owned_nodes: frozenset, reach_map: dict, log: ILogger | None = None):
         self._owned_nodes = owned_nodes
         self._reach_map = reach_map
-        self._incoming: dict = defaultdict(list)
+        self._log = log  # writes main's medium DEBUG lines for cross-cluster D2D propagated here
+        self._incoming: dict[tuple[int, MediumTypes], list] = {}  # (node_id, medium) → undelivered EventNets
         self._pending_d2d: list = []          # ordered ('TX'|'CX', ...) events this tick
         self._cross_transmissions: list = []
         self._cross_cancellations: list = []
-        self._intra_ongoing: dict = {}        # sender_id → [receiver_ids] for cancel tracking
-        self._intra_receptions: list = []     # (receiver_id, EventNet, wake_tick)
+        self._intra_ongoing: dict = {}        # sender_id → ([receiver_ids], time_end) for cancel tracking
+        self._intra_receptions: dict = {}     # (sender_id, time_start) → [(receiver_id, EventNet, wake_tick)], in queueing order
+        self._cross_ongoing: dict = {}        # sender_id → (time_end, [receiver_ids]), only with peer routing
+        self._rssi_tables = RSSITables()      # sender_id → {receiver_id: rssi} of shared receptions
 
     def set_incoming(self, node_id: int, events: list) -> None:
-        self._incoming[node_id].extend(events)
+        for event in events:
+            key = (node_id, event.type_medium)
+            mailbox = self._incoming.get(key)
+            if mailbox is None:
+                mailbox = self._incoming[key] = []
+            mailbox.append(event)
 
     def transmit(self, from_node_id: int, medium_type, data, time_start: int, time_end: int) -> None:
         if medium_type == MediumTypes.LORA_D2D:
@@ -68,14 +113,8 @@ class ClusterMediumService:
             self._cross_cancellations.append((from_node_id, medium_type, time_start, time_end))
 
     def receive(self, to_node_id: int, medium_type) -> list:
-        node_events = self._incoming.get(to_node_id, [])
-        matching = [e for e in node_events if e.type_medium == medium_type]
-        remaining = [e for e in node_events if e.type_medium != medium_type]
-        if remaining:
-            self._incoming[to_node_id] = remaining
-        else:
-            self._incoming.pop(to_node_id, None)
-        return matching
+        # Mailboxes are only appended to and handed out whole, so the list itself is the result
+        return self._incoming.pop((to_node_id, medium_type), [])
 
     def flush_d2d(self, current_time: int) -> None:
         """Resolve D2D events: short-circuit all-intra transmissions, forward the rest to main."""
@@ -86,15 +125,15 @@ class ClusterMediumService:
 
                 if receivers and all(r in self._owned_nodes for r, _ in receivers):
                     # All receivers within this cluster — resolve without touching main process
-                    self._intra_ongoing[sender] = [r for r, _ in receivers]
-                    for recv_id, rssi in receivers:
-                        rx_data = replace(data, rssi=rssi) if isinstance(data, LoRaD2DFrame) else data
-                        rx_event = EventNet(
-                            node_id=sender, time_start=t_start, time_end=t_end,
-                            type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D,
-                            data=rx_data,
-                        )
-                        self._intra_receptions.append((recv_id, rx_event, t_end + 1))
+                    self._intra_ongoing[sender] = ([r for r, _ in receivers], t_end)
+                    queued = self._intra_receptions.setdefault((sender, t_start), [])
+                    rx_event = EventNet(
+                        node_id=sender, time_start=t_start, time_end=t_end,
+                        type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D,
+                        data=data, rssi=self._rssi_tables(sender, receivers) if isinstance(data, LoRaD2DFrame) else None,
+                    )  # shared by all receivers, like the medium's own fan-out
+                    for recv_id, _ in receivers:
+                        queued.append((recv_id, rx_event, t_end + 1))
                 else:
                     # Any cross-cluster receiver (or no receivers) → let main propagate
                     self._cross_transmissions.append((sender, MediumTypes.LORA_D2D, data, t_start, t_end))
@@ -102,24 +141,78 @@ class ClusterMediumService:
             elif entry[0] == 'CX':
                 _, sender, t_start, t_end = entry
                 if sender in self._intra_ongoing:
-                    # Undo the pre-queued intra receptions and send CANCELED events instead
-                    recv_ids = self._intra_ongoing.pop(sender)
+                    # Undo the pre-queued intra receptions (if still this tick) and send CANCELED events instead;
+                    # re-inserting the key moves them behind everything queued so far
+                    recv_ids, _ = self._intra_ongoing.pop(sender)
+                    self._intra_receptions.pop((sender, t_start), None)
+                    queued = self._intra_receptions[(sender, t_start)] = []
                     for recv_id in recv_ids:
-                        self._intra_receptions = [
-                            (r, e, w) for r, e, w in self._intra_receptions
-                            if not (r == recv_id and e.node_id == sender and e.time_start == t_start)
-                        ]
                         cx_event = EventNet(
                             node_id=sender, time_start=t_start, time_end=t_end,
                             type=EventNetTypes.CANCELED, type_medium=MediumTypes.LORA_D2D,
                             data=[],
                         )
-                        self._intra_receptions.append((recv_id, cx_event, t_start + 1))
+                        queued.append((recv_id, cx_event, t_start + 1))
                 else:
                     self._cross_cancellations.append((sender, MediumTypes.LORA_D2D, t_start, t_end))
 
         self._pending_d2d.clear()
 
+    def propagate_cross_d2d(self, previous_tick: int, current_tick: int) -> tuple[list, list]:
+        """Peer routing: propagate this tick's cross-cluster D2D here instead of in main's LoraD2DMedium.
+
+        Takes the D2D entries out of the forwarded transmissions and cancellations and handles them
+        like main would, transmissions first, logging main's per-receiver DEBUG line at current_tick.
+        Returns (receiver_id, EventNet) receptions and (receiver_id, wake_tick) pairs. Transmissions
+        main would have expired by previous_tick are dropped first, so a late cancel finds the same
+        ongoing transmissions as in main.
+        """
+        debug = self._log is not None and self._log.enabled_for(Severity.DEBUG)
+        for sender, (t_end, _) in list(self._cross_ongoing.items()):
+            if t_end <= previous_tick:
+                del self._cross_ongoing[sender]
+
+        receptions, wakes = [], []
+        transmissions = []
+        for tx in self._cross_transmissions:
+            if tx[1] != MediumTypes.LORA_D2D:
+                transmissions.append(tx)
+                continue
+            sender, _, data, t_start, t_end = tx
+            receivers = self._reach_map.get(sender, [])
+            self._cross_ongoing[sender] = (t_end, [r for r, _ in receivers])
+            rx_event = EventNet(
+                node_id=sender, time_start=t_start, time_end=t_end,
+                type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D,
+                data=data, rssi=self._rssi_tables(sender, receivers) if isinstance(data, IRSSI) else None,
+            )
+            for recv_id, _ in receivers:
+                receptions.append((recv_id, rx_event))
+                wakes.append((recv_id, t_end + 1))
+                if debug:
+                    self._log.add(Severity.DEBUG, Area.MEDIUM, current_tick, f"Medium {MediumTypes.LORA_D2D} transmitting from node {sender} to node {recv_id} with data {data} from global tick {t_start} to global tick {t_end}")
+        self._cross_transmissions = transmissions
+
+        cancellations = []
+        for cx in self._cross_cancellations:
+            if cx[1] != MediumTypes.LORA_D2D:
+                cancellations.append(cx)
+                continue
+            sender, _, t_start, t_end = cx
+            if sender not in self._cross_ongoing:
+                continue
+            _, recv_ids = self._cross_ongoing.pop(sender)
+            for recv_id in recv_ids:
+                cx_event = EventNet(
+                    node_id=sender, time_start=t_start, time_end=t_end,
+                    type=EventNetTypes.CANCELED, type_medium=MediumTypes.LORA_D2D,
+                    data=[],
+                )
+                receptions.append((recv_id, cx_event))
+                wakes.append((recv_id, t_start + 1))
+        self._cross_cancellations = cancellations
+        return receptions, wakes
+
     def drain_transmissions(self) -> list:
         out = self._cross_transmissions[:]
         self._cross_transmissions.clear()
@@ -131,18 +224,72 @@ class ClusterMediumService:
         return out
 
     def drain_intra_receptions(self) -> list:
-        out = self._intra_receptions[:]
+        out = [entry for queued in self._intra_receptions.values() for entry in queued]
         self._intra_receptions.clear()
         return out
 
+    def set_owned(self, owned_nodes: frozenset) -> None:
+        self._owned_nodes = owned_nodes
+
+    def reset(self, owned_nodes: frozenset) -> None:
+        """Forget all mail and in-flight D2D state, before the worker adopts the nodes of a checkpoint."""
+        self._owned_nodes = owned_nodes
+        self._incoming.clear()
+        self._pending_d2d.clear()
+        self._cross_transmissions.clear()
+        self._cross_cancellations.clear()
+        self._intra_ongoing.clear()
+        self._intra_receptions.clear()
+        self._cross_ongoing.clear()
+
+    def busy_nodes(self, current_time: int) -> set[int]:
+        """Senders and receivers of intra-cluster transmissions that can still be cancelled."""
+        busy = set()
+        for sender, (recv_ids, t_end) in self._intra_ongoing.items():
+            if t_end >= current_time:
+                busy.add(sender)
+                busy.update(recv_ids)
+        return busy
+
+    def node_state(self, node_id: int) -> tuple:
+        """A node's undelivered mailbox, its intra- and cross-cluster cancel tracking and its reach row."""
+        incoming = [event for medium_type in MediumTypes for event in self._incoming.get((node_id, medium_type), ())]
+        return incoming, self._intra_ongoing.get(node_id), self._reach_map.get(node_id), self._cross_ongoing.get(node_id)
+
+    def export_node(self, node_id: int) -> tuple:
+        """node_state of a migrating node, which this worker then forgets."""
+        state = self.node_state(node_id)
+        for medium_type in MediumTypes:
+            self._incoming.pop((node_id, medium_type), None)
+        self._intra_ongoing.pop(node_id, None)
+        self._cross_ongoing.pop(node_id, None)
+        return state
+
+    def import_node(self, node_id: int, state: tuple) -> None:
+        incoming, ongoing, receivers, cross_ongoing = state
+        self.set_incoming(node_id, incoming)
+        if ongoing is not None:
+            self._intra_ongoing[node_id] = ongoing
+        if cross_ongoing is not None:
+            self._cross_ongoing[node_id] = cross_ongoing
+        if receivers is not None and node_id not in self._reach_map:
+            # A sliced worker was only given reach rows for the nodes it started with
+            self._reach_map[node_id] = receivers
+
 
 class CollectingLogger:
     """Proxy ILogger for worker processes — accumulates formatted strings."""
 
-    def __init__(self):
+    def __init__(self, min_severity: Severity | None = None):
         self._entries: list = []
+        self._dropped = severities_below(min_severity)
+
+    def enabled_for(self, severity) -> bool:
+        return severity not in self._dropped
 
     def add(self, severity, area, global_time: int, info: str, data=None) -> None:
+        if severity in self._dropped:
+            return
         self._entries.append(f"[{severity.value}] ({area.value}) @ {global_time}: {info}, {data if data else ''}\n")
 
     def flush(self, force: bool = False) -> bool:
@@ -159,66 +306,238 @@ class CollectingLogger:
 
 # ── Worker process entry point ─────────────────────────────────────────────────
 
-_WORKER_STOP = "STOP"
 
+def _apply_injections(nodes: dict, injection_tasks: list, current_time: int, log) -> None:
+    """Apply injection tasks directly to node-local state."""
+    # Local imports so this function works with both fork and spawn.
+    from payload_types import PayloadHopCntFull, PayloadHopCntMid, PayloadHopCntSimple
+
+    for inj in injection_tasks:
+        nid = inj["node_id"]
+        payload = inj["payload"]
+        node = nodes.get(nid)
+        if node is None:
+            continue
+        if isinstance(payload, PayloadData) and hasattr(node, "protocol") and hasattr(node.protocol, "app"):
+            node.protocol.app.enqueue_payload(payload)
+            log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"INJECTED: PayloadData into Node {nid}")
+        elif isinstance(payload, MegaSync) and hasattr(node, "local_event_queue"):
+            wan_frame = LoRaWanPHYPayload(mhdr=96, mac_payload=MACPayload(dev_addr=nid, fctrl_flags=0, fcnt=0, frm_payload=payload))
+            node.local_event_queue.add_event_to_current_tick(LocalEventTypes.TRANCEIVER_RECEIVED_DATA, wan_frame, sub_type=MediumTypes.LORA_WAN)
+            log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"INJECTED: MegaSync into Node {nid}")
+        elif (isinstance(payload, PayloadHopCntSimple) or isinstance(payload, PayloadHopCntMid) or isinstance(payload, PayloadHopCntFull)) and hasattr(node, "protocol") and hasattr(node.protocol, "d2d"):
+            node.protocol.d2d.enqueue_payload(payload)
+            log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"INJECTED: PayloadHopCnt into Node {nid}")
+
+
+def _tick_nodes(nodes: dict, active_ids, current_time: int, node_time: dict | None = None) -> list:
+    """Tick the active nodes in ascending id order so the medium sees a deterministic event order.
+
+    node_time, when given, accumulates the wall time spent per node for load balancing.
+    """
+    next_ticks = []
+    for nid in sorted(active_ids):
+        node = nodes.get(nid)
+        if node is None:
+            continue
+        if node_time is None:
+            next_ticks.append((nid, node.tick(current_time)))
+        else:
+            start = time.perf_counter()
+            next_ticks.append((nid, node.tick(current_time)))
+            node_time[nid] += time.perf_counter() - start
+    return next_ticks
+
+
+def _run_window(nodes: dict, medium: ClusterMediumService, log: CollectingLogger, horizon: int, events: list, incoming: list, injection_tasks: list, node_time: dict | None = None) -> tuple:
+    """Advance all local events up to and including horizon without talking to the main process.
+
+    Intra-cluster receptions are delivered straight into the local mailbox and, when due inside
+    the window, scheduled on a local event queue. Everything the main process has to replay is
+    returned grouped by the tick and evaluation round it happened in. injection_tasks all carry the tick main resolved
+    for them, the window's first tick, which may belong to another worker's nodes.
+    """
+    queue = DeviceEventQueue()
+    for tick, next_ids, wake_ids in events:
+        for nid in next_ids:
+            queue.schedule_next(nid, tick)
+        for nid in wake_ids:
+            queue.add_event(nid, tick)
+
+    for nid, node_events in incoming:
+        medium.set_incoming(nid, node_events)
+
+    processed_ticks = []
+    per_tick = []  # (tick, round, transmissions, cancellations, logs), round counts from 1 per tick
+    rounds: Counter = Counter()
+    last_next: dict[int, int | None] = {}  # node_id -> next tick it returned last, rescheduled by main
+    wakes: set[tuple[int, int]] = set()  # (node_id, tick) receptions beyond the horizon, scheduled by main
+    superseded = 0  # returned next ticks beyond the horizon that a later evaluation replaced
+
+    if injection_tasks and (not queue or queue.peek_tick() > injection_tasks[0]["tick"]):
+        _apply_injections(nodes, injection_tasks, injection_tasks[0]["tick"], log)
+        per_tick.append((injection_tasks[0]["tick"], 1, [], [], log.drain_entries()))
+        injection_tasks = []
+
+    while queue:
+        current_time, active_ids = queue.get_next_events()
+
+        if injection_tasks:
+            _apply_injections(nodes, injection_tasks, current_time, log)
+            injection_tasks = []
+
+        for nid, nt in _tick_nodes(nodes, active_ids, current_time, node_time):
+            previous = last_next.pop(nid, None)
+            if previous is not None and previous != nt and (nid, previous) not in wakes:
+                superseded += 1
+            # A repeated round at the horizon goes through main so it is ordered after main-side deliveries of the first round
+            if nt is not None and (nt < horizon or (nt == horizon and current_time < horizon)):
+                queue.schedule_next(nid, nt)
+            else:
+                queue.schedule_next(nid, None)
+                last_next[nid] = nt
+
+        medium.flush_d2d(current_time)
+        for recv_id, eventnet, wake_tick in medium.drain_intra_receptions():
+            medium.set_incoming(recv_id, [eventnet])
+            if wake_tick <= horizon:
+                queue.add_event(recv_id, wake_tick)
+            else:
+                wakes.add((recv_id, wake_tick))
 
-def _worker_run_loop(node_ids: list, node_neighbors: dict, owned_nodes: frozenset, reach_map: dict, conn) -> None:
+        processed_ticks.append(current_time)
+        rounds[current_time] += 1
+        transmissions, cancellations, entries = medium.drain_transmissions(), medium.drain_cancellations(), log.drain_entries()
+        if transmissions or cancellations or entries:
+            per_tick.append((current_time, rounds[current_time], transmissions, cancellations, entries))
+
+    deferred = [(nid, nt, True) for nid, nt in last_next.items()] + [(nid, tick, False) for nid, tick in sorted(wakes)]
+    return processed_ticks, per_tick, deferred, queue.suppressed_wakeups + superseded
+
+
+def _worker_run_loop(node_ids: list, topology: TopologyTable | SharedTopology, owned_nodes: frozenset, reach_map: dict | None, channel, peers: tuple | None = None, node_config: NodeConfig = NodeConfig(), log_level: Severity | None = None) -> None:
     """Runs inside each worker Process.
+    topology and reach_map either cover this worker's slice (its own nodes plus their halo) or
+    topology is a SharedTopology holding both for the whole network, mapped read-only.
+    peers, with peer D2D routing, is (worker_id, halo owners, outgoing links, incoming links).
+    node_config holds the run's node parameters (RNG seed, slot layout, battery constants).
+    log_level, when set, drops log lines below it before they are formatted and shipped to main.
     Initialises a node subset with proxy medium/logger, then loops:
-      receive task → tick active nodes → send results.
+      receive task → tick active nodes (or a whole lookahead window) → send results.
     """
-    # Local imports so this function works with both fork and spawn.
-    from payload_types import PayloadHopCntFull, PayloadHopCntMid, PayloadHopCntSimple
-
-    medium = ClusterMediumService(owned_nodes=owned_nodes, reach_map=reach_map)
-    log = CollectingLogger()
+    if isinstance(topology, SharedTopology):
+        topology, reach_map = topology.table(), topology.reach_map()
+    log = CollectingLogger(log_level)
+    medium = ClusterMediumService(owned_nodes=owned_nodes, reach_map=reach_map, log=log)
     nodes: dict = {}
+    node_time: dict[int, float] = defaultdict(float)  # seconds spent per node since the last load report
+    exchange = PeerExchange(*peers) if peers is not None else None
 
     for nid in node_ids:
-        info = node_neighbors[nid]
-        if info.is_gateway:
-            nodes[nid] = Gateway(gateway_id=nid, second_to_global_tick=_SECOND_TO_GLOBAL_TICK, medium_service=medium, log=log)
+        if topology[nid].is_gateway:
+            nodes[nid] = Gateway(gateway_id=nid, second_to_global_tick=_SECOND_TO_GLOBAL_TICK, medium_service=medium, log=log, config=node_config)
         else:
-            nodes[nid] = Node(node_id=nid, second_to_global_tick=_SECOND_TO_GLOBAL_TICK, medium_service=medium, log=log)
+            nodes[nid] = Node(node_id=nid, second_to_global_tick=_SECOND_TO_GLOBAL_TICK, medium_service=medium, log=log, config=node_config)
 
     while True:
-        task = conn.recv()
+        task = exchange.recv(channel) if exchange is not None else channel.recv()
         if task == _WORKER_STOP:
             break
 
-        current_time, active_ids, incoming, injection_tasks = task
+        if task[0] == _WORKER_WINDOW:
+            _, horizon, events, incoming, injection_tasks = task
+            channel.send((_WORKER_WINDOW, *_run_window(nodes, medium, log, horizon, events, incoming, injection_tasks, node_time)))
+            continue
+
+        if task[0] == _WORKER_STATS:
+            channel.send({"node_time": dict(node_time), "busy": medium.busy_nodes(task[1])})
+            node_time.clear()
+            continue
+
+        if task[0] == _WORKER_EXPORT:
+            _, by_destination, owned = task
+            medium.set_owned(owned)
+            channel.send({dest: export_nodes(nodes, medium, log, nids) for dest, nids in by_destination.items()})
+            continue
+
+        if task[0] == _WORKER_IMPORT:
+            _, blobs, owned = task
+            medium.set_owned(owned)
+            for blob in blobs:
+                import_nodes(nodes, medium, log, blob)
+            channel.send({"imported": len(blobs)})
+            continue
+
+        if task[0] == _WORKER_SNAPSHOT:
+            if exchange is not None:
+                # Peers finished sending before they replied to main, so every batch is readable already
+                for recv_id, event in exchange.drain(float("inf")):
+                    medium.set_incoming(recv_id, [event])
+            channel.send(snapshot_nodes(nodes, medium, log))
+            continue
+
+        if task[0] == _WORKER_RESTORE:
+            _, blob, owned = task
+            if exchange is not None:
+                exchange.drain(float("inf"))  # batches of the abandoned run
+            nodes.clear()
+            node_time.clear()
+            medium.reset(owned)
+            import_nodes(nodes, medium, log, blob)
+            channel.send({"restored": len(nodes)})
+            continue
+
+        if task[0] == _WORKER_FORK:
+            # The channel of the copy comes as a file descriptor right behind the task
+            fork_conn = Connection(recv_handle(channel.conn))
+            signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # copies are reaped without waiting for them
+            gc.freeze()  # collections in the copy would otherwise write to every tracked object's page
+            pid = os.fork()
+            if pid == 0:
+                channel.conn.close()
+                channel = PipeChannel(fork_conn)
+                continue
+            gc.unfreeze()
+            fork_conn.close()
+            channel.send({"forked": pid})
+            continue
+
+        if task[0] == _WORKER_BATTERY:
+            _, capacity_joule, recharge_rate_joule_per_second = task
+            for node in nodes.values():
+                if isinstance(node, Node):
+                    node.battery.reconfigure(capacity_joule, recharge_rate_joule_per_second, _SECOND_TO_GLOBAL_TICK)
+            channel.send({"reconfigured": len(nodes)})
+            continue
+
+        _, current_time, active_ids, incoming, injection_tasks, *barrier = task
 
         # Pre-load incoming media events so transceiver.tick() can pop them
         for nid, events in incoming:
             medium.set_incoming(nid, events)
+        if exchange is not None:
+            seq, previous_tick = barrier
+            for recv_id, event in exchange.drain(seq):
+                medium.set_incoming(recv_id, [event])
 
-        # Apply injection tasks directly to node-local state
-        for inj in injection_tasks:
-            nid = inj["node_id"]
-            payload = inj["payload"]
-            node = nodes.get(nid)
-            if node is None:
-                continue
-            if isinstance(payload, PayloadData) and hasattr(node, "protocol") and hasattr(node.protocol, "app"):
-                node.protocol.app.enqueue_payload(payload)
-                log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"INJECTED: PayloadData into Node {nid}")
-            elif isinstance(payload, MegaSync) and hasattr(node, "local_event_queue"):
-                wan_frame = LoRaWanPHYPayload(mhdr=96, mac_payload=MACPayload(dev_addr=nid, fctrl_flags=0, fcnt=0, frm_payload=payload))
-                node.local_event_queue.add_event_to_current_tick(LocalEventTypes.TRANCEIVER_RECEIVED_DATA, wan_frame, sub_type=MediumTypes.LORA_WAN)
-                log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"INJECTED: MegaSync into Node {nid}")
-            elif (isinstance(payload, PayloadHopCntSimple) or isinstance(payload, PayloadHopCntMid) or isinstance(payload, PayloadHopCntFull)) and hasattr(node, "protocol") and hasattr(node.protocol, "d2d"):
-                node.protocol.d2d.enqueue_payload(payload)
-                log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"INJECTED: PayloadHopCnt into Node {nid}")
+        _apply_injections(nodes, injection_tasks, current_time, log)
 
         # Tick each active node
-        next_ticks = []
-        for nid in active_ids:
-            node = nodes.get(nid)
-            if node is not None:
-                next_ticks.append((nid, node.tick(current_time)))
+        next_ticks = _tick_nodes(nodes, active_ids, current_time, node_time)
 
         medium.flush_d2d(current_time)
-        conn.send((next_ticks, medium.drain_transmissions(), medium.drain_cancellations(), log.drain_entries(), medium.drain_intra_receptions()))
+        if exchange is None:
+            channel.send((_WORKER_TICK, next_ticks, medium.drain_transmissions(), medium.drain_cancellations(), log.drain_entries(), medium.drain_intra_receptions()))
+            continue
+
+        # Peer routing: intra receptions stay here, cross-cluster ones go to their workers; main only schedules the wakeups
+        wakes = []
+        for recv_id, eventnet, wake_tick in medium.drain_intra_receptions():
+            medium.set_incoming(recv_id, [eventnet])
+            wakes.append((recv_id, wake_tick))
+        receptions, cross_wakes = medium.propagate_cross_d2d(previous_tick, current_time)
+        exchange.exchange(seq, split_by_worker(receptions, exchange.worker_id, owned_nodes, exchange.owner))
+        channel.send((_WORKER_TICK, next_ticks, medium.drain_transmissions(), medium.drain_cancellations(), log.drain_entries(), wakes + cross_wakes))
 
 
 class NetworkTopologyLoader:
@@ -234,7 +553,15 @@ class NetworkTopologyLoader:
         Gateway IDs are assigned above all node IDs.
         Node neighbor lists are filtered to only include visited nodes.
         Gateway neighbor lists contain nodes within LORA_WAN_RADIUS.
+
+        The file is streamed entry by entry into flat arrays (sim.topology_stream), so the parsed
+        JSON document never exists as a whole; the result equals from_json_eager.
         """
+        return analyze_topology(read_topology(json_path), NetworkTopologyLoader.LORA_WAN_RADIUS_M)
+
+    @staticmethod
+    def from_json_eager(json_path: str) -> dict[int, NodeMediumInfo]:
+        """Reference loader: json.load of the whole file, then BFSTopologyAnalyzer.analyze on the dicts."""
         with open(json_path) as f:
             data = json.load(f)
 
@@ -296,14 +623,58 @@ class NetworkTopologyLoader:
         return device_neighbors
 
     @staticmethod
-    def from_file(file_path: str | Path) -> dict[int, NodeMediumInfo]:
-        """Alias for from_json."""
+    def scale(file_path: str | Path) -> tuple[float, float]:
+        """(m_per_svg_x, m_per_svg_y) from the map's metadata, with the defaults the loader assumes."""
+        meta = read_topology(str(file_path)).extra.get("metadata", {})
+        return meta.get("m_per_svg_x", 391.287), meta.get("m_per_svg_y", 702.570)
+
+    @staticmethod
+    def from_file(file_path: str | Path, cache: CachedTopology | None = None) -> Mapping[int, NodeMediumInfo]:
+        """Alias for from_json; with a cache entry the preprocessed table is loaded from disk when present."""
+        if cache is not None:
+            return cache.device_neighbors(lambda: NetworkTopologyLoader.from_json(str(file_path)))
         return NetworkTopologyLoader.from_json(str(file_path))
 
 
+class _ForkedWorker:
+    """Process-like handle of a worker copied by Simulation.fork; the worker it was copied from reaps it."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+
+    def is_alive(self) -> bool:
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+    def join(self, timeout: float | None = None) -> None:
+        deadline = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        while self.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def terminate(self) -> None:
+        try:
+            os.kill(self.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
 class Simulation:
-    def __init__(self, log_path: str, status=None, lock=None, tps_value=None, log_queue=None, log_lines=100, current_tick_value=None, injection_tasks=None, device_neighbors=None):
-        self.log = SimpleLogger(log_path=log_path, buffer_size=100_000)
+    def __init__(self, log_path: str, status=None, lock=None, tps_value=None, log_queue=None, log_lines=100, current_tick_value=None, injection_tasks=None, device_neighbors=None, lookahead=False, n_workers=None, transport="pipe", event_queue="sorted", rebalance: RebalancePolicy | None = None, partitioner="bfs", topology_cache: CachedTopology | None = None, worker_topology="slice", dispatch="barrier", d2d_routing="main", node_config: NodeConfig = NodeConfig(), log_level: Severity | None = None, checkpoint_path: str | Path | None = None, checkpoint_interval_ticks: int | None = None, d2d_range: RangePropagation | None = None):
+        if worker_topology not in WORKER_TOPOLOGIES:
+            raise ValueError(f"Unknown worker topology '{worker_topology}', expected one of {WORKER_TOPOLOGIES}")
+        if dispatch not in DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode '{dispatch}', expected one of {DISPATCH_MODES}")
+        self.dispatch = dispatch
+        if d2d_routing not in D2D_ROUTINGS:
+            raise ValueError(f"Unknown D2D routing '{d2d_routing}', expected one of {D2D_ROUTINGS}")
+        if d2d_routing == "peer" and (transport != "pipe" or lookahead or rebalance is not None):
+            raise ValueError("Peer D2D routing needs the pipe transport and tick-by-tick dispatch without lookahead or rebalancing")
+        self.d2d_routing = d2d_routing
+        self.node_config = node_config
+        self.log = SimpleLogger(log_path=log_path, buffer_size=100_000, min_severity=log_level)
         self.global_time = GlobalTime()
         self.injection_tasks = injection_tasks or []
         self.completed_injections = set()
@@ -314,61 +685,116 @@ class Simulation:
             device_neighbors_dict = device_neighbors
 
         num_devices = len(device_neighbors_dict)
-        self.event_queue = DeviceEventQueue()
+        self.event_queue = EVENT_QUEUES[event_queue]()
         self.event_queue.init_tick(start_tick=1, node_ids=range(1, num_devices + 1))
 
         self.medium_service = MediumService(node_neighbors=device_neighbors_dict, event_queue=self.event_queue, log=self.log)
 
         # Cap workers to physical cores — hyperthreads don't help CPU-bound Python
-        logical_cpus = os.cpu_count() or 4
-        phys_cores = max(1, logical_cpus // 2)
-        n_workers = max(1, min(phys_cores, num_devices))
-
-        # Pre-compute D2D reach map once — O(1) per transmission instead of O(neighbors^2) traversal
-        reach_map = LoraD2DMedium.build_reach_map(device_neighbors_dict)
+        if n_workers is None:
+            logical_cpus = os.cpu_count() or 4
+            n_workers = max(1, logical_cpus // 2)
+        n_workers = max(1, min(n_workers, num_devices))
+
+        # Pre-compute D2D reach map once — O(1) per transmission instead of O(neighbors^2) traversal.
+        # With d2d_range receivers come from radio range; the topology cache only holds the graph reach map
+        if d2d_range is not None:
+            topology_cache = None
+            reach_map = LoraD2DMedium.build_range_reach_map(device_neighbors_dict, d2d_range)
+        else:
+            reach_map = topology_cache.reach_map(device_neighbors_dict) if topology_cache is not None else LoraD2DMedium.build_reach_map(device_neighbors_dict)
         self.medium_service._mediums_by_type[MediumTypes.LORA_D2D].set_reach_map(reach_map)
 
-        # Topology-aware clustering: BFS from geo-spread seeds keeps communicating nodes together
-        node_to_cluster = BFSTopologyAnalyzer.cluster_partition(device_neighbors_dict, n_workers)
+        # Topology-aware clustering: "bfs" grows clusters from geo-spread seeds, "multilevel" minimises the reach-map edge cut
+        def partition() -> tuple[dict[int, int], dict]:
+            activity = expected_activity(device_neighbors_dict, reach_map)
+            node_to_cluster = PARTITIONERS[partitioner](device_neighbors_dict, reach_map, n_workers, activity)
+            return node_to_cluster, partition_quality(reach_map, node_to_cluster, activity)
+
+        node_to_cluster, self.partition_quality = topology_cache.partition(partitioner, n_workers, partition) if topology_cache is not None else partition()
         partitions: list[list[int]] = [[] for _ in range(n_workers)]
         self._node_to_worker: dict[int, int] = {}
         for nid, cid in node_to_cluster.items():
             partitions[cid].append(nid)
             self._node_to_worker[nid] = cid
 
+        self.partitioner = partitioner
         self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Worker cluster sizes: {[len(p) for p in partitions]}")
+        q = self.partition_quality
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Partition ({partitioner}): edge cut {q['edge_cut']} of {q['reach_edges']} reach edges, {q['cross_senders']} cross-cluster senders, balance {q['balance']:.2f}")
 
-        # Start one persistent Process per partition, connected via duplex Pipe
-        self._workers: list[tuple] = []  # (parent_conn, Process)
+        # Conservative lookahead: ticks before each node's activity can reach another cluster or the main-side medium
+        self.lookahead = lookahead
+        self._lookahead: dict[int, int] = BFSTopologyAnalyzer.lookahead_distances(device_neighbors_dict, reach_map, node_to_cluster) if lookahead else {}
+
+        # Runtime re-partitioning: per-node tick time comes from the workers, cross-cluster D2D sends are counted here
+        self.rebalance = rebalance
+        self.rebalance_report: list[tuple] = []  # (tick, measured imbalance, projected imbalance, migrated nodes)
+        self._device_neighbors = device_neighbors_dict
+        self._reach_map = reach_map
+        self._cross_tx: Counter = Counter()
+        self._next_rebalance = rebalance.interval_ticks if rebalance is not None else None
+
+        # Checkpoints: every checkpoint_interval_ticks during run_for, and once when it ends, overwriting the same file
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval_ticks = checkpoint_interval_ticks
+        self._next_checkpoint = checkpoint_interval_ticks if checkpoint_path is not None and checkpoint_interval_ticks else None
+
+        # Start one persistent Process per partition, connected via a duplex Pipe (pickled) or shared memory rings
+        self.transport = transport
+        self._workers: list[tuple] = []  # (channel, Process)
+        # "slice" pickles each worker its own rows plus halo, "shared" writes the whole topology once and workers map it
+        self.worker_topology = worker_topology
+        table = TopologyTable.from_infos(device_neighbors_dict)
+        self._shared_topology = SharedTopology.publish(table, ReachCSR.from_dict(reach_map)) if worker_topology == "shared" else None
+        # "peer" links every pair of workers sharing a reach-map edge, main then never sees cross-cluster D2D
+        peers, peer_connections = peer_links(reach_map, self._node_to_worker, n_workers) if d2d_routing == "peer" else (None, [])
         for w_idx, w_ids in enumerate(partitions):
-            parent_conn, child_conn = Pipe(duplex=True)
+            channel, child_channel = create_channel_pair(transport)
             owned = frozenset(w_ids)
-            p = Process(target=_worker_run_loop, args=(w_ids, device_neighbors_dict, owned, reach_map, child_conn), daemon=True)
+            if self._shared_topology is not None:
+                args = (w_ids, self._shared_topology, owned, None, child_channel)
+            else:
+                w_reach = {nid: reach_map[nid] for nid in w_ids if nid in reach_map}
+                args = (w_ids, table.subset(owned | table.halo(owned, w_reach)), owned, w_reach, child_channel)
+            args += ((w_idx, *peers[w_idx]) if peers is not None else None, node_config, log_level)
+            p = Process(target=_worker_run_loop, args=args, daemon=True)
             p.start()
-            child_conn.close()  # Only the child needs its end
-            self._workers.append((parent_conn, p))
+            child_channel.close()  # Only the child needs its end
+            self._workers.append((channel, p))
+        self._workers_running = True
+        for conn in peer_connections:
+            conn.close()
+        self._previous_tick = 0  # last tick the medium was closed for; peer workers expire their ongoing transmissions with it
 
         # Pending incoming EventNets for nodes that haven't woken yet
         self._pending_incoming: dict[int, list] = defaultdict(list)
 
-        self.status = status
+        # barriers: main <-> worker round trips, ticks: distinct global ticks evaluated
+        self.stats = {"barriers": 0, "ticks": 0, "node_tick_time": 0.0, "propagation_time": 0.0, "suppressed_wakeups": 0, "rebalances": 0, "migrated_nodes": 0}
+        # Main-side seconds per phase: building and sending batches, blocked on replies, applying them, medium propagation
+        self.phase_time = {phase: 0.0 for phase in _PHASES}
+
+        self.status = status  # None runs headless: no pause or stop from outside
+        self.error: Exception | None = None  # what ended run_for early, if anything
         self.lock = lock
         self.tps_value = tps_value
         self.log_queue = log_queue
         self.log_lines = log_lines
         self.current_tick_value = current_tick_value
 
-    def run_for(self, stop_tick):
+    def run_for(self, stop_tick, keep_workers=False):
+        """Simulate up to and including stop_tick.
+
+        The workers are stopped afterwards unless keep_workers is set, which allows checkpoint() or
+        another run_for() to continue from here; close() stops them then.
+        """
         stopwatch_start_time = time.time()
-        propagation_time = 0
-        node_tick_time = 0
-        current_time = 0
-        total_evaluated = 0
         last_tps_calc = time.time()
 
         try:
-            while len(self.event_queue.events):
-                sim_state = self.status.value  # c_int read is atomic, no lock needed
+            while len(self.event_queue):
+                sim_state = self.status.value if self.status is not None else SimState.RUNNING.value  # c_int read is atomic, no lock needed
 
                 if sim_state == SimState.PAUSED.value:
                     self.log.flush(force=True)
@@ -380,85 +806,18 @@ class Simulation:
                 if sim_state == SimState.STOPPED.value:
                     break
 
-                (current_time, node_ids) = self.event_queue.get_next_events()
-
-                if current_time > stop_tick:
+                advanced = self._advance_window(stop_tick) if self.lookahead else self._advance_tick(stop_tick)
+                if not advanced:
                     if self.current_tick_value is not None:
                         self.current_tick_value.value = int(stop_tick)
                     break
 
-                self.global_time.set_time(current_time)
-
-                if self.current_tick_value is not None:
-                    self.current_tick_value.value = int(current_time)
-
-                node_start_time = time.time()
-
-                # Build per-worker batches: active nodes + pending incoming for active nodes
-                n_w = len(self._workers)
-                w_active: list[list] = [[] for _ in range(n_w)]
-                w_incoming: list[list] = [[] for _ in range(n_w)]
-                w_injections: list[list] = [[] for _ in range(n_w)]
-                dispatched: set[int] = set()
-
-                for nid in node_ids:
-                    w = self._node_to_worker.get(nid)
-                    if w is not None:
-                        w_active[w].append(nid)
-                        dispatched.add(w)
-                        # Include pending incoming only when the node is being ticked
-                        if nid in self._pending_incoming:
-                            w_incoming[w].append((nid, self._pending_incoming.pop(nid)))
-
-                # Route injection tasks to the owning worker
-                for idx, task in enumerate(self.injection_tasks):
-                    if idx not in self.completed_injections and current_time >= task["tick"]:
-                        w = self._node_to_worker.get(task["node_id"])
-                        if w is not None:
-                            w_injections[w].append(task)
-                            dispatched.add(w)
-                        self.completed_injections.add(idx)
-
-                # Dispatch tasks only to workers that have work this tick
-                conn_to_worker: dict = {}
-                for w in dispatched:
-                    conn = self._workers[w][0]
-                    conn.send((current_time, w_active[w], w_incoming[w], w_injections[w]))
-                    conn_to_worker[conn] = w
-
-                # Collect results as they arrive — overlaps with remaining worker runtime
-                pending = list(conn_to_worker.keys())
-                while pending:
-                    ready = mp_wait(pending, timeout=60)
-                    if not ready:
-                        raise TimeoutError("Worker timed out after 60s")
-                    for conn in ready:
-                        next_ticks, transmissions, cancellations, logs, intra_receptions = conn.recv()
-                        for nid, nt in next_ticks:
-                            self.event_queue.add_event(nid, nt)
-                        for tx in transmissions:
-                            self.medium_service.transmit(*tx)
-                        for cx in cancellations:
-                            self.medium_service.cancel_transmission(*cx)
-                        if logs:
-                            self.log._buffer.extend(logs)
-                        for recv_id, eventnet, wake_tick in intra_receptions:
-                            self._pending_incoming[recv_id].append(eventnet)
-                            self.event_queue.add_event(recv_id, wake_tick)
-                        pending.remove(conn)
-
-                node_tick_time += time.time() - node_start_time
-
-                propagation_start_time = time.time()
-                self.medium_service.propagate_mediums(current_time)
-                propagation_time += time.time() - propagation_start_time
-
-                # Store media deliveries so receiving nodes get them on their next wakeup
-                for medium_obj in self.medium_service._mediums_by_type.values():
-                    for nid, events in medium_obj.node_receptions.items():
-                        self._pending_incoming[nid].extend(events)
-                    medium_obj.node_receptions.clear()
-                total_evaluated += 1
+                if self._next_rebalance is not None and self.global_time.get_time() >= self._next_rebalance:
+                    self._rebalance(self.global_time.get_time())
+
+                if self._next_checkpoint is not None and self.global_time.get_time() >= self._next_checkpoint:
+                    self._next_checkpoint = self.global_time.get_time() + self.checkpoint_interval_ticks
+                    self.checkpoint(self.checkpoint_path)
 
                 if self.log_queue is not None:
                     try:
@@ -475,36 +834,480 @@ class Simulation:
                     tps = self.global_time.get_tps()
                     self.tps_value.value = int(tps) if tps is not None else 0
                     last_tps_calc = now
+
+            if self.checkpoint_path is not None:
+                self.checkpoint(self.checkpoint_path)
         except Exception as e:
             import traceback
 
+            self.error = e
             print(f"Simulation error: {e}\n{traceback.format_exc()}")
             self.log.add(Severity.ERROR, Area.SIMULATOR, self.global_time.get_time(), f"Simulation error: {e}", data=None)
         finally:
-            self._stop_workers()
+            if not keep_workers or self.error is not None:
+                self._stop_workers()
 
         elapsed_time = time.time() - stopwatch_start_time
+        node_tick_time = self.stats["node_tick_time"]
+        propagation_time = self.stats["propagation_time"]
         num_nodes = len(self._node_to_worker)
         self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total elapsed real time: {elapsed_time:.2f} seconds for {num_nodes} nodes")
         self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total node tick time: {node_tick_time:.2f} seconds")
         self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total propagation time: {propagation_time:.2f} seconds")
         self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total log time: {(elapsed_time - (propagation_time + node_tick_time)):.2f} seconds")
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, "Phase breakdown (" + self.dispatch + "): " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phase_time.items()))
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total worker barriers: {self.stats['barriers']} for {self.stats['ticks']} evaluated ticks")
+        self.stats["suppressed_wakeups"] = self.event_queue.suppressed_wakeups
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total suppressed wakeups: {self.stats['suppressed_wakeups']}")
+        if self.rebalance is not None:
+            self.log.add(Severity.DEBUG, Area.SIMULATOR, 0, f"Total node migrations: {self.stats['migrated_nodes']} in {self.stats['rebalances']} rebalances")
         self.log.flush(force=True)
 
+    def _set_current_time(self, current_time: int) -> None:
+        self.global_time.set_time(current_time)
+        if self.current_tick_value is not None:
+            self.current_tick_value.value = int(current_time)
+
+    def _collect_pending_receptions(self) -> None:
+        """Store media deliveries so receiving nodes get them on their next wakeup."""
+        for medium_obj in self.medium_service._mediums_by_type.values():
+            for nid, events in medium_obj.node_receptions.items():
+                self._pending_incoming[nid].extend(events)
+            medium_obj.node_receptions.clear()
+
+    def _due_injections(self, current_time: int) -> list[list]:
+        """Route not yet applied injection tasks due at current_time to their owning worker."""
+        w_injections: list[list] = [[] for _ in range(len(self._workers))]
+        for idx, task in enumerate(self.injection_tasks):
+            if idx not in self.completed_injections and current_time >= task["tick"]:
+                w = self._node_to_worker.get(task["node_id"])
+                if w is not None:
+                    w_injections[w].append(task)
+                self.completed_injections.add(idx)
+        return w_injections
+
+    def _gather_in_order(self, tasks: dict[int, tuple]):
+        """Send tasks to workers and yield (worker, result) in worker order.
+
+        Results are received as they arrive, so main-side handling of worker 0 overlaps with the
+        remaining workers' runtime while the medium still sees a deterministic event order.
+        """
+        order = sorted(tasks)
+        conn_to_worker: dict = {}
+        send_start = time.perf_counter()
+        for w in order:
+            channel = self._workers[w][0]
+            channel.send(tasks[w])
+            conn_to_worker[channel.conn] = w
+        self.phase_time["dispatch"] += time.perf_counter() - send_start
+        if order:
+            self.stats["barriers"] += 1
+
+        results: dict[int, tuple] = {}
+        for w in order:
+            wait_start = time.perf_counter()
+            while w not in results:
+                ready = mp_wait(list(conn_to_worker), timeout=60)
+                if not ready:
+                    raise TimeoutError("Worker timed out after 60s")
+                for conn in ready:
+                    w_ready = conn_to_worker.pop(conn)
+                    results[w_ready] = self._workers[w_ready][0].recv()
+            self.phase_time["wait"] += time.perf_counter() - wait_start
+            yield w, results.pop(w)
+
+    def _advance_tick(self, stop_tick) -> bool:
+        """Evaluate the next scheduled tick with one round trip to every worker that has work."""
+        # Peek first: events beyond stop_tick have to stay queued for a later run_for or checkpoint
+        next_tick = self.event_queue.peek_tick()
+        if next_tick is None or next_tick > stop_tick:
+            return False
+        (current_time, node_ids) = self.event_queue.get_next_events()
+
+        self._set_current_time(current_time)
+        node_start_time = time.time()
+        phase_start = time.perf_counter()
+
+        # Build per-worker batches: active nodes + pending incoming for active nodes
+        n_w = len(self._workers)
+        w_active: list[list] = [[] for _ in range(n_w)]
+        w_incoming: list[list] = [[] for _ in range(n_w)]
+        dispatched: set[int] = set()
+
+        for nid in node_ids:
+            w = self._node_to_worker.get(nid)
+            if w is not None:
+                w_active[w].append(nid)
+                dispatched.add(w)
+                # Include pending incoming only when the node is being ticked
+                if nid in self._pending_incoming:
+                    w_incoming[w].append((nid, self._pending_incoming.pop(nid)))
+
+        w_injections = self._due_injections(current_time)
+        dispatched.update(w for w in range(n_w) if w_injections[w])
+
+        # Dispatch tasks only to workers that have work this tick
+        tasks = {w: (_WORKER_TICK, current_time, w_active[w], w_incoming[w], w_injections[w]) for w in dispatched}
+        if self.d2d_routing == "peer":
+            barrier = (self.stats["barriers"], self._previous_tick)
+            tasks = {w: (*task, *barrier) for w, task in tasks.items()}
+        self.phase_time["dispatch"] += time.perf_counter() - phase_start
+        streamed_propagation = 0.0
+        for _, result in self._gather_in_order(tasks):
+            phase_start = time.perf_counter()
+            _, next_ticks, transmissions, cancellations, logs, intra_receptions = result
+            for nid, nt in next_ticks:
+                self.event_queue.schedule_next(nid, nt)
+            for tx in transmissions:
+                self.medium_service.transmit(*tx)
+                if tx[1] == MediumTypes.LORA_D2D:
+                    self._cross_tx[tx[0]] += 1
+            for cx in cancellations:
+                self.medium_service.cancel_transmission(*cx)
+            if logs:
+                self.log._buffer.extend(logs)
+            if self.d2d_routing == "peer":
+                for recv_id, wake_tick in intra_receptions:
+                    self.event_queue.add_event(recv_id, wake_tick)
+            else:
+                for recv_id, eventnet, wake_tick in intra_receptions:
+                    self._pending_incoming[recv_id].append(eventnet)
+                    self.event_queue.add_event(recv_id, wake_tick)
+            apply_end = time.perf_counter()
+            self.phase_time["apply"] += apply_end - phase_start
+
+            if self.dispatch == "pipelined":
+                # Propagate this worker's transmissions while the later workers are still ticking;
+                # worker order is kept, so every node receives the same events in the same order
+                self.medium_service.propagate_pending(current_time)
+                elapsed = time.perf_counter() - apply_end
+                self.phase_time["streamed_propagation"] += elapsed
+                streamed_propagation += elapsed
+
+        self.stats["node_tick_time"] += time.time() - node_start_time - streamed_propagation
+
+        propagation_start_time = time.time()
+        self.medium_service.propagate_mediums(current_time)
+        self._collect_pending_receptions()
+        elapsed = time.time() - propagation_start_time
+        self.phase_time["propagation"] += elapsed
+        self.stats["propagation_time"] += elapsed + streamed_propagation
+        self.stats["ticks"] += 1
+        self._previous_tick = current_time
+        return True
+
+    def _lookahead_horizon(self, stop_tick) -> int | None:
+        """Last tick every worker can evaluate without seeing another cluster's transmissions.
+
+        A node at lookahead distance d scheduled at tick t cannot cause a main-routed transmission
+        before t + d, and that transmission is only visible to other nodes from the following tick.
+        Returns None when the next event lies beyond stop_tick. An injection due after the first tick
+        ends the window before it: tick mode applies it at the first tick at or after its own, which
+        is only known once every earlier tick has been evaluated.
+        """
+        first = horizon = None
+        for tick, node_ids in self.event_queue.iter_events():
+            if horizon is None:
+                if tick > stop_tick:
+                    return None
+                first, horizon = tick, min(stop_tick, tick + _MAX_WINDOW_TICKS)
+            if tick > horizon:
+                break
+            for nid in node_ids:
+                distance = self._lookahead.get(nid)
+                if distance is not None and tick + distance < horizon:
+                    horizon = tick + distance
+        for idx, task in enumerate(self.injection_tasks):
+            if idx not in self.completed_injections and first < task["tick"] <= horizon:
+                horizon = task["tick"] - 1
+        return horizon
+
+    def _advance_window(self, stop_tick) -> bool:
+        """Evaluate every tick up to the lookahead horizon with a single round trip per worker.
+
+        Main-routed transmissions come back tagged with their tick and are replayed through the
+        medium tick by tick, so the outcome matches _advance_tick exactly.
+        """
+        horizon = self._lookahead_horizon(stop_tick)
+        if horizon is None:
+            return False
+        first_tick = self.event_queue.peek_tick()
+
+        node_start_time = time.time()
+        n_w = len(self._workers)
+        w_events: list[list] = [[] for _ in range(n_w)]
+        rounds: dict[int, int] = {}  # tick -> evaluation rounds (a node may reschedule itself for the current tick)
+
+        for tick, node_ids in self.event_queue.pop_events_until(horizon):
+            per_worker: dict[int, tuple[list, list]] = {}  # worker -> (next wake ids, other wake ids)
+            for nid in node_ids:
+                w = self._node_to_worker.get(nid)
+                if w is not None:
+                    next_ids, wake_ids = per_worker.setdefault(w, ([], []))
+                    (next_ids if self.event_queue.next_wake(nid) == tick else wake_ids).append(nid)
+            # Shipped ticks count once a worker processes them; the worker may drop them as superseded
+            if not per_worker:
+                rounds[tick] = 1
+            for w, (next_ids, wake_ids) in per_worker.items():
+                w_events[w].append((tick, next_ids, wake_ids))
+
+        # The horizon stops short of later injections, so every due one applies at the first tick
+        w_injections = [[{**task, "tick": first_tick} for task in tasks] for tasks in self._due_injections(first_tick)]
+        dispatched = {w for w in range(n_w) if w_events[w] or w_injections[w]}
+
+        # Ship every pending delivery of a dispatched worker; it stays in the worker mailbox until consumed
+        w_incoming: list[list] = [[] for _ in range(n_w)]
+        for nid in list(self._pending_incoming):
+            w = self._node_to_worker.get(nid)
+            if w in dispatched:
+                w_incoming[w].append((nid, self._pending_incoming.pop(nid)))
+
+        tasks = {w: (_WORKER_WINDOW, horizon, w_events[w], w_incoming[w], w_injections[w]) for w in dispatched}
+        replay: dict[tuple[int, int], list] = defaultdict(list)  # (tick, round) -> [(transmissions, cancellations, logs)] in worker order
+        for _, (_, processed_ticks, per_tick, deferred, suppressed) in self._gather_in_order(tasks):
+            for tick, count in Counter(processed_ticks).items():
+                rounds[tick] = max(rounds.get(tick, 0), count)
+            for tick, round_, transmissions, cancellations, logs in per_tick:
+                replay[tick, round_].append((transmissions, cancellations, logs))
+            for nid, tick, is_next in deferred:
+                if is_next:
+                    self.event_queue.schedule_next(nid, tick)
+                else:
+                    self.event_queue.add_event(nid, tick)
+            self.event_queue.suppressed_wakeups += suppressed
+
+        self.stats["node_tick_time"] += time.time() - node_start_time
+
+        # Round by round, as _advance_tick evaluates a tick again when a node rescheduled itself for it
+        propagation_start_time = time.time()
+        for tick in sorted(rounds):
+            for round_ in range(1, rounds[tick] + 1):
+                for transmissions, cancellations, logs in replay.get((tick, round_), []):
+                    for tx in transmissions:
+                        self.medium_service.transmit(*tx)
+                        if tx[1] == MediumTypes.LORA_D2D:
+                            self._cross_tx[tx[0]] += 1
+                    for cx in cancellations:
+                        self.medium_service.cancel_transmission(*cx)
+                    if logs:
+                        self.log._buffer.extend(logs)
+                self.medium_service.propagate_mediums(tick)
+                self._collect_pending_receptions()
+        self.stats["propagation_time"] += time.time() - propagation_start_time
+        self.stats["ticks"] += sum(rounds.values())
+
+        if rounds:
+            self._set_current_time(max(rounds))
+        return True
+
+    def _rebalance(self, current_time: int) -> None:
+        """Move nodes off the busiest worker when the load since the last check is too uneven.
+
+        Runs between two advances, when no worker holds in-flight work. Node state travels pickled
+        from the old to the new worker together with its undelivered mailbox.
+        """
+        n_w = len(self._workers)
+        self._next_rebalance = current_time + self.rebalance.interval_ticks
+
+        node_load: dict[int, float] = {}
+        pinned: set[int] = set()
+        for _, reply in self._gather_in_order({w: (_WORKER_STATS, current_time) for w in range(n_w)}):
+            node_load.update(reply["node_time"])
+            pinned |= reply["busy"]
+
+        before = imbalance(worker_loads(self._node_to_worker, node_load, n_w))
+        moves = plan_migration(self._node_to_worker, self._reach_map, node_load, self._cross_tx, pinned, n_w, self.rebalance)
+        self._cross_tx.clear()
+
+        if moves:
+            by_source: dict[int, dict[int, list]] = defaultdict(lambda: defaultdict(list))
+            for nid, dest in sorted(moves.items()):
+                by_source[self._node_to_worker[nid]][dest].append(nid)
+                self._node_to_worker[nid] = dest
+
+            owned: list[set] = [set() for _ in range(n_w)]
+            for nid, w in self._node_to_worker.items():
+                owned[w].add(nid)
+
+            blobs: dict[int, list] = defaultdict(list)
+            exports = {w: (_WORKER_EXPORT, dict(by_dest), frozenset(owned[w])) for w, by_dest in by_source.items()}
+            for _, reply in self._gather_in_order(exports):
+                for dest, blob in reply.items():
+                    blobs[dest].append(blob)
+            imports = {w: (_WORKER_IMPORT, w_blobs, frozenset(owned[w])) for w, w_blobs in blobs.items()}
+            for _ in self._gather_in_order(imports):
+                pass
+
+            if self.lookahead:
+                self._lookahead = BFSTopologyAnalyzer.lookahead_distances(self._device_neighbors, self._reach_map, self._node_to_worker)
+            self.stats["rebalances"] += 1
+            self.stats["migrated_nodes"] += len(moves)
+
+        after = imbalance(worker_loads(self._node_to_worker, node_load, n_w))
+        self.rebalance_report.append((current_time, before, after, len(moves)))
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"Worker load imbalance {before:.2f} -> {after:.2f}, migrated {len(moves)} nodes")
+
+    def checkpoint(self, path: str | Path) -> None:
+        """Write the complete simulation state between two ticks to path, replacing it atomically.
+
+        Every worker pickles its nodes (clocks, RNG and Kalman filter state included) with their
+        undelivered mail and in-flight D2D cancel tracking; main adds its event queue, the pending
+        deliveries and the ongoing transmissions of its media. restore() continues from the file.
+        """
+        if not self._workers_running:
+            raise RuntimeError("Workers have stopped; checkpoint during run_for or after run_for(..., keep_workers=True)")
+        start = time.perf_counter()
+        current_time = self.global_time.get_time()
+        workers = [blob for _, blob in self._gather_in_order({w: (_WORKER_SNAPSHOT,) for w in range(len(self._workers))})]
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "tick": current_time,
+            "previous_tick": self._previous_tick,
+            "node_config": self.node_config,
+            "node_to_worker": self._node_to_worker,
+            "event_queue": self.event_queue,
+            "pending_incoming": dict(self._pending_incoming),
+            "mediums": {medium_type: (medium.ongoing_transmissions, medium.transmit_event_queue, dict(medium.node_receptions)) for medium_type, medium in self.medium_service._mediums_by_type.items()},
+            "completed_injections": self.completed_injections,
+            "cross_tx": self._cross_tx,
+            "next_rebalance": self._next_rebalance,
+            "stats": self.stats,
+            "workers": workers,
+        }
+        staging = Path(f"{path}.tmp")
+        with open(staging, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"Checkpoint {path}: {os.path.getsize(path)} bytes in {time.perf_counter() - start:.2f}s")
+        self.log.flush(force=True)
+
+    def restore(self, path: str | Path) -> None:
+        """Continue from a checkpoint() file instead of the initial state.
+
+        The simulation has to be built for the same map, worker count and event queue; nodes go back
+        to the workers that owned them when the checkpoint was taken. The checkpoint's node
+        parameters replace node_config, as they are part of the pickled nodes.
+        """
+        if not self._workers_running:
+            raise RuntimeError("Workers have stopped; restore before run_for")
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint version {state.get('version')} is not supported, expected {CHECKPOINT_VERSION}")
+        n_w = len(self._workers)
+        if len(state["workers"]) != n_w:
+            raise ValueError(f"Checkpoint was taken with {len(state['workers'])} workers, this simulation has {n_w}")
+        if state["node_to_worker"].keys() != self._node_to_worker.keys():
+            raise ValueError("Checkpoint was taken on a different map")
+        if type(state["event_queue"]) is not type(self.event_queue):
+            raise ValueError(f"Checkpoint uses event queue {type(state['event_queue']).__name__}, this simulation {type(self.event_queue).__name__}")
+        if self.d2d_routing == "peer" and state["node_to_worker"] != self._node_to_worker:
+            raise ValueError("Peer D2D routing links the workers of this simulation's partition, the checkpoint was taken with another one")
+
+        self._node_to_worker = dict(state["node_to_worker"])
+        owned: list[set] = [set() for _ in range(n_w)]
+        for nid, w in self._node_to_worker.items():
+            owned[w].add(nid)
+        for _ in self._gather_in_order({w: (_WORKER_RESTORE, blob, frozenset(owned[w])) for w, blob in enumerate(state["workers"])}):
+            pass
+
+        self.event_queue = state["event_queue"]
+        for medium_type, medium in self.medium_service._mediums_by_type.items():
+            ongoing, queued, receptions = state["mediums"][medium_type]
+            medium.event_queue = self.event_queue
+            medium.ongoing_transmissions = ongoing
+            medium.transmit_event_queue = queued
+            medium.node_receptions.clear()
+            medium.node_receptions.update(receptions)
+        self._pending_incoming = defaultdict(list, state["pending_incoming"])
+        self.completed_injections = state["completed_injections"]
+        self._cross_tx = state["cross_tx"]
+        self.stats.update(state["stats"])
+        self.node_config = state["node_config"]
+        self._previous_tick = state["previous_tick"]
+
+        current_time = state["tick"]
+        self._set_current_time(current_time)
+        if self.rebalance is not None:
+            self._next_rebalance = state["next_rebalance"] or current_time + self.rebalance.interval_ticks
+        if self._next_checkpoint is not None:
+            self._next_checkpoint = current_time + self.checkpoint_interval_ticks
+        if self.lookahead:
+            self._lookahead = BFSTopologyAnalyzer.lookahead_distances(self._device_neighbors, self._reach_map, self._node_to_worker)
+        self.log.add(Severity.DEBUG, Area.SIMULATOR, current_time, f"Restored checkpoint {path} at tick {current_time}")
+
+    def fork(self, log_path: str | Path) -> int:
+        """Fork the main process together with every worker; like os.fork, returns 0 in the copy and its pid here.
+
+        The copy continues from the current tick with its own workers and writes its log to
+        log_path. Node state, queues and topology stay shared between both copy-on-write until one
+        of them changes a page. Call between two run_for calls with keep_workers=True; the copy
+        should end with close() and os._exit.
+        """
+        if not self._workers_running:
+            raise RuntimeError("Workers have stopped; fork after run_for(..., keep_workers=True)")
+        if self.d2d_routing == "peer":
+            raise ValueError("Forking copies the workers but not the peer links between them, use main D2D routing")
+        self.log.flush(force=True)  # or both copies would write the buffered lines
+
+        pipes = [Pipe(duplex=True) for _ in self._workers]
+        for (channel, p), (_, worker_end) in zip(self._workers, pipes):
+            channel.send((_WORKER_FORK,))
+            send_handle(channel.conn, worker_end.fileno(), p.pid)
+        worker_pids = [channel.recv()["forked"] for channel, _ in self._workers]
+        for _, worker_end in pipes:
+            worker_end.close()
+
+        gc.freeze()
+        pid = os.fork()
+        if pid != 0:
+            gc.unfreeze()
+            for main_end, _ in pipes:
+                main_end.close()
+            return pid
+
+        # The copy talks to the copied workers over plain pipes; the original workers, their
+        # channels and the shared topology file stay with the parent
+        for channel, _ in self._workers:
+            channel.conn.close()
+        self._workers = [(PipeChannel(main_end), _ForkedWorker(worker_pid)) for (main_end, _), worker_pid in zip(pipes, worker_pids)]
+        self._shared_topology = None
+        self.log = SimpleLogger(log_path=str(log_path), buffer_size=self.log.buffer_size, min_severity=self.log.min_severity)
+        for medium in self.medium_service._mediums_by_type.values():
+            medium.log = self.log
+        return 0
+
+    def reconfigure_batteries(self, battery_capacity_joule: float | None = None, battery_recharge_rate_joule_per_second: float | None = None) -> None:
+        """Change the battery constants of every node from its next evaluation on."""
+        changes = {"battery_capacity_joule": battery_capacity_joule, "battery_recharge_rate_joule_per_second": battery_recharge_rate_joule_per_second}
+        self.node_config = replace(self.node_config, **{key: value for key, value in changes.items() if value is not None})
+        task = (_WORKER_BATTERY, self.node_config.battery_capacity_joule, self.node_config.battery_recharge_rate_joule_per_second)
+        for _ in self._gather_in_order({w: task for w in range(len(self._workers))}):
+            pass
+
+    def close(self) -> None:
+        """Stop the workers after run_for(..., keep_workers=True)."""
+        self._stop_workers()
+
     def _stop_workers(self) -> None:
-        for conn, _ in self._workers:
+        if not self._workers_running:
+            return
+        self._workers_running = False
+        for channel, _ in self._workers:
             try:
-                conn.send(_WORKER_STOP)
+                channel.send(_WORKER_STOP)
             except Exception:
                 pass
-        for conn, p in self._workers:
+        for channel, p in self._workers:
             p.join(timeout=3)
             if p.is_alive():
                 p.terminate()
             try:
-                conn.close()
+                channel.close()
             except Exception:
                 pass
+        if self._shared_topology is not None:
+            self._shared_topology.close()
 
     def run(self):
         self.run_for(float("inf"))
@@ -513,7 +1316,7 @@ class Simulation:
 
 
 class Engine:
-    def __init__(self, log_lines=100, log_path="profile-results.log", injection_tasks=None, device_neighbors=None, topology_json_path=None):
+    def __init__(self, log_lines=100, log_path="profile-results.log", injection_tasks=None, device_neighbors=None, topology_json_path=None, lookahead=False, transport="pipe", event_queue="sorted", rebalance: RebalancePolicy | None = None, partitioner="bfs", topology_cache_dir: str | Path | None = None, worker_topology="slice", dispatch="barrier", d2d_routing="main", node_config: NodeConfig = NodeConfig()):
         self.log: ILogger = SimpleLogger(log_path=log_path, buffer_size=100_000)
         self.status = Value(c_int, SimState.PAUSED.value)
         self.tps_from_sim = Value(c_int, 0)
@@ -525,10 +1328,23 @@ class Engine:
         self.log_lines = log_lines
         self._run_ticks = None
         self.injection_tasks = injection_tasks or []
+        self.lookahead = lookahead
+        self.transport = transport
+        self.event_queue = event_queue
+        self.rebalance = rebalance
+        self.partitioner = partitioner
+        self.worker_topology = worker_topology
+        self.dispatch = dispatch
+        self.d2d_routing = d2d_routing
+        self.node_config = node_config
 
         # Load topology from JSON if provided, otherwise use device_neighbors
+        # With a cache dir, the table, reach map and partition of an unchanged file come from disk
+        self.topology_cache = None
         if topology_json_path:
-            self.device_neighbors = NetworkTopologyLoader.from_file(topology_json_path)
+            if topology_cache_dir is not None:
+                self.topology_cache = TopologyCache(topology_cache_dir).entry(topology_json_path, NetworkTopologyLoader.LORA_WAN_RADIUS_M)
+            self.device_neighbors = NetworkTopologyLoader.from_file(topology_json_path, cache=self.topology_cache)
             # print(self.device_neighbors)
             # exit()
         else:
@@ -538,8 +1354,8 @@ class Engine:
         self._log_buffer = deque(maxlen=GUI_LOG_DISPLAY_LINES * 3)
         self.log_path = log_path
 
-    def _simulation_entry(self, log_path: str, status, lock, tps_value, log_queue, log_lines, current_tick_value, run_ticks=None, injection_tasks=None, device_neighbors=None):
-        sim = Simulation(log_path=log_path, status=status, lock=lock, tps_value=tps_value, log_queue=log_queue, log_lines=log_lines, current_tick_value=current_tick_value, injection_tasks=injection_tasks, device_neighbors=device_neighbors)
+    def _simulation_entry(self, log_path: str, status, lock, tps_value, log_queue, log_lines, current_tick_value, run_ticks=None, injection_tasks=None, device_neighbors=None, lookahead=False, transport="pipe", event_queue="sorted", rebalance=None, partitioner="bfs", topology_cache=None, worker_topology="slice", dispatch="barrier", d2d_routing="main", node_config=NodeConfig()):
+        sim = Simulation(log_path=log_path, status=status, lock=lock, tps_value=tps_value, log_queue=log_queue, log_lines=log_lines, current_tick_value=current_tick_value, injection_tasks=injection_tasks, device_neighbors=device_neighbors, lookahead=lookahead, transport=transport, event_queue=event_queue, rebalance=rebalance, partitioner=partitioner, topology_cache=topology_cache, worker_topology=worker_topology, dispatch=dispatch, d2d_routing=d2d_routing, node_config=node_config)
         if run_ticks is not None:
             sim.run_for(run_ticks)
         else:
@@ -578,7 +1394,7 @@ class Engine:
         self.log.add(Severity.INFO, Area.SIMULATOR, global_time.get_time(), "Engine started", data=None)
         self._run_ticks = run_ticks
         if self.sim_process is None or not self.sim_process.is_alive():
-            self.sim_process = Process(target=self._simulation_entry, args=(self.log_path, self.status, self.lock, self.tps_from_sim, self.log_queue, self.log_lines, self.current_tick, self._run_ticks, self.injection_tasks, self.device_neighbors))
+            self.sim_process = Process(target=self._simulation_entry, args=(self.log_path, self.status, self.lock, self.tps_from_sim, self.log_queue, self.log_lines, self.current_tick, self._run_ticks, self.injection_tasks, self.device_neighbors, self.lookahead, self.transport, self.event_queue, self.rebalance, self.partitioner, self.topology_cache, self.worker_topology, self.dispatch, self.d2d_routing, self.node_config))
             self.sim_process.start()
 
     def run_for(self, ticks):
@@ -0,0 +1,328 @@
+"""Multilevel k-way partitioning of the D2D reach graph for worker assignment."""
+
+import heapq
+import random
+from collections import defaultdict, deque
+
+import numpy as np
+
+from .bfs_topology_analyzer import BFSTopologyAnalyzer
+
+_COARSEST_PER_CLUSTER = 15  # stop coarsening at about this many coarse nodes per cluster
+_MIN_SHRINK = 0.9  # ... or once a level removes less than 10 % of the nodes, even with unmatched nodes paired
+_REFINE_PASSES = 8
+_IMBALANCE = 1.05  # allowed heaviest cluster weight over the mean
+_FM_PATIENCE = 50  # moves without a new best prefix before a refinement pass gives up
+_TRIES = 4  # randomised V-cycles, the smallest cut wins
+
+
+def expected_activity(node_neighbors: dict, reach_map: dict) -> dict[int, float]:
+    """Relative work per regular node, estimated from the topology before any run.
+
+    A node pays for its own schedule, for every D2D sender that reaches it and for relaying uplink
+    traffic: each hop layer towards the gateways carries everything behind it, shared evenly over
+    the nodes of that layer. Nodes without a gateway path only pay for the first two.
+    """
+    in_degree: dict[int, int] = defaultdict(int)
+    for receivers in reach_map.values():
+        for recv_id, _ in receivers:
+            in_degree[recv_id] += 1
+
+    hops: dict[int, int] = {}
+    queue: deque = deque()
+    for nid, info in node_neighbors.items():
+        if not info.is_gateway and info.gateways_in_range:
+            hops[nid] = 0
+            queue.append(nid)
+    while queue:
+        nid = queue.popleft()
+        for nb in node_neighbors[nid].neighbors:
+            if nb not in hops and nb in reach_map:
+                hops[nb] = hops[nid] + 1
+                queue.append(nb)
+
+    layer_sizes: dict[int, int] = defaultdict(int)
+    for hop in hops.values():
+        layer_sizes[hop] += 1
+    behind = {}
+    farther = 0
+    for hop in sorted(layer_sizes, reverse=True):
+        behind[hop] = farther
+        farther += layer_sizes[hop]
+
+    return {nid: 1.0 + in_degree[nid] + (behind[hops[nid]] / layer_sizes[hops[nid]] if nid in hops else 0.0) for nid in reach_map}
+
+
+def reach_graph(reach_map: dict, node_weights: dict[int, float]) -> dict[int, dict[int, float]]:
+    """Undirected cut cost between nodes: the activity of each endpoint whose transmissions reach the other."""
+    graph: dict[int, dict[int, float]] = {nid: {} for nid in reach_map}
+    for sender, receivers in reach_map.items():
+        weight = node_weights.get(sender, 1.0)
+        for recv_id, _ in receivers:
+            if recv_id == sender or recv_id not in graph:
+                continue
+            graph[sender][recv_id] = graph[sender].get(recv_id, 0.0) + weight
+            graph[recv_id][sender] = graph[recv_id].get(sender, 0.0) + weight
+    return graph
+
+
+def _coarsen(graph: dict, weights: dict, max_weight: float, rng: random.Random, pair_unmatched: bool = False) -> tuple[dict, dict, dict]:
+    """One level of heavy-edge matching. Returns (coarse graph, coarse weights, fine -> coarse node).
+
+    pair_unmatched also pairs the nodes heavy-edge matching left alone with each other, lightest
+    first, so isolated nodes and the leaves of a hub still coarsen.
+    """
+    order = list(graph)
+    rng.shuffle(order)
+    match: dict = {}
+    for u in order:
+        if u in match:
+            continue
+        best, best_score = u, 0.0
+        for v, w in graph[u].items():
+            combined = weights[u] + weights[v]
+            # Normalised by size so coarse nodes stay comparable and the initial split can balance them
+            if v not in match and combined <= max_weight and w / combined > best_score:
+                best, best_score = v, w / combined
+        match[u] = best
+        match[best] = u
+    if pair_unmatched:
+        single = sorted((u for u in order if match[u] == u), key=lambda u: (weights[u], u))
+        for u, v in zip(single[::2], single[1::2]):
+            if weights[u] + weights[v] <= max_weight:
+                match[u], match[v] = v, u
+
+    coarse_of: dict = {}
+    n_coarse = 0
+    for u in order:
+        if u not in coarse_of:
+            coarse_of[u] = coarse_of[match[u]] = n_coarse
+            n_coarse += 1
+
+    coarse_weights: dict[int, float] = defaultdict(float)
+    coarse_graph: dict[int, dict[int, float]] = {c: {} for c in range(n_coarse)}
+    for u, nbrs in graph.items():
+        cu = coarse_of[u]
+        coarse_weights[cu] += weights[u]
+        for v, w in nbrs.items():
+            cv = coarse_of[v]
+            if cu != cv:
+                coarse_graph[cu][cv] = coarse_graph[cu].get(cv, 0.0) + w
+    return coarse_graph, dict(coarse_weights), coarse_of
+
+
+def _fiedler_order(nodes: list, graph: dict) -> list:
+    """Nodes sorted along the eigenvector of the second smallest Laplacian eigenvalue."""
+    if len(nodes) < 3:
+        return nodes
+    index = {u: i for i, u in enumerate(nodes)}
+    laplacian = np.zeros((len(nodes), len(nodes)))
+    for u in nodes:
+        i = index[u]
+        for v, w in graph[u].items():
+            j = index.get(v)
+            if j is not None:
+                laplacian[i, j] -= w
+                laplacian[i, i] += w
+    _, vectors = np.linalg.eigh(laplacian)
+    fiedler = vectors[:, 1]
+    return sorted(nodes, key=lambda u: (fiedler[index[u]], u))
+
+
+def _bisect(nodes: list, graph: dict, weights: dict, n_clusters: int, first: int, part: dict) -> None:
+    """Recursive spectral bisection into clusters first .. first + n_clusters - 1, split by target weight."""
+    if n_clusters == 1 or len(nodes) <= 1:
+        for u in nodes:
+            part[u] = first
+        return
+    n_left = n_clusters // 2
+    target = sum(weights[u] for u in nodes) * n_left / n_clusters
+    order = _fiedler_order(nodes, graph)
+    acc, split = 0.0, 0
+    while split < len(order) - 1 and (split == 0 or acc + weights[order[split]] / 2 <= target):
+        acc += weights[order[split]]
+        split += 1
+    _bisect(order[:split], graph, weights, n_left, first, part)
+    _bisect(order[split:], graph, weights, n_clusters - n_left, first + n_left, part)
+
+
+def _refine(graph: dict, weights: dict, part: dict, n_clusters: int, max_weight: float) -> None:
+    """Kernighan-Lin / Fiduccia-Mattheyses boundary refinement with a balance constraint.
+
+    Each pass moves every boundary node at most once, always the move with the largest cut gain
+    that keeps the target cluster under max_weight, negative gains included so the pass can climb
+    out of local minima. The pass is then rolled back to its best prefix: least overweight first,
+    then smallest cut.
+    """
+    loads = [0.0] * n_clusters
+    sizes = [0] * n_clusters
+    for u, p in part.items():
+        loads[p] += weights[u]
+        sizes[p] += 1
+
+    def best_move(u) -> tuple[float, int] | None:
+        p = part[u]
+        connection: dict[int, float] = defaultdict(float)
+        for v, w in graph[u].items():
+            connection[part[v]] += w
+        internal = connection.get(p, 0.0)
+        best = None
+        for q, external in connection.items():
+            if q != p and loads[q] + weights[u] <= max_weight:
+                key = (external - internal, -loads[q], -q)
+                if best is None or key > best:
+                    best = key
+        return None if best is None else (best[0], -best[2])
+
+    def overweight() -> float:
+        return sum(load - max_weight for load in loads if load > max_weight)
+
+    for _ in range(_REFINE_PASSES):
+        heap = []
+        for u in graph:
+            move = best_move(u)
+            if move is not None:
+                heapq.heappush(heap, (-move[0], u))
+
+        locked: set = set()
+        moves: list[tuple] = []  # (node, from cluster)
+        gain_sum = 0.0
+        best_key, best_len = (-overweight(), 0.0), 0
+        while heap and len(moves) - best_len < _FM_PATIENCE:
+            neg_gain, u = heapq.heappop(heap)
+            if u in locked:
+                continue
+            move = best_move(u)
+            if move is None:
+                continue
+            if move[0] != -neg_gain:
+                heapq.heappush(heap, (-move[0], u))
+                continue
+            p = part[u]
+            if sizes[p] == 1:
+                continue
+            gain, q = move
+            part[u] = q
+            loads[p] -= weights[u]
+            loads[q] += weights[u]
+            sizes[p] -= 1
+            sizes[q] += 1
+            locked.add(u)
+            moves.append((u, p))
+            gain_sum += gain
+            key = (-overweight(), gain_sum)
+            if key > best_key:
+                best_key, best_len = key, len(moves)
+            for v in graph[u]:
+                if v not in locked:
+                    move = best_move(v)
+                    if move is not None:
+                        heapq.heappush(heap, (-move[0], v))
+
+        for u, p in reversed(moves[best_len:]):
+            q = part[u]
+            part[u] = p
+            loads[q] -= weights[u]
+            loads[p] += weights[u]
+            sizes[q] -= 1
+            sizes[p] += 1
+        if best_len == 0:
+            return
+
+
+def _cut(graph: dict, part: dict) -> float:
+    return sum(w for u, nbrs in graph.items() for v, w in nbrs.items() if part[u] != part[v]) / 2
+
+
+def _v_cycle(graph: dict, weights: dict, n_clusters: int, rng: random.Random) -> dict:
+    """Coarsen, split the coarsest level and refine every level on the way back up."""
+    total = sum(weights.values())
+    levels = []  # (graph, weights, fine -> coarse) from the finest level down
+    coarse_graph, coarse_weights = graph, weights
+    max_coarse_weight = total / (n_clusters * _COARSEST_PER_CLUSTER) * 1.5
+    while len(coarse_graph) > n_clusters * _COARSEST_PER_CLUSTER:
+        next_graph, next_weights, coarse_of = _coarsen(coarse_graph, coarse_weights, max_coarse_weight, rng)
+        if len(next_graph) > _MIN_SHRINK * len(coarse_graph):
+            # Stalled on isolated nodes or a hub's leaves: the dense spectral split must not see them all
+            next_graph, next_weights, coarse_of = _coarsen(coarse_graph, coarse_weights, max_coarse_weight, rng, pair_unmatched=True)
+            if len(next_graph) > _MIN_SHRINK * len(coarse_graph):
+                break
+        levels.append((coarse_graph, coarse_weights, coarse_of))
+        coarse_graph, coarse_weights = next_graph, next_weights
+
+    part: dict = {}
+    _bisect(sorted(coarse_graph), coarse_graph, coarse_weights, n_clusters, 0, part)
+    _refine(coarse_graph, coarse_weights, part, n_clusters, max(_IMBALANCE * total / n_clusters, total / n_clusters + max(coarse_weights.values())))
+
+    for fine_graph, fine_weights, coarse_of in reversed(levels):
+        part = {u: part[c] for u, c in coarse_of.items()}
+        _refine(fine_graph, fine_weights, part, n_clusters, max(_IMBALANCE * total / n_clusters, total / n_clusters + max(fine_weights.values())))
+    return part
+
+
+def multilevel_partition(node_neighbors: dict, reach_map: dict, n_clusters: int, node_weights: dict[int, float] | None = None, seed: int = 0) -> dict[int, int]:
+    """Partition nodes into n_clusters clusters with a small reach-map edge cut and balanced activity.
+
+    Coarsens the reach graph by heavy-edge matching, splits the coarsest graph by recursive spectral
+    (Fiedler) bisection and refines the projection on every level on the way back. Edges are weighted
+    by the sender's expected activity, so busy links stay inside a cluster first. The best of a few
+    randomised V-cycles is kept.
+
+    Returns {node_id: cluster_id}. Gateways join the cluster owning most of their served nodes.
+    """
+    if n_clusters <= 1:
+        return {nid: 0 for nid in node_neighbors}
+    if node_weights is None:
+        node_weights = expected_activity(node_neighbors, reach_map)
+    weights = {nid: node_weights.get(nid, 1.0) for nid in reach_map}
+    if not weights:
+        return {nid: 0 for nid in node_neighbors}
+    graph = reach_graph(reach_map, weights)
+
+    rng = random.Random(seed)
+    part = min((_v_cycle(graph, weights, n_clusters, rng) for _ in range(_TRIES)), key=lambda p: _cut(graph, p))
+
+    node_to_cluster = dict(part)
+    for gw_id, gw_info in node_neighbors.items():
+        if gw_info.is_gateway:
+            votes: dict[int, int] = {}
+            for nb in gw_info.neighbors:
+                cid = node_to_cluster.get(nb)
+                if cid is not None:
+                    votes[cid] = votes.get(cid, 0) + 1
+            node_to_cluster[gw_id] = max(votes, key=votes.get) if votes else 0
+    return node_to_cluster
+
+
+def bfs_partition(node_neighbors: dict, reach_map: dict, n_clusters: int, node_weights: dict[int, float] | None = None) -> dict[int, int]:
+    """BFSTopologyAnalyzer.cluster_partition behind the PARTITIONERS signature; ignores edges and weights."""
+    return BFSTopologyAnalyzer.cluster_partition(node_neighbors, n_clusters)
+
+
+def partition_quality(reach_map: dict, node_to_cluster: dict[int, int], node_weights: dict[int, float]) -> dict:
+    """Edge cut and balance of a worker assignment.
+
+    edge_cut:      (sender, receiver) reach-map pairs split over two clusters
+    cross_senders: senders whose D2D transmissions are forwarded to the main process
+    balance:       heaviest cluster's expected activity over the mean
+    """
+    edge_cut = reach_edges = 0
+    cross_senders = set()
+    for sender, receivers in reach_map.items():
+        cid = node_to_cluster.get(sender)
+        for recv_id, _ in receivers:
+            reach_edges += 1
+            if node_to_cluster.get(recv_id) != cid:
+                edge_cut += 1
+                cross_senders.add(sender)
+
+    loads: dict[int, float] = defaultdict(float)
+    for nid, cid in node_to_cluster.items():
+        loads[cid] += node_weights.get(nid, 0.0)
+    n_clusters = max(node_to_cluster.values(), default=0) + 1
+    mean = sum(loads.values()) / n_clusters
+    balance = max(loads.values()) / mean if mean > 0 else 1.0
+    return {"edge_cut": edge_cut, "reach_edges": reach_edges, "cross_senders": len(cross_senders), "balance": balance}
+
+
+PARTITIONERS = {"bfs": bfs_partition, "multilevel": multilevel_partition}
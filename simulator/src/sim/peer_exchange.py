@@ -0,0 +1,136 @@
+"""Worker-to-worker links for cross-cluster D2D receptions.
+
+With ``d2d_routing="peer"`` a worker propagates its own cross-cluster D2D transmissions and sends
+the resulting receptions straight to the workers owning the receivers, over one one-way Pipe per
+pair of workers that share a reach-map edge. The main process then only runs the global tick
+barrier (and LoRaWAN): it learns when receivers have to wake, never what they receive.
+
+Every batch is tagged with the barrier it was produced in. A worker delivers the batches of all
+earlier barriers before it ticks, ordered by barrier and then by sending worker, which is the order
+in which the main-side medium would have delivered them.
+"""
+
+import threading
+from collections import defaultdict
+from collections.abc import Mapping
+from multiprocessing import Pipe
+from multiprocessing.connection import wait as mp_wait
+from queue import SimpleQueue
+
+D2D_ROUTINGS = ("main", "peer")
+
+
+def peer_links(reach_map: Mapping, node_to_worker: dict[int, int], n_workers: int) -> tuple[list[tuple], list]:
+    """Pipes for every ordered worker pair (v, w) where a sender owned by v reaches a node owned by w.
+
+    Returns per worker (owner, outgoing, incoming) — owner maps the halo receivers of its senders
+    to their worker, outgoing/incoming map the peer worker to the Connection — and the list of all
+    connections, which main closes once the workers have their copies.
+    """
+    owners: list[dict[int, int]] = [{} for _ in range(n_workers)]
+    for sender, receivers in reach_map.items():
+        v = node_to_worker.get(sender)
+        if v is None:
+            continue
+        for recv_id, _ in receivers:
+            w = node_to_worker.get(recv_id)
+            if w is not None and w != v:
+                owners[v][recv_id] = w
+
+    outgoing: list[dict] = [{} for _ in range(n_workers)]
+    incoming: list[dict] = [{} for _ in range(n_workers)]
+    connections = []
+    for v in range(n_workers):
+        for w in sorted(set(owners[v].values())):
+            recv_conn, send_conn = Pipe(duplex=False)
+            outgoing[v][w] = send_conn
+            incoming[w][v] = recv_conn
+            connections += [recv_conn, send_conn]
+    return [(owners[w], outgoing[w], incoming[w]) for w in range(n_workers)], connections
+
+
+def split_by_worker(receptions: list, worker_id: int, owned_nodes: frozenset, owner: dict[int, int]) -> dict[int, list]:
+    """Group (receiver_id, EventNet) pairs by the worker owning the receiver, keeping their order."""
+    outbox: dict[int, list] = defaultdict(list)
+    for recv_id, event in receptions:
+        outbox[worker_id if recv_id in owned_nodes else owner[recv_id]].append((recv_id, event))
+    return outbox
+
+
+class PeerExchange:
+    """Worker end of the peer links.
+
+    Sends go through a background thread while the worker keeps reading its own incoming links, and
+    an idle worker reads them while it waits for the next task: two workers sending each other more
+    than a pipe buffer at the same time therefore never block each other.
+    """
+
+    def __init__(self, worker_id: int, owner: dict[int, int], outgoing: dict, incoming: dict):
+        self.worker_id = worker_id
+        self.owner = owner
+        self._outgoing = outgoing
+        self._sources = {conn: src for src, conn in incoming.items()}
+        self._buffered: list[tuple] = []  # (barrier, source worker, [(receiver_id, EventNet)])
+        self._jobs: SimpleQueue = SimpleQueue()
+        self._done_recv, self._done_send = Pipe(duplex=False)
+        self._sender: threading.Thread | None = None
+
+    def _send_loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            for conn, message in job:
+                conn.send(message)
+            self._done_send.send_bytes(b"")
+
+    def _read_until(self, conn) -> None:
+        """Buffer incoming peer batches until conn is readable."""
+        while True:
+            ready = mp_wait([conn, *self._sources])
+            for peer in ready:
+                if peer is not conn:
+                    self._read(peer)
+            if conn in ready:
+                return
+
+    def _read(self, peer) -> None:
+        try:
+            self._buffered.append(peer.recv())
+        except EOFError:
+            # The peer has stopped; it cannot have anything left for a later barrier
+            del self._sources[peer]
+
+    def exchange(self, barrier: int, outbox: dict[int, list]) -> None:
+        """Hand every peer its receptions of this barrier; returns once they are all in the pipes."""
+        job = []
+        for dest, receptions in outbox.items():
+            if dest == self.worker_id:
+                self._buffered.append((barrier, dest, receptions))
+            else:
+                job.append((self._outgoing[dest], (barrier, self.worker_id, receptions)))
+        if not job:
+            return
+        if self._sender is None:
+            self._sender = threading.Thread(target=self._send_loop, daemon=True)
+            self._sender.start()
+        self._jobs.put(job)
+        self._read_until(self._done_recv)
+        self._done_recv.recv_bytes()
+
+    def recv(self, channel):
+        """Next task from main, reading the peer links meanwhile."""
+        self._read_until(channel.conn)
+        return channel.recv()
+
+    def drain(self, barrier: int) -> list:
+        """Receptions of every barrier before this one, in barrier and then sending worker order.
+
+        Peers finish their sends before they reply to main, so everything of an earlier barrier is
+        already readable once main has handed out the next one.
+        """
+        for peer in list(self._sources):
+            while peer in self._sources and peer.poll():
+                self._read(peer)
+        due = sorted((batch for batch in self._buffered if batch[0] < barrier), key=lambda batch: batch[:2])
+        if due:
+            self._buffered = [batch for batch in self._buffered if batch[0] >= barrier]
+        return [entry for _, _, receptions in due for entry in receptions]
@@ -0,0 +1,130 @@
+import io
+import pickle
+from dataclasses import dataclass
+
+_MEDIUM_ID = "medium"
+_LOG_ID = "log"
+
+
+@dataclass(frozen=True)
+class RebalancePolicy:
+    """When and how far the engine may move nodes between workers at runtime.
+
+    interval_ticks:      simulated ticks between load checks
+    imbalance_threshold: busiest worker load / mean worker load that triggers a migration
+    max_moves:           nodes migrated per check at most
+    """
+
+    interval_ticks: int = 600_000
+    imbalance_threshold: float = 1.25
+    max_moves: int = 32
+
+
+def imbalance(loads: list[float]) -> float:
+    """Busiest worker load over the mean load; 1.0 is perfectly balanced."""
+    mean = sum(loads) / len(loads) if loads else 0.0
+    return max(loads) / mean if mean > 0 else 1.0
+
+
+def worker_loads(node_to_worker: dict[int, int], node_load: dict[int, float], n_workers: int) -> list[float]:
+    loads = [0.0] * n_workers
+    for nid, load in node_load.items():
+        w = node_to_worker.get(nid)
+        if w is not None:
+            loads[w] += load
+    return loads
+
+
+def plan_migration(node_to_worker: dict[int, int], reach_map: dict, node_load: dict[int, float], cross_tx: dict[int, int], pinned: set[int], n_workers: int, policy: RebalancePolicy) -> dict[int, int]:
+    """Greedy boundary moves from the busiest worker to a lighter neighbouring worker.
+
+    Only nodes with a D2D receiver in the destination are candidates, so clusters stay connected.
+    Among the moves that lower the busiest load, the one that removes the most cross-cluster links
+    wins, weighted by how often the node sent cross-cluster D2D frames. Nodes in pinned (ongoing
+    intra-cluster transmissions) stay put.
+
+    Returns {node_id: new_worker}; empty when the imbalance is below the policy threshold.
+    """
+    loads = worker_loads(node_to_worker, node_load, n_workers)
+    mean = sum(loads) / n_workers
+    if mean <= 0 or max(loads) <= policy.imbalance_threshold * mean:
+        return {}
+
+    owner = dict(node_to_worker)
+    moves: dict[int, int] = {}
+    while len(moves) < policy.max_moves:
+        heavy = max(range(n_workers), key=loads.__getitem__)
+        if loads[heavy] <= policy.imbalance_threshold * mean:
+            break
+
+        best = None  # (score, node_id, destination)
+        for nid, w in owner.items():
+            if w != heavy or nid in pinned or nid in moves:
+                continue
+            load = node_load.get(nid, 0.0)
+            links: dict[int, int] = {}
+            for recv_id, _ in reach_map.get(nid, ()):
+                links[owner.get(recv_id, w)] = links.get(owner.get(recv_id, w), 0) + 1
+            for dest, n_links in links.items():
+                if dest == heavy or loads[dest] + load >= loads[heavy]:
+                    continue
+                score = ((n_links - links.get(heavy, 0)) * (1 + cross_tx.get(nid, 0)), -loads[dest], -nid)
+                if best is None or score > best[0]:
+                    best = (score, nid, dest)
+        if best is None:
+            break
+
+        _, nid, dest = best
+        load = node_load.get(nid, 0.0)
+        loads[heavy] -= load
+        loads[dest] += load
+        owner[nid] = dest
+        moves[nid] = dest
+    return moves
+
+
+class _NodePickler(pickle.Pickler):
+    """Pickles node state without the worker-local medium proxy and logger it points to."""
+
+    def __init__(self, file, medium, log):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._medium, self._log = medium, log
+
+    def persistent_id(self, obj):
+        if obj is self._medium:
+            return _MEDIUM_ID
+        if obj is self._log:
+            return _LOG_ID
+        return None
+
+
+class _NodeUnpickler(pickle.Unpickler):
+    def __init__(self, file, medium, log):
+        super().__init__(file)
+        self._objects = {_MEDIUM_ID: medium, _LOG_ID: log}
+
+    def persistent_load(self, pid):
+        return self._objects[pid]
+
+
+def export_nodes(nodes: dict, medium, log, node_ids: list[int]) -> bytes:
+    """Remove node_ids from a worker and pickle them together with their mailbox and in-flight D2D state."""
+    state = [(nid, nodes.pop(nid), medium.export_node(nid)) for nid in node_ids if nid in nodes]
+    buf = io.BytesIO()
+    _NodePickler(buf, medium, log).dump(state)
+    return buf.getvalue()
+
+
+def snapshot_nodes(nodes: dict, medium, log) -> bytes:
+    """Pickle every node of a worker like export_nodes does, but leave the worker as it is."""
+    state = [(nid, node, medium.node_state(nid)) for nid, node in nodes.items()]
+    buf = io.BytesIO()
+    _NodePickler(buf, medium, log).dump(state)
+    return buf.getvalue()
+
+
+def import_nodes(nodes: dict, medium, log, blob: bytes) -> None:
+    """Adopt nodes exported by another worker, rebinding them to this worker's medium proxy and logger."""
+    for nid, node, medium_state in _NodeUnpickler(io.BytesIO(blob), medium, log).load():
+        nodes[nid] = node
+        medium.import_node(nid, medium_state)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from medium.reach_map import ReachCSR, ReachMapView
+
+from .topology_table import TopologyTable
+
+WORKER_TOPOLOGIES = ("slice", "shared")
+
+_ALIGN = 64
+_SHM_DIR = "/dev/shm"  # RAM-backed on Linux; elsewhere the OS page cache does the sharing
+_REACH_ARRAYS = ("node_ids", "indptr", "receivers", "rssi")
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class SharedTopology:
+    """Immutable TopologyTable and reach map, written once to one memory-mapped file.
+
+    Pickling only carries the file name and array layout: a worker unpickling it maps the same
+    pages read-only, so start-up work in main does not grow with the number of workers. The
+    publishing process removes the file in close(); mappings already made stay valid.
+    """
+
+    def __init__(self, path: str, layout: dict[str, tuple[str, tuple, int]], owner: bool):
+        self.path = path
+        self._layout = layout
+        self._owner = owner
+        self._finalizer = weakref.finalize(self, _unlink, path) if owner else None
+
+    @classmethod
+    def publish(cls, table: TopologyTable, reach: ReachCSR) -> "SharedTopology":
+        arrays = {f"table.{key}": value for key, value in table.arrays().items()}
+        arrays.update({f"reach.{key}": getattr(reach, key) for key in _REACH_ARRAYS})
+
+        layout, offset = {}, 0
+        for key, value in arrays.items():
+            value = np.ascontiguousarray(value)
+            arrays[key] = value
+            layout[key] = (value.dtype.str, value.shape, offset)
+            offset += -(-value.nbytes // _ALIGN) * _ALIGN
+
+        for directory in (_SHM_DIR, None) if os.path.isdir(_SHM_DIR) else (None,):
+            fd, path = tempfile.mkstemp(prefix="sim-topology-", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for key, value in arrays.items():
+                        f.seek(layout[key][2])
+                        f.write(value.tobytes())
+                    f.truncate(max(offset, 1))
+                return cls(path, layout, owner=True)
+            except OSError:
+                # /dev/shm is often small in containers, fall back to the regular temp directory
+                _unlink(path)
+                if directory is None:
+                    raise
+
+    def _array(self, key: str) -> np.ndarray:
+        dtype, shape, offset = self._layout[key]
+        if not np.prod(shape):
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    def table(self) -> TopologyTable:
+        return TopologyTable(**{key: self._array(f"table.{key}") for key in TopologyTable.ARRAYS})
+
+    def reach_map(self) -> ReachMapView:
+        return ReachMapView(ReachCSR(**{key: self._array(f"reach.{key}") for key in _REACH_ARRAYS}))
+
+    def __reduce__(self):
+        return SharedTopology, (self.path, self._layout, False)
+
+    def close(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer()
@@ -0,0 +1,211 @@
+"""Headless parameter sweeps: many runs of one or more maps, spread over a process pool.
+
+A sweep file is JSON. Its top-level keys are the base configuration of every run; "grid" maps keys
+to value lists that are combined into every permutation, and "runs" is an explicit list of
+overrides. With both, every listed run is combined with every grid point:
+
+    {
+        "map": "maps/y.json",
+        "ticks": 3600000,
+        "grid": {"seed": [0, 1, 2], "slot_count": [12, 18]},
+        "runs": [{"battery_recharge_rate_joule_per_second": 0.0054}, {"battery_recharge_rate_joule_per_second": 0.003}]
+    }
+
+Keys are the run options in RUN_DEFAULTS or NodeConfig fields. Each run writes config.json,
+simulation.log and, once it has finished, result.json into its own folder under the output
+directory; a run whose result.json exists is skipped, so an interrupted sweep picks up where it
+stopped. summary.csv gets one row per finished run.
+
+"restore" starts a run from a Simulation.checkpoint file instead of tick 0, so many runs can fork
+from one warmed-up state. Its nodes were pickled with their parameters, so the run's node
+parameters have to match the checkpoint's.
+
+All runs of a map share its topology cache entry: the table and reach map are built once, before
+the pool starts, and every run maps them from disk.
+
+Run from the simulator folder:
+    uv run python -m sim.sweep sweep.json --out results/sweep --jobs 8
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ctypes import c_int
+from dataclasses import asdict, fields
+from multiprocessing import Value
+from pathlib import Path
+
+from custom_types import NodeConfig, SimState
+
+from .engine import NetworkTopologyLoader, Simulation
+from .topology_cache import DEFAULT_CACHE_DIR, TopologyCache
+
+RUN_DEFAULTS = {"map": "maps/y.json", "ticks": 3_600_000, "n_workers": 1, "partitioner": "bfs", "event_queue": "sorted", "restore": None}
+NODE_KEYS = tuple(f.name for f in fields(NodeConfig))
+
+_CONFIG = "config.json"
+_RESULT = "result.json"
+_LOG = "simulation.log"
+_SUMMARY = "summary.csv"
+_SEVERITY = re.compile(r"^\[(\w+)\]")
+
+
+def expand_runs(spec: dict) -> list[dict]:
+    """Full configuration of every run in a sweep file, grid points in file order."""
+    base = {key: value for key, value in spec.items() if key not in ("grid", "runs")}
+    grid = spec.get("grid", {})
+    overrides = spec.get("runs", [{}])
+    points = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+    runs = []
+    for override in overrides:
+        for point in points:
+            config = {**RUN_DEFAULTS, **asdict(NodeConfig()), **base, **override, **point}
+            unknown = config.keys() - RUN_DEFAULTS.keys() - set(NODE_KEYS)
+            if unknown:
+                raise ValueError(f"Unknown sweep keys {sorted(unknown)}, expected run options {tuple(RUN_DEFAULTS)} or node parameters {NODE_KEYS}")
+            runs.append(config)
+    return runs
+
+
+def run_name(config: dict, varying: list[str]) -> str:
+    """Folder name: the varying keys for people, a digest of the whole configuration for resuming."""
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:8]
+    label = ",".join(f"{key}={Path(str(config[key])).stem if key == 'map' else config[key]}" for key in varying)
+    return f"{label}-{digest}" if label else digest
+
+
+def summarize_log(log_path: str | Path) -> dict:
+    """Node deaths and lines per severity in a simulation log, as result columns."""
+    severities: Counter = Counter()
+    deaths = 0
+    with open(log_path) as f:
+        for line in f:
+            match = _SEVERITY.match(line)
+            if match:
+                severities[match.group(1)] += 1
+            if " DIED" in line:
+                deaths += 1
+    return {"node_deaths": deaths, **{f"log_{severity.lower()}": count for severity, count in sorted(severities.items())}}
+
+
+def write_json(path: Path, data: dict) -> None:
+    """Write data next to path first, so a reader never sees a half-written file."""
+    staging = path.with_suffix(".tmp")
+    with open(staging, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(staging, path)
+
+
+def run_one(config: dict, run_dir: str, cache_dir: str | None = DEFAULT_CACHE_DIR) -> dict:
+    """Run one configuration to completion and write its result.json; runs in a pool worker."""
+    run_dir = Path(run_dir)
+    run_dir.mkdir(parents=True, exist_ok=True)
+    write_json(run_dir / _CONFIG, config)
+    log_path = run_dir / _LOG
+    log_path.unlink(missing_ok=True)  # left behind by an interrupted attempt, the logger only appends
+
+    cache = TopologyCache(cache_dir).entry(config["map"], NetworkTopologyLoader.LORA_WAN_RADIUS_M) if cache_dir is not None else None
+    device_neighbors = NetworkTopologyLoader.from_file(config["map"], cache=cache)
+    node_config = NodeConfig(**{key: config[key] for key in NODE_KEYS})
+
+    start = time.perf_counter()
+    sim = Simulation(log_path=str(log_path), status=Value(c_int, SimState.RUNNING.value), device_neighbors=device_neighbors, n_workers=config["n_workers"], partitioner=config["partitioner"], event_queue=config["event_queue"], topology_cache=cache, node_config=node_config)
+    if config["restore"] is not None:
+        try:
+            sim.restore(config["restore"])
+            if sim.node_config != node_config:
+                raise ValueError(f"Checkpoint {config['restore']} was taken with {sim.node_config}, the run asks for {node_config}")
+        except Exception:
+            sim.close()
+            raise
+    sim.run_for(config["ticks"])
+    elapsed = time.perf_counter() - start
+
+    result = {"name": run_dir.name, **config, "elapsed_s": round(elapsed, 3), "ticks_evaluated": sim.stats["ticks"], "barriers": sim.stats["barriers"], **summarize_log(log_path)}
+    write_json(run_dir / _RESULT, result)
+    return result
+
+
+def _warm_cache(maps: set[str], cache_dir: str) -> None:
+    """Build each map's cached table and reach map once, before the runs race to do it."""
+    for map_path in sorted(maps):
+        cache = TopologyCache(cache_dir).entry(map_path, NetworkTopologyLoader.LORA_WAN_RADIUS_M)
+        cache.reach_csr(NetworkTopologyLoader.from_file(map_path, cache=cache))
+
+
+def write_summary(out_dir: Path, results: list[dict]) -> Path:
+    columns = list(dict.fromkeys(key for result in results for key in result))
+    path = out_dir / _SUMMARY
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+    return path
+
+
+def run_sweep(spec: dict, out_dir: str | Path, jobs: int | None = None, cache_dir: str | None = DEFAULT_CACHE_DIR, report=print) -> list[dict]:
+    """Run every configuration of spec that has no result yet; returns all results in sweep order."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    runs = expand_runs(spec)
+    varying = [key for key in runs[0] if any(run[key] != runs[0][key] for run in runs)] if runs else []
+    names = [run_name(config, varying) for config in runs]
+    if len(set(names)) != len(names):
+        raise ValueError("Sweep contains the same configuration more than once")
+
+    todo = [(config, name) for config, name in zip(runs, names) if not (out_dir / name / _RESULT).exists()]
+    report(f"{len(runs)} runs, {len(runs) - len(todo)} already done")
+
+    if todo:
+        if cache_dir is not None:
+            _warm_cache({config["map"] for config, _ in todo}, cache_dir)
+        # Each run starts its own simulation workers, so size the pool to keep every core busy once
+        cores = os.cpu_count() or 1
+        jobs = jobs or max(1, cores // max(config["n_workers"] for config, _ in todo))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            futures = {pool.submit(run_one, config, str(out_dir / name), cache_dir): name for config, name in todo}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                    report(f"done   {futures[future]} in {result['elapsed_s']:.1f}s")
+                except Exception as e:
+                    report(f"failed {futures[future]}: {e}")
+
+    results = []
+    for name in names:
+        result_path = out_dir / name / _RESULT
+        if result_path.exists():
+            with open(result_path) as f:
+                results.append(json.load(f))
+    if results:
+        report(f"summary: {write_summary(out_dir, results)}")
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sweep_file", help="JSON sweep description")
+    parser.add_argument("--out", default=None, help="output folder, default results/sweep-<sweep file name>")
+    parser.add_argument("--jobs", type=int, default=None, help="concurrent runs, default fills the available cores")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    with open(args.sweep_file) as f:
+        spec = json.load(f)
+    out_dir = args.out or os.path.join("results", f"sweep-{Path(args.sweep_file).stem}")
+    results = run_sweep(spec, out_dir, jobs=args.jobs, cache_dir=None if args.no_cache else args.cache_dir)
+    if len(results) < len(expand_runs(spec)):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from custom_types import NodeMediumInfo
+from medium.lora_d2d_medium import LoraD2DMedium
+from medium.reach_map import ReachCSR, ReachMapView
+
+from .topology_table import TopologyTable
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".topology_cache"
+_SOURCES_INDEX = "sources.json"  # resolved path -> [size, mtime_ns, sha256], skips re-hashing unchanged files
+_TABLE = "table"
+_REACH = "reach"
+_QUALITY_KEYS = ("edge_cut", "reach_edges", "cross_senders", "balance")
+
+
+def _save_arrays(directory: Path, name: str, arrays: dict[str, np.ndarray]) -> None:
+    """Write one group of .npy files; the group only becomes visible once every array is on disk."""
+    directory.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=directory))
+    try:
+        for key, array in arrays.items():
+            np.save(staging / f"{key}.npy", array)
+        os.replace(staging, directory / name)
+    except OSError:
+        # Another process published the same group first
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _load_arrays(directory: Path, name: str, keys: tuple[str, ...]) -> dict[str, np.ndarray] | None:
+    group = directory / name
+    if not group.is_dir():
+        return None
+    try:
+        return {key: np.load(group / f"{key}.npy", mmap_mode="r") for key in keys}
+    except (OSError, ValueError):
+        return None
+
+
+class CachedTopology:
+    """Preprocessed state of one topology file: NodeMediumInfo table, reach map and worker partitions.
+
+    Everything lives as .npy arrays under one directory per (file content, radius) and is loaded
+    memory-mapped. Missing pieces are built by the caller-supplied fallback and stored for next time.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def device_neighbors(self, build: Callable[[], dict[int, NodeMediumInfo]]) -> Mapping[int, NodeMediumInfo]:
+        arrays = _load_arrays(self.path, _TABLE, TopologyTable.ARRAYS)
+        if arrays is not None:
+            return TopologyTable(**arrays)
+        table = build()
+        _save_arrays(self.path, _TABLE, TopologyTable.from_infos(table).arrays())
+        return table
+
+    def reach_csr(self, device_neighbors: dict[int, NodeMediumInfo]) -> ReachCSR:
+        arrays = _load_arrays(self.path, _REACH, ("node_ids", "indptr", "receivers", "rssi"))
+        if arrays is not None:
+            return ReachCSR(**arrays)
+        csr = LoraD2DMedium.build_reach_csr(device_neighbors)
+        _save_arrays(self.path, _REACH, {"node_ids": csr.node_ids, "indptr": csr.indptr, "receivers": csr.receivers, "rssi": csr.rssi})
+        return csr
+
+    def reach_map(self, device_neighbors: dict[int, NodeMediumInfo]) -> ReachMapView:
+        return ReachMapView(self.reach_csr(device_neighbors))
+
+    def partition(self, partitioner: str, n_workers: int, build: Callable[[], tuple[dict[int, int], dict]]) -> tuple[dict[int, int], dict]:
+        """(node_to_cluster, partition_quality) for one partitioner and worker count."""
+        name = f"partition-{partitioner}-{n_workers}"
+        arrays = _load_arrays(self.path, name, ("node_ids", "clusters", "quality"))
+        if arrays is not None:
+            quality = {key: value if key == "balance" else int(value) for key, value in zip(_QUALITY_KEYS, arrays["quality"].tolist())}
+            return dict(zip(arrays["node_ids"].tolist(), arrays["clusters"].tolist())), quality
+        node_to_cluster, quality = build()
+        _save_arrays(
+            self.path,
+            name,
+            {
+                "node_ids": np.fromiter(node_to_cluster.keys(), dtype=np.int64),
+                "clusters": np.fromiter(node_to_cluster.values(), dtype=np.int32),
+                "quality": np.array([quality[key] for key in _QUALITY_KEYS], dtype=np.float64),
+            },
+        )
+        return node_to_cluster, quality
+
+
+class TopologyCache:
+    """Content-hashed on-disk cache of preprocessed topologies, shared by every engine on this machine."""
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def entry(self, json_path: str | Path, radius_m: float) -> CachedTopology:
+        digest = self._digest(Path(json_path))
+        return CachedTopology(self.cache_dir / f"v{CACHE_VERSION}-{digest[:32]}-r{radius_m:g}")
+
+    def _digest(self, path: Path) -> str:
+        """sha256 of the file, reused from the sources index while size and mtime are unchanged."""
+        stat = path.stat()
+        source = str(path.resolve())
+        index_path = self.cache_dir / _SOURCES_INDEX
+        try:
+            index = json.loads(index_path.read_text())
+        except (OSError, ValueError):
+            index = {}
+        known = index.get(source)
+        if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        index[source] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=".sources-", dir=self.cache_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(staging, index_path)
+        return digest
@@ -0,0 +1,215 @@
+"""Streaming node_outputs.json loader: compact arrays instead of one Python dict per node.
+
+Memory target: parsing (read_topology) peaks at no more than 1.5x the file size, where json.load
+needs about 9x (benchmarks/topology_loader.py, 10 MiB / 100k node map: 13.6 MiB vs 87.5 MiB).
+Past that point the peak is the NodeMediumInfo table handed to the simulator.
+"""
+
+import json
+import re
+from array import array
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from custom_types import NodeMediumInfo
+
+_CHUNK_CHARS = 1 << 20
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class JsonObjectStream:
+    """Cursor over a JSON document read in chunks; only one value is ever decoded at a time.
+
+    items() walks the keys of the object at the cursor; after each key the caller either decodes
+    the value with value() or descends into it with another items().
+    """
+
+    def __init__(self, f, chunk_chars: int = _CHUNK_CHARS):
+        self._f = f
+        self._chunk_chars = chunk_chars
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        chunk = self._f.read(self._chunk_chars)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Value cut off at the chunk boundary
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal ending the buffer may continue in the next chunk
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self):
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON stream, found {separator!r}")
+
+
+@dataclass
+class RawTopology:
+    """node_outputs.json as flat arrays, in file order; neighbour ids are still raw ids."""
+
+    node_ids: array = field(default_factory=lambda: array("q"))
+    node_points: array = field(default_factory=lambda: array("d"))  # x0, y0, x1, y1, ...
+    node_int_coords: array = field(default_factory=lambda: array("b"))  # bit 0: x was an int, bit 1: y
+    neighbor_counts: array = field(default_factory=lambda: array("q"))
+    neighbors: array = field(default_factory=lambda: array("q"))
+    gateway_keys: array = field(default_factory=lambda: array("q"))
+    gateway_points: array = field(default_factory=lambda: array("d"))
+    gateway_int_coords: array = field(default_factory=lambda: array("b"))
+    extra: dict = field(default_factory=dict)  # remaining top-level keys, e.g. "metadata"
+
+
+def _add_point(points: array, int_coords: array, point: list) -> None:
+    x, y = point
+    points.append(x)
+    points.append(y)
+    int_coords.append((type(x) is int) | (type(y) is int) << 1)
+
+
+def read_topology(json_path: str) -> RawTopology:
+    """Parse nodes and gateways entry by entry into RawTopology; other top-level keys are decoded whole."""
+    raw = RawTopology()
+    with open(json_path) as f:
+        stream = JsonObjectStream(f)
+        for key in stream.items():
+            if key == "nodes":
+                for node_id in stream.items():
+                    node = stream.value()
+                    raw.node_ids.append(int(node_id))
+                    _add_point(raw.node_points, raw.node_int_coords, node["point"])
+                    neighbors = node.get("neighbours", [])
+                    raw.neighbor_counts.append(len(neighbors))
+                    raw.neighbors.extend(map(int, neighbors))
+            elif key == "gateways":
+                for gw_id in stream.items():
+                    raw.gateway_keys.append(int(gw_id))
+                    _add_point(raw.gateway_points, raw.gateway_int_coords, stream.value()["point"])
+            else:
+                raw.extra[key] = stream.value()
+    return raw
+
+
+def _points(points: array, int_coords: array) -> list[tuple]:
+    """Position tuples with the JSON number types restored, so they print like the json.load ones."""
+    xy = np.frombuffer(points, dtype=np.float64).reshape(-1, 2).tolist()
+    return [(int(x) if ints & 1 else x, int(y) if ints & 2 else y) for (x, y), ints in zip(xy, int_coords)]
+
+
+def _gateway_initial_nodes(raw: RawTopology, gw_ids: np.ndarray, m_per_svg_x: float, m_per_svg_y: float, radius_m: float) -> np.ndarray:
+    """Gateway owning each node (-1 for none): the lowest gateway id with the node in LoRaWAN range.
+
+    Same arithmetic as BFSTopologyAnalyzer._dist_m; nodes are pre-selected on x through a sorted
+    index so each gateway only measures a strip of the map.
+    """
+    xy = np.frombuffer(raw.node_points, dtype=np.float64).reshape(-1, 2)
+    gw_xy = np.frombuffer(raw.gateway_points, dtype=np.float64).reshape(-1, 2)
+    owner = np.full(len(xy), -1, dtype=np.int64)
+    by_x = np.argsort(xy[:, 0], kind="stable")
+    sorted_x = xy[by_x, 0]
+    # Slightly wider than the radius so rounding never drops a node the exact test keeps
+    half_width = radius_m / abs(m_per_svg_x) * (1 + 1e-9) + 1e-9 if m_per_svg_x else np.inf
+    for g in np.argsort(gw_ids, kind="stable"):
+        gx, gy = gw_xy[g]
+        candidates = by_x[np.searchsorted(sorted_x, gx - half_width, side="left") : np.searchsorted(sorted_x, gx + half_width, side="right")]
+        candidates = candidates[owner[candidates] < 0]
+        dx = (xy[candidates, 0] - gx) * m_per_svg_x
+        dy = (xy[candidates, 1] - gy) * m_per_svg_y
+        owner[candidates[np.sqrt(dx * dx + dy * dy) <= radius_m]] = gw_ids[g]
+    return owner
+
+
+def analyze_topology(raw: RawTopology, radius_m: float) -> dict[int, NodeMediumInfo]:
+    """Array version of NetworkTopologyLoader.from_json_eager on already streamed data; same table, same order."""
+    meta = raw.extra.get("metadata", {})
+    m_per_svg_x = meta.get("m_per_svg_x", 391.287)
+    m_per_svg_y = meta.get("m_per_svg_y", 702.570)
+
+    node_ids = np.frombuffer(raw.node_ids, dtype=np.int64)
+    gw_id_offset = int(node_ids.max()) if len(node_ids) else 0
+    gw_ids = gw_id_offset + np.frombuffer(raw.gateway_keys, dtype=np.int64)
+
+    # Index space: nodes in file order, then neighbour ids without an entry of their own
+    flat = np.frombuffer(raw.neighbors, dtype=np.int64)
+    phantoms = np.setdiff1d(flat, node_ids)
+    ids = np.concatenate((node_ids, phantoms))
+    order = np.argsort(ids, kind="stable")
+    flat_idx = order[np.searchsorted(ids, flat, sorter=order)]
+    counts = np.concatenate((np.frombuffer(raw.neighbor_counts, dtype=np.int64), np.zeros(len(phantoms), dtype=np.int64)))
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+
+    # Multi-source BFS from every node in gateway range; only reachability matters
+    owner = _gateway_initial_nodes(raw, gw_ids, m_per_svg_x, m_per_svg_y, radius_m)
+    visited = np.zeros(len(ids), dtype=bool)
+    frontier = np.flatnonzero(owner >= 0)
+    visited[frontier] = True
+    while len(frontier):
+        starts, stops = indptr[frontier], indptr[frontier + 1]
+        lengths = stops - starts
+        reached = flat_idx[np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))]
+        frontier = np.unique(reached[~visited[reached]])
+        visited[frontier] = True
+
+    # Neighbour lists keep visited ids only
+    keep = visited[flat_idx]
+    bounds = np.concatenate(([0], np.cumsum(keep)))[indptr].tolist()
+    kept = flat[keep].tolist()
+
+    positions = _points(raw.node_points, raw.node_int_coords)
+    owner_list, visited_list = owner.tolist(), visited.tolist()
+    device_neighbors = {}
+    for i, nid in enumerate(raw.node_ids):
+        if visited_list[i]:
+            gw_id = owner_list[i]
+            device_neighbors[nid] = NodeMediumInfo(position=positions[i], neighbors=kept[bounds[i] : bounds[i + 1]], gateways_in_range=[gw_id] if gw_id >= 0 else [], is_gateway=False)
+
+    served: dict[int, list[int]] = {}
+    for i in np.flatnonzero(owner >= 0).tolist():
+        served.setdefault(owner_list[i], []).append(node_ids[i].item())
+    for gw_id, position in zip(gw_ids.tolist(), _points(raw.gateway_points, raw.gateway_int_coords)):
+        device_neighbors[gw_id] = NodeMediumInfo(position=position, neighbors=sorted(served.get(gw_id, [])), gateways_in_range=[], is_gateway=True)
+    return device_neighbors
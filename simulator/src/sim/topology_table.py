@@ -0,0 +1,107 @@
+from collections.abc import Iterable, Mapping
+from itertools import chain
+
+import numpy as np
+
+from custom_types import NodeMediumInfo
+
+_ID_DTYPE = np.int32
+
+
+def _ragged(lists: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(values) for values in lists], out=indptr[1:])
+    return indptr, np.fromiter(chain.from_iterable(lists), dtype=_ID_DTYPE, count=int(indptr[-1]))
+
+
+def _take_ragged(indptr: np.ndarray, values: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """CSR rows `rows` of (indptr, values) as a new, compact CSR pair."""
+    counts = indptr[rows + 1] - indptr[rows]
+    new_indptr = np.concatenate(([0], np.cumsum(counts)))
+    gather = np.repeat(indptr[rows] - new_indptr[:-1], counts) + np.arange(int(new_indptr[-1]))
+    return new_indptr, values[gather]
+
+
+class TopologyTable(Mapping):
+    """NodeMediumInfo table as columns: int32 ids, float64 positions and CSR neighbour/gateway lists.
+
+    Reads like the dict[int, NodeMediumInfo] the loaders return; a row only becomes a NodeMediumInfo
+    when it is looked up. Pickles as a handful of arrays, so handing a worker its subset() is cheap.
+    """
+
+    ARRAYS = ("node_ids", "positions", "is_gateway", "neighbor_ptr", "neighbors", "gateway_ptr", "gateways")
+
+    def __init__(self, node_ids, positions, is_gateway, neighbor_ptr, neighbors, gateway_ptr, gateways):
+        self.node_ids = np.asarray(node_ids, dtype=_ID_DTYPE)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(len(self.node_ids), 2)
+        self.is_gateway = np.asarray(is_gateway, dtype=bool)
+        self.neighbor_ptr = np.asarray(neighbor_ptr, dtype=np.int64)
+        self.neighbors = np.asarray(neighbors, dtype=_ID_DTYPE)
+        self.gateway_ptr = np.asarray(gateway_ptr, dtype=np.int64)
+        self.gateways = np.asarray(gateways, dtype=_ID_DTYPE)
+        self._row = {nid: i for i, nid in enumerate(self.node_ids.tolist())}
+        self._infos: dict[int, NodeMediumInfo] = {}
+
+    @classmethod
+    def from_infos(cls, node_neighbors: Mapping[int, NodeMediumInfo]) -> "TopologyTable":
+        if isinstance(node_neighbors, TopologyTable):
+            return node_neighbors
+        infos = list(node_neighbors.values())
+        neighbor_ptr, neighbors = _ragged([info.neighbors for info in infos])
+        gateway_ptr, gateways = _ragged([info.gateways_in_range for info in infos])
+        return cls(
+            node_ids=np.fromiter(node_neighbors.keys(), dtype=_ID_DTYPE, count=len(infos)),
+            positions=np.fromiter(chain.from_iterable(info.position for info in infos), dtype=np.float64, count=2 * len(infos)),
+            is_gateway=np.fromiter((info.is_gateway for info in infos), dtype=bool, count=len(infos)),
+            neighbor_ptr=neighbor_ptr,
+            neighbors=neighbors,
+            gateway_ptr=gateway_ptr,
+            gateways=gateways,
+        )
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    def __getitem__(self, node_id: int) -> NodeMediumInfo:
+        info = self._infos.get(node_id)
+        if info is None:
+            i = self._row[node_id]
+            info = self._infos[node_id] = NodeMediumInfo(
+                position=tuple(self.positions[i].tolist()),
+                neighbors=self.neighbors[self.neighbor_ptr[i] : self.neighbor_ptr[i + 1]].tolist(),
+                gateways_in_range=self.gateways[self.gateway_ptr[i] : self.gateway_ptr[i + 1]].tolist(),
+                is_gateway=bool(self.is_gateway[i]),
+            )
+        return info
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._row
+
+    def __iter__(self):
+        return iter(self._row)
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __getstate__(self) -> dict:
+        return self.arrays()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+    def halo(self, node_ids: Iterable[int], reach_map: Mapping | None = None) -> set[int]:
+        """Nodes outside node_ids that one of them lists as neighbour or gateway, or reaches over D2D."""
+        inside = set(node_ids)
+        rows = np.fromiter((self._row[nid] for nid in inside if nid in self._row), dtype=np.int64)
+        halo = set(_take_ragged(self.neighbor_ptr, self.neighbors, rows)[1].tolist())
+        halo.update(_take_ragged(self.gateway_ptr, self.gateways, rows)[1].tolist())
+        if reach_map is not None:
+            halo.update(receiver for nid in inside for receiver, _ in reach_map.get(nid, ()))
+        return {nid for nid in halo - inside if nid in self._row}
+
+    def subset(self, node_ids: Iterable[int]) -> "TopologyTable":
+        """Rows for node_ids, in table order; ids that are not in the table are skipped."""
+        rows = np.sort(np.fromiter({self._row[nid] for nid in node_ids if nid in self._row}, dtype=np.int64))
+        neighbor_ptr, neighbors = _take_ragged(self.neighbor_ptr, self.neighbors, rows)
+        gateway_ptr, gateways = _take_ragged(self.gateway_ptr, self.gateways, rows)
+        return TopologyTable(self.node_ids[rows], self.positions[rows], self.is_gateway[rows], neighbor_ptr, neighbors, gateway_ptr, gateways)
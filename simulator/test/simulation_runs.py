@@ -0,0 +1,31 @@
+"""Shared helpers for the tests that compare the logs of two simulation runs."""
+
+import re
+from ctypes import c_int
+from multiprocessing import Value
+from pathlib import Path
+
+from custom_types import SimState
+from sim.engine import NetworkTopologyLoader, Simulation
+
+MAPS_DIR = Path(__file__).parent.parent / "maps"
+GUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+SECONDS = re.compile(r"\d+\.\d+")  # wall-clock timings in the SIMULATOR summary lines
+
+
+def read_log(log_path: str | Path) -> list[str]:
+    """Log lines with the uuid4 PayloadData GUIDs and the summary's wall-clock timings masked."""
+    with open(log_path) as f:
+        return [SECONDS.sub("<s>", line) if line.startswith("[DEBUG] (SIMULATOR)") else GUID.sub("<guid>", line) for line in f]
+
+
+def run_simulation(log_path: str | Path, stop_tick: int = 4_000_000, map_name: str = "y.json", **options) -> tuple[list[str], Simulation]:
+    """Run a Simulation on maps/map_name up to stop_tick and return its read_log lines and the simulation.
+
+    options go to Simulation as they are; device_neighbors, when given, replaces the map.
+    """
+    if "device_neighbors" not in options:
+        options["device_neighbors"] = NetworkTopologyLoader.from_file(MAPS_DIR / map_name)
+    sim = Simulation(log_path=str(log_path), status=Value(c_int, SimState.RUNNING.value), **options)
+    sim.run_for(stop_tick)
+    return read_log(log_path), sim
@@ -0,0 +1,71 @@
+"""
+Tests for copy-on-write branches of a warmed-up simulation (Simulation.fork, sim.branches).
+
+Covers:
+  - A branch without changes logs what an uninterrupted run logs after the fork; the forked simulation stays usable.
+  - Battery changes reach the branch's nodes and its result.
+  - Unknown branch keys and forking with peer routing are refused.
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from sim.branches import run_branches
+from sim.engine import NetworkTopologyLoader, Simulation
+
+from . import simulation_runs
+from .simulation_runs import MAPS_DIR
+
+CHARGE = re.compile(r"Battery charge ([0-9.]+)")
+
+
+def make_simulation(log_path: Path, **options) -> Simulation:
+    return Simulation(log_path=str(log_path), device_neighbors=NetworkTopologyLoader.from_file(MAPS_DIR / "y.json"), n_workers=3, **options)
+
+
+def read_log(log_path: Path) -> Counter:
+    return Counter(line for line in simulation_runs.read_log(log_path) if not line.startswith("---"))
+
+
+@pytest.mark.serial
+def test_branches_continue_the_warm_simulation(tmp_path):
+    full = make_simulation(tmp_path / "full.log")
+    full.run_for(4_000_000)
+
+    sim = make_simulation(tmp_path / "warm.log")
+    sim.run_for(2_000_000, keep_workers=True)
+    branches = [{"name": "same"}, {"name": "small-battery", "battery_capacity_joule": 3.0}]
+    results = run_branches(sim, branches, 4_000_000, tmp_path / "branches", jobs=2, report=lambda message: None)
+
+    assert [r["name"] for r in results] == ["same", "small-battery"]
+    assert all(r["error"] is None and r["final_tick"] <= 4_000_000 for r in results)
+    assert results[1]["battery_capacity_joule"] == 3.0
+    assert read_log(tmp_path / "full.log") - read_log(tmp_path / "warm.log") == read_log(tmp_path / "branches" / "same" / "simulation.log")
+
+    # The nodes of the small-battery branch run on the new capacity, not just its result
+    small = read_log(tmp_path / "branches" / "small-battery" / "simulation.log")
+    charges = [float(m.group(1)) for line in small for m in CHARGE.finditer(line)]
+    assert small != read_log(tmp_path / "branches" / "same" / "simulation.log")
+    assert charges and max(charges) <= 3.0
+
+    # The parent is still at the fork tick and finishes like the uninterrupted run
+    sim.run_for(4_000_000)
+    assert read_log(tmp_path / "warm.log") == read_log(tmp_path / "full.log")
+
+
+@pytest.mark.serial
+def test_fork_refuses(tmp_path):
+    sim = make_simulation(tmp_path / "sim.log")
+    with pytest.raises(ValueError):
+        run_branches(sim, [{"seed": 1}], 1_000, tmp_path / "branches")
+    sim.close()
+    with pytest.raises(RuntimeError):
+        sim.fork(tmp_path / "child.log")
+
+    peer = make_simulation(tmp_path / "peer.log", d2d_routing="peer")
+    with pytest.raises(ValueError):
+        peer.fork(tmp_path / "child.log")
+    peer.close()
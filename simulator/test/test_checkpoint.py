@@ -0,0 +1,57 @@
+"""
+Tests for Simulation.checkpoint / Simulation.restore.
+
+Covers:
+  - A run checkpointed halfway and restored into a fresh simulation logs exactly what an uninterrupted run logs.
+  - With checkpoint_path, run_for writes a checkpoint when it ends.
+  - Restoring into a simulation with another worker count or event queue is refused.
+  - checkpoint() needs running workers.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from sim.engine import NetworkTopologyLoader, Simulation
+
+from .simulation_runs import MAPS_DIR, read_log
+
+
+def make_simulation(log_path: Path, n_workers: int = 3, **options) -> Simulation:
+    return Simulation(log_path=str(log_path), device_neighbors=NetworkTopologyLoader.from_file(MAPS_DIR / "y.json"), n_workers=n_workers, **options)
+
+
+@pytest.mark.serial
+def test_restored_run_matches_uninterrupted(tmp_path):
+    full = make_simulation(tmp_path / "full.log")
+    full.run_for(4_000_000)
+
+    first = make_simulation(tmp_path / "first.log", checkpoint_path=tmp_path / "sim.ckpt")
+    first.run_for(2_000_000)
+    assert (tmp_path / "sim.ckpt").exists()
+
+    second = make_simulation(tmp_path / "second.log")
+    second.restore(tmp_path / "sim.ckpt")
+    assert second.global_time.get_time() <= 2_000_000
+    second.run_for(4_000_000)
+
+    assert second.error is None
+    assert second.stats["ticks"] == full.stats["ticks"]
+    # The restored run's log opens with its own logger header
+    assert sorted(read_log(tmp_path / "first.log") + read_log(tmp_path / "second.log")[1:]) == sorted(read_log(tmp_path / "full.log"))
+
+
+@pytest.mark.serial
+def test_restore_refuses_other_setup(tmp_path):
+    sim = make_simulation(tmp_path / "sim.log", n_workers=2)
+    sim.run_for(100_000, keep_workers=True)
+    sim.checkpoint(tmp_path / "sim.ckpt")
+    sim.close()
+    with pytest.raises(RuntimeError):
+        sim.checkpoint(tmp_path / "again.ckpt")
+
+    for options in ({"n_workers": 1}, {"n_workers": 2, "event_queue": "wheel"}):
+        other = make_simulation(tmp_path / "other.log", **options)
+        with pytest.raises(ValueError):
+            other.restore(tmp_path / "sim.ckpt")
+        other.close()
@@ -0,0 +1,78 @@
+"""
+Tests for the headless command line (python -m sim).
+
+Covers:
+  - Durations with units convert to millisecond ticks, bare numbers are ticks.
+  - run writes the log and a stats file and exits 0; bad arguments exit 2.
+  - --log-level INFO writes the same log as the default logger, a higher level drops lines at the source.
+  - A run continued with --restore from another run's --checkpoint evaluates the same ticks as one run.
+"""
+
+import json
+
+import pytest
+
+from sim.__main__ import EXIT_OK, EXIT_USAGE, main, parse_duration
+
+from .simulation_runs import MAPS_DIR, read_log, run_simulation
+
+MAP = str(MAPS_DIR / "y.json")
+
+
+def test_parse_duration():
+    assert parse_duration("48h") == 48 * 3_600_000
+    assert parse_duration("1h30m") == 5_400_000
+    assert parse_duration("250ms") == 250
+    assert parse_duration("1.5s") == 1500
+    assert parse_duration("4000") == 4000
+    for text in ("", "5x", "h", "1h 30m"):
+        with pytest.raises(Exception):
+            parse_duration(text)
+
+
+@pytest.mark.serial
+def test_run_matches_simulation(tmp_path, capsys):
+    code = main(["run", "--map", MAP, "--until", "4000000", "--workers", "3", "--dispatch", "barrier", "--worker-topology", "slice", "--out", str(tmp_path / "cli"), "--no-cache"])
+    assert code == EXIT_OK
+    assert "phases (barrier): dispatch" in capsys.readouterr().out
+
+    with open(tmp_path / "cli" / "stats.json") as f:
+        stats = json.load(f)
+    assert stats["exit_code"] == EXIT_OK and stats["until_tick"] == 4_000_000 and stats["workers"] == 3
+    assert set(stats["phase_time_s"]) == {"dispatch", "wait", "apply", "streamed_propagation", "propagation"}
+
+    reference, sim = run_simulation(tmp_path / "reference.log", n_workers=3)
+    assert stats["stats"]["ticks"] == sim.stats["ticks"]
+    assert sorted(read_log(tmp_path / "cli" / "simulation.log")) == sorted(reference)
+
+
+@pytest.mark.serial
+def test_log_level_filters(tmp_path):
+    assert main(["run", "--map", MAP, "--until", "1h", "--workers", "1", "--log-level", "CRITICAL", "--out", str(tmp_path), "--no-cache"]) == EXIT_OK
+    lines = read_log(tmp_path / "simulation.log")
+    assert lines and all(line.startswith("[CRITICAL]") or line.startswith("---") for line in lines)
+
+
+@pytest.mark.serial
+def test_checkpoint_and_restore(tmp_path):
+    checkpoint = str(tmp_path / "y.ckpt")
+    assert main(["run", "--map", MAP, "--until", "2000000", "--workers", "2", "--checkpoint", checkpoint, "--out", str(tmp_path / "first"), "--no-cache"]) == EXIT_OK
+    assert main(["run", "--map", MAP, "--until", "4000000", "--workers", "2", "--restore", checkpoint, "--out", str(tmp_path / "second"), "--no-cache"]) == EXIT_OK
+    assert main(["run", "--map", MAP, "--until", "4000000", "--workers", "2", "--out", str(tmp_path / "full"), "--no-cache"]) == EXIT_OK
+
+    stats = {}
+    for name in ("second", "full"):
+        with open(tmp_path / name / "stats.json") as f:
+            stats[name] = json.load(f)
+    assert 0 < stats["second"]["start_tick"] <= 2_000_000
+    assert stats["second"]["stats"]["ticks"] == stats["full"]["stats"]["ticks"]
+
+
+def test_bad_arguments(tmp_path):
+    assert main(["run", "--map", str(tmp_path / "missing.json"), "--until", "1h"]) == EXIT_USAGE
+    assert main(["run", "--map", MAP, "--until", "1h", "--restore", str(tmp_path / "missing.ckpt")]) == EXIT_USAGE
+    assert main(["run", "--map", MAP, "--until", "1h", "--checkpoint-every", "10m", "--out", str(tmp_path)]) == EXIT_USAGE
+    assert main(["run", "--map", MAP, "--until", "1h", "--d2d-routing", "peer", "--lookahead", "--out", str(tmp_path)]) == EXIT_USAGE
+    with pytest.raises(SystemExit) as exc:
+        main(["run", "--map", MAP, "--until", "soon"])
+    assert exc.value.code == EXIT_USAGE
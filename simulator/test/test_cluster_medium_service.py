@@ -0,0 +1,71 @@
+"""
+Tests for intra-cluster D2D resolution in the worker-side ClusterMediumService.
+
+Covers:
+  - Receptions of a transmission cancelled in the same tick are replaced by CANCELED events, queued last.
+  - A cancel after the receptions were drained only queues CANCELED events.
+  - Cancels of cross-cluster transmissions are forwarded to main.
+  - receive() hands out one node's mail for one medium in arrival order and leaves the other medium queued.
+"""
+
+from custom_types import EventNet, EventNetTypes, MediumTypes
+from sim.engine import ClusterMediumService
+
+REACH_MAP = {1: [(2, -40.0), (3, -60.0)], 2: [(1, -40.0), (3, -40.0)], 3: [(2, -40.0), (4, -40.0)]}
+
+
+def drained(medium: ClusterMediumService) -> list[tuple]:
+    return [(recv_id, event.node_id, event.type, wake) for recv_id, event, wake in medium.drain_intra_receptions()]
+
+
+def test_same_tick_cancel_replaces_receptions():
+    medium = ClusterMediumService(frozenset({1, 2, 3}), REACH_MAP)
+    medium.transmit(1, MediumTypes.LORA_D2D, b"a", 10, 20)
+    medium.transmit(2, MediumTypes.LORA_D2D, b"b", 10, 30)
+    medium.cancel_transmission(1, MediumTypes.LORA_D2D, 10, 20)
+    medium.flush_d2d(10)
+
+    assert drained(medium) == [
+        (1, 2, EventNetTypes.TRANSMIT, 31),
+        (3, 2, EventNetTypes.TRANSMIT, 31),
+        (2, 1, EventNetTypes.CANCELED, 11),
+        (3, 1, EventNetTypes.CANCELED, 11),
+    ]
+    assert medium.busy_nodes(10) == {1, 2, 3}
+
+
+def test_later_cancel_only_queues_canceled_events():
+    medium = ClusterMediumService(frozenset({1, 2, 3}), REACH_MAP)
+    medium.transmit(1, MediumTypes.LORA_D2D, b"a", 10, 20)
+    medium.flush_d2d(10)
+    assert [entry[2] for entry in drained(medium)] == [EventNetTypes.TRANSMIT, EventNetTypes.TRANSMIT]
+
+    medium.cancel_transmission(1, MediumTypes.LORA_D2D, 10, 20)
+    medium.flush_d2d(15)
+
+    assert drained(medium) == [(2, 1, EventNetTypes.CANCELED, 11), (3, 1, EventNetTypes.CANCELED, 11)]
+    assert drained(medium) == []
+
+
+def test_cross_cluster_cancel_goes_to_main():
+    medium = ClusterMediumService(frozenset({1, 2, 3}), REACH_MAP)
+    medium.transmit(3, MediumTypes.LORA_D2D, b"c", 10, 20)
+    medium.cancel_transmission(3, MediumTypes.LORA_D2D, 10, 20)
+    medium.flush_d2d(10)
+
+    assert drained(medium) == []
+    assert [tx[0] for tx in medium.drain_transmissions()] == [3]
+    assert medium.drain_cancellations() == [(3, MediumTypes.LORA_D2D, 10, 20)]
+
+
+def test_receive_splits_mail_by_medium():
+    medium = ClusterMediumService(frozenset({1, 2}), REACH_MAP)
+    d2d = [EventNet(2, t, t + 5, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, []) for t in (10, 20)]
+    wan = EventNet(3, 15, 25, EventNetTypes.TRANSMIT, MediumTypes.LORA_WAN, [])
+    medium.set_incoming(1, [d2d[0], wan])
+    medium.set_incoming(1, [d2d[1]])
+
+    assert list(medium.receive(1, MediumTypes.LORA_D2D)) == d2d
+    assert list(medium.receive(1, MediumTypes.LORA_D2D)) == []
+    assert list(medium.receive(2, MediumTypes.LORA_WAN)) == []
+    assert list(medium.receive(1, MediumTypes.LORA_WAN)) == [wan]
@@ -0,0 +1,139 @@
+"""
+Tests for the receive-queue collision resolver (node.transceiver.collision).
+
+Covers:
+  - successful_receptions_indexed makes the same accept/collide decisions as the pairwise reference on random
+    dense queues with cancellations, repeated frames and frames still on air.
+  - A cancellation cuts the cancelled sender's frame short only for candidates starting after it ends.
+  - Touching frames collide, frames from a sender with a cancellation are never received.
+  - The capture model's vectorized resolver matches its pairwise reference, keeps the stronger of two
+    frames only above the capture threshold, drops frames below the SF sensitivity without a collision
+    and receives everything the overlap model receives.
+  - The capture model reads each receiver's RSSI from a reception shared by several receivers.
+"""
+
+import random
+
+import pytest
+
+from custom_types import EventNet, EventNetTypes, LoRaD2DFrame, LoRaD2DFrameType, MediumTypes
+from node.transceiver.collision import CaptureModel, reception_model, sensitivity_dbm, successful_receptions, successful_receptions_indexed, successful_receptions_pairwise
+
+
+def frame(node_id: int, start: int, end: int, type: EventNetTypes = EventNetTypes.TRANSMIT, rssi: float = -40) -> EventNet:
+    data = LoRaD2DFrame(source_node_id=node_id, destination_node_id=set(), type=LoRaD2DFrameType.CURRENT_HOP_COUNT, payload=None, rssi=rssi)
+    return EventNet(node_id=node_id, time_start=start, time_end=end, type=type, type_medium=MediumTypes.LORA_D2D, data=data)
+
+
+def random_queue(rng: random.Random, n_frames: int, n_senders: int, span: int) -> list[EventNet]:
+    queue = []
+    for _ in range(n_frames):
+        start = rng.randrange(span)
+        queue.append(frame(rng.randrange(n_senders), start, start + rng.randrange(1, 60), rssi=rng.uniform(-135, -40)))
+    for cancelled in rng.sample(queue, k=rng.randrange(min(4, len(queue)) + 1)):
+        queue.append(frame(cancelled.node_id, rng.randrange(cancelled.time_start, cancelled.time_end + 1), cancelled.time_end, EventNetTypes.CANCELED))
+    if queue and rng.random() < 0.2:
+        queue.append(rng.choice(queue))  # the same object twice never collides with itself
+    rng.shuffle(queue)
+    queue.sort(key=lambda e: e.time_start)
+    return queue
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_pairwise_reference(seed):
+    rng = random.Random(seed)
+    outcomes = set()
+    for _ in range(200):
+        span = rng.choice([50, 200, 1_000])
+        queue = random_queue(rng, rng.randrange(0, 40), rng.randrange(1, 12), span)
+        current, reception_start = rng.randrange(span + 60), rng.randrange(span)
+        received, collided = successful_receptions_indexed(queue, current, reception_start)
+        expected, expected_collided = successful_receptions_pairwise(queue, current, reception_start)
+        assert collided == expected_collided
+        assert len(received) == len(expected) and all(a is b for a, b in zip(received, expected))
+        outcomes.add((bool(received), collided))
+    assert outcomes == {(False, False), (False, True), (True, False), (True, True)}
+
+
+def test_cancellation_cuts_the_frame_for_later_candidates_only():
+    early = frame(2, 100, 150)
+    late = frame(3, 400, 450)
+    long = frame(4, 90, 500)
+    cancel = frame(4, 120, 500, EventNetTypes.CANCELED)  # 4 stopped at 120, its frame ended at 500
+
+    # The cancellation ends after both candidates start: 4 only occupied the air until 120
+    for resolve in (successful_receptions_indexed, successful_receptions_pairwise):
+        received, collided = resolve([long, early, cancel, late], 600, 0)
+        assert received == [late]
+        assert collided
+
+
+def test_touching_frames_collide_and_cancelled_senders_are_dropped():
+    first, second = frame(2, 100, 150), frame(3, 150, 200)
+    assert successful_receptions([first, second], 300, 0) == ([], True)
+
+    cancelled = frame(5, 10, 20)
+    received, collided = successful_receptions([cancelled, frame(5, 15, 20, EventNetTypes.CANCELED)], 300, 0)
+    assert received == [] and not collided
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_capture_matches_pairwise_reference_and_overlap_model(seed):
+    rng = random.Random(seed)
+    model = CaptureModel(sf=7, bandwidth_hz=125_000)
+    outcomes = set()
+    for _ in range(200):
+        span = rng.choice([50, 200, 1_000])
+        queue = random_queue(rng, rng.randrange(0, 40), rng.randrange(1, 12), span)
+        current, reception_start = rng.randrange(span + 60), rng.randrange(span)
+        received, collided = model.resolve_vectorized(queue, current, reception_start)
+        expected, expected_collided = model.resolve_pairwise(queue, current, reception_start)
+        assert collided == expected_collided
+        assert len(received) == len(expected) and all(a is b for a, b in zip(received, expected))
+
+        # Interference only takes away what the sensitivity would not
+        overlap_received, _ = successful_receptions_pairwise(queue, current, reception_start)
+        audible = {id(e) for e in received}
+        assert all(id(e) in audible for e in overlap_received if e.data.rssi >= model.sensitivity_dbm)
+        outcomes.add((bool(received), collided, len(received) > len(overlap_received)))
+    assert (True, True, True) in outcomes and (False, True, False) in outcomes
+
+    # Captured over the interference but below the sensitivity: dropped, not a collision. The weaker
+    # frame started before the reception and is no candidate itself
+    faint = [frame(3, 80, 170, rssi=-145), frame(2, 100, 150, rssi=-130)]
+    assert model.resolve_vectorized(faint, 300, 90) == model.resolve_pairwise(faint, 300, 90) == ([], False)
+
+
+def test_capture_keeps_the_stronger_frame_above_the_threshold():
+    model = reception_model("capture", sf=7, bandwidth_hz=125_000)
+    near, far = frame(2, 100, 150, rssi=-40), frame(3, 120, 170, rssi=-52)
+    assert model([near, far], 300, 0) == ([near], True)
+
+    # 3 dB apart neither frame is demodulated
+    assert model([near, frame(3, 120, 170, rssi=-43)], 300, 0) == ([], True)
+
+    # Two weaker frames add up: -52 and -52 sum to -49 dBm, still 9 dB below
+    assert model([near, far, frame(4, 130, 160, rssi=-52)], 300, 0) == ([near], True)
+
+
+def test_capture_reads_the_receiver_rssi_of_shared_receptions():
+    # The medium hands every receiver the same reception, the frame's own rssi is the sender's 0
+    near, far = frame(2, 100, 150, rssi=0), frame(3, 120, 170, rssi=0)
+    near.rssi, far.rssi = {7: -40, 8: -52}, {7: -52, 8: -40}
+    assert reception_model("capture", sf=7, bandwidth_hz=125_000, receiver_id=7)([near, far], 300, 0) == ([near], True)
+    assert reception_model("capture", sf=7, bandwidth_hz=125_000, receiver_id=8)([near, far], 300, 0) == ([far], True)
+    assert near.data_for(8).rssi == -52 and near.data.rssi == 0
+
+
+def test_capture_drops_frames_below_the_sensitivity_without_a_collision():
+    assert sensitivity_dbm(7, 125_000) == pytest.approx(-124.5, abs=0.1)
+    assert sensitivity_dbm(12, 125_000) == pytest.approx(-137.0, abs=0.1)
+    model = CaptureModel(sf=7, bandwidth_hz=125_000)
+    assert model([frame(2, 100, 150, rssi=-130)], 300, 0) == ([], False)
+    assert CaptureModel(sf=12, bandwidth_hz=125_000)([frame(2, 100, 150, rssi=-130)], 300, 0)[0] != []
+
+
+def test_unknown_reception_model_is_rejected():
+    assert reception_model("overlap", sf=7, bandwidth_hz=125_000) is successful_receptions
+    with pytest.raises(ValueError, match="Unknown reception model"):
+        reception_model("sinr", sf=7, bandwidth_hz=125_000)
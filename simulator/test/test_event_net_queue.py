@@ -1,5 +1,9 @@
+import random
+
+import pytest
+
 from custom_types import EventNet, EventNetTypes, MediumTypes
-from sim.device_event_queue import DeviceEventQueue
+from sim.device_event_queue import EVENT_QUEUES, DeviceEventQueue, TimingWheelEventQueue
 
 
 def test_init_tick_and_get_next_events():
@@ -43,3 +47,135 @@ def multi_event_queue():
     e3 = EventNet(node_id=3, time_start=20, time_end=30, data=["c"], type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_D2D)
     e4 = EventNet(node_id=4, time_start=12, time_end=18, data=["d"], type=EventNetTypes.CANCELED, type_medium=MediumTypes.LORA_D2D)
     return q, [e1, e2, e3, e4]
+
+
+@pytest.mark.parametrize("queue_cls", EVENT_QUEUES.values())
+def test_queue_orders_across_wheel_levels(queue_cls):
+    q = queue_cls()
+    q.init_tick(1, [1, 2])
+    q.add_event(3, 3_000_000)  # APP initial sleep: far wheel
+    q.add_event(4, 500_000_000)  # beyond the far wheel: overflow
+    q.add_event(5, 60_001)
+    q.add_event(6, 2)
+    q.add_event(7, None)
+
+    assert len(q) == 5
+    assert [(t, set(n)) for t, n in q.iter_events()] == [(1, {1, 2}), (2, {6}), (60_001, {5}), (3_000_000, {3}), (500_000_000, {4})]
+    assert [q.get_next_events()[0] for _ in range(5)] == [1, 2, 60_001, 3_000_000, 500_000_000]
+    assert len(q) == 0
+
+
+@pytest.mark.parametrize("queue_cls", EVENT_QUEUES.values())
+def test_pop_events_until(queue_cls):
+    q = queue_cls()
+    q.init_tick(10, [1])
+    q.add_event(2, 4_100)
+    q.add_event(3, 9_000)
+
+    assert [(t, set(n)) for t, n in q.pop_events_until(4_100)] == [(10, {1}), (4_100, {2})]
+    assert q.pop_events_until(8_999) == []
+    assert len(q) == 1
+
+
+def test_timing_wheel_handles_events_before_current_block():
+    q = TimingWheelEventQueue()
+    q.init_tick(100_000, [1])
+    assert q.get_next_events() == (100_000, {1})
+    q.add_event(2, 50)
+    q.add_event(3, 100_001)
+
+    assert q.get_next_events() == (50, {2})
+    assert q.get_next_events() == (100_001, {3})
+
+
+def test_timing_wheel_matches_sorted_queue():
+    rnd = random.Random(7)
+    reference, wheel = DeviceEventQueue(), TimingWheelEventQueue()
+    reference.init_tick(1, range(1, 20))
+    wheel.init_tick(1, range(1, 20))
+    now = 1
+    for _ in range(20_000):
+        r = rnd.random()
+        if r < 0.6:
+            tick = now + rnd.choice((rnd.randint(0, 300), rnd.randint(0, 120_000), rnd.randint(0, 10_000_000)))
+            node_id = rnd.randint(1, 40)
+            reference.add_event(node_id, tick)
+            wheel.add_event(node_id, tick)
+        elif r < 0.95 and len(reference):
+            expected = reference.get_next_events()
+            assert wheel.get_next_events() == (expected[0], set(expected[1]))
+            now = expected[0]
+        else:
+            horizon = now + rnd.randint(0, 200_000)
+            assert wheel.pop_events_until(horizon) == [(t, set(n)) for t, n in reference.pop_events_until(horizon)]
+        assert len(wheel) == len(reference)
+
+
+@pytest.mark.parametrize("queue_cls", EVENT_QUEUES.values())
+def test_schedule_next_supersedes_stale_wakeup(queue_cls):
+    q = queue_cls()
+    q.init_tick(1, [1, 2])
+    assert q.get_next_events() == (1, {1, 2})
+    q.schedule_next(1, 50)
+    q.schedule_next(2, 50)
+    q.add_event(1, 10)  # reception
+    assert q.get_next_events() == (10, {1})
+
+    q.schedule_next(1, 3_000_000)  # the wakeup at 50 is stale now
+    assert q.get_next_events() == (50, {2})
+    q.schedule_next(2, None)
+    assert [(t, set(n)) for t, n in q.iter_events()] == [(3_000_000, {1})]
+    assert q.suppressed_wakeups == 1
+
+
+@pytest.mark.parametrize("queue_cls", EVENT_QUEUES.values())
+def test_schedule_next_keeps_tick_needed_for_another_reason(queue_cls):
+    q = queue_cls()
+    q.init_tick(1, [1])
+    q.get_next_events()
+    q.schedule_next(1, 20)
+    q.add_event(1, 20)  # reception due at the same tick
+    q.add_event(1, 5)
+    assert q.get_next_events() == (5, {1})
+
+    q.schedule_next(1, 40)
+    assert [t for t, _ in q.pop_events_until(100)] == [20, 40]
+    assert q.suppressed_wakeups == 0
+
+
+@pytest.mark.parametrize("queue_cls", EVENT_QUEUES.values())
+def test_schedule_next_repeated_round_in_current_tick(queue_cls):
+    q = queue_cls()
+    q.init_tick(7, [1])
+    assert q.get_next_events() == (7, {1})
+    q.schedule_next(1, 7)
+    assert q.next_wake(1) == 7
+    assert q.get_next_events() == (7, {1})
+    assert len(q) == 0
+
+
+def test_timing_wheel_schedule_next_matches_sorted_queue():
+    rnd = random.Random(11)
+    reference, wheel = DeviceEventQueue(), TimingWheelEventQueue()
+    reference.init_tick(1, range(1, 20))
+    wheel.init_tick(1, range(1, 20))
+    now = 1
+    for _ in range(20_000):
+        r = rnd.random()
+        if r < 0.6:
+            tick = now + rnd.choice((rnd.randint(0, 300), rnd.randint(0, 120_000), rnd.randint(0, 10_000_000), -rnd.randint(1, 5_000)))
+            node_id = rnd.randint(1, 40)
+            for q in (reference, wheel):
+                if r < 0.45:
+                    q.schedule_next(node_id, tick)
+                else:
+                    q.add_event(node_id, tick)
+        elif r < 0.95 and len(reference):
+            expected = reference.get_next_events()
+            assert wheel.get_next_events() == (expected[0], set(expected[1]))
+            now = expected[0]
+        else:
+            horizon = now + rnd.randint(0, 200_000)
+            assert wheel.pop_events_until(horizon) == [(t, set(n)) for t, n in reference.pop_events_until(horizon)]
+        assert len(wheel) == len(reference)
+    assert wheel.suppressed_wakeups == reference.suppressed_wakeups > 0
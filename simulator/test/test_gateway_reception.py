@@ -0,0 +1,88 @@
+"""
+Tests for the concentrator gateway reception model (node.transceiver.gateway_reception).
+
+Covers:
+  - Uplinks collide only on the same channel and spreading factor.
+  - A frame starting while every demodulator is locked is lost, and a demodulator frees when its frame ends.
+  - A LoRaWan gateway transceiver keeps frames still on air across calls and receives every frame once.
+  - The ideal gateway (the default) receives overlapping uplinks, nodes hop their uplinks over the channels.
+"""
+
+import random
+from unittest.mock import Mock
+
+from custom_types import EventNet, EventNetTypes, MediumTypes, NodeConfig
+from loraWanFrameHelper import LoRaWanPHYPayload
+from node.transceiver.collision import successful_receptions
+from node.transceiver.gateway_reception import GatewayReception
+from node.transceiver.LoRaWan import LoRaWan
+
+
+def uplink(node_id: int, start: int, end: int, channel: int = 0, sf: int = 7) -> EventNet:
+    return EventNet(node_id=node_id, time_start=start, time_end=end, type=EventNetTypes.TRANSMIT, type_medium=MediumTypes.LORA_WAN, data=LoRaWanPHYPayload(mhdr=0x40, channel=channel, sf=sf))
+
+
+def gateway_transceiver(config: NodeConfig = NodeConfig(gateway_reception="concentrator")) -> LoRaWan:
+    transceiver = LoRaWan(node_id=0, medium_service=Mock(), local_event_queue=Mock(), second_to_global_tick=1.0, log=Mock(), config=config, gateway=True)
+    transceiver._current_reception_start_global_tick = 0
+    return transceiver
+
+
+def test_uplinks_collide_on_the_same_channel_and_sf_only():
+    a, b = uplink(1, 100, 150, channel=0), uplink(2, 120, 170, channel=1)
+    assert GatewayReception(8, successful_receptions)([a, b], 200, 0) == ([a, b], False)
+
+    c = uplink(3, 130, 180, channel=0)
+    assert GatewayReception(8, successful_receptions)([a, b, c], 200, 0) == ([b], True)
+
+    d = uplink(4, 130, 180, channel=0, sf=9)
+    assert GatewayReception(8, successful_receptions)([a, b, d], 200, 0) == ([a, b, d], False)
+
+
+def test_busy_demodulators_drop_later_frames_until_one_frees():
+    model = GatewayReception(2, successful_receptions)
+    first, second, third = uplink(1, 100, 150, channel=0), uplink(2, 110, 160, channel=1), uplink(3, 120, 170, channel=2)
+    late = uplink(4, 155, 200, channel=3)  # first's demodulator is free again
+    assert model([first, second, third, late], 300, 0) == ([first, second, late], True)
+
+
+def test_transceiver_keeps_frames_on_air_and_receives_each_once():
+    transceiver = gateway_transceiver()
+    early, on_air = uplink(1, 100, 150, channel=0), uplink(2, 120, 400, channel=1)
+    transceiver._receive_queue = [early, on_air]
+    assert transceiver._get_successful_receptions(151) == [early]
+    assert transceiver._receive_queue == [early, on_air]  # early may still collide with frames overlapping on_air
+
+    later = uplink(3, 300, 350, channel=0)
+    transceiver._receive_queue.append(later)
+    assert transceiver._get_successful_receptions(351) == [later]
+    assert transceiver._get_successful_receptions(401) == [on_air]
+    assert transceiver._receive_queue == []
+
+
+def test_ideal_gateway_receives_overlaps_and_nodes_hop_channels():
+    ideal = gateway_transceiver(NodeConfig())
+    a, b = uplink(1, 100, 150), uplink(2, 100, 150)
+    ideal._receive_queue = [a, b]
+    assert ideal._get_successful_receptions(151) == [a, b]
+
+    node = LoRaWan(node_id=5, medium_service=Mock(), local_event_queue=Mock(), second_to_global_tick=1.0, log=Mock(), config=NodeConfig(gateway_reception="concentrator", wan_channels=3))
+    frame = LoRaWanPHYPayload(mhdr=0x40)
+    channels = {node._on_air(frame).channel for _ in range(50)}
+    assert channels == {0, 1, 2} and frame.channel == 0
+    assert LoRaWan(node_id=5, medium_service=Mock(), local_event_queue=Mock(), second_to_global_tick=1.0, log=Mock())._on_air(frame) is frame
+
+
+def test_thousands_of_uplinks_resolve_like_a_brute_force_gateway():
+    rng = random.Random(3)
+    queue = sorted((uplink(nid, s, s + 60, channel=rng.randrange(8)) for nid, s in enumerate(rng.randrange(20_000) for _ in range(3_000))), key=lambda e: e.time_start)
+    received, collided = GatewayReception(8, successful_receptions)(queue, 30_000, 0)
+
+    locked, expected = [], []
+    for e in queue:
+        locked = [x for x in locked if x.time_end >= e.time_start]
+        if len(locked) < 8:
+            locked.append(e)
+            if not any(o is not e and o.data.channel == e.data.channel and o.time_start <= e.time_end and o.time_end >= e.time_start for o in queue):
+                expected.append(e)
+    assert collided and received == expected and 0 < len(expected) < len(queue)
@@ -0,0 +1,90 @@
+"""
+Tests for the multilevel reach-graph partitioner.
+
+Covers:
+  - Every node gets a cluster and gateways follow the nodes they serve.
+  - Two dense groups joined by a single link are split along that link.
+  - Activity balance on the bundled maps beats the BFS partition.
+  - Isolated nodes and a star still coarsen, so the spectral split only sees a small graph.
+  - A run on the multilevel partition produces the same events as a run on the BFS partition.
+"""
+
+from collections import Counter
+
+import pytest
+
+from medium.lora_d2d_medium import LoraD2DMedium
+from sim import graph_partitioner
+from sim.engine import NetworkTopologyLoader
+from sim.graph_partitioner import PARTITIONERS, expected_activity, multilevel_partition, partition_quality
+
+from .simulation_runs import MAPS_DIR, run_simulation
+
+
+def load(map_name: str) -> tuple[dict, dict]:
+    topology = NetworkTopologyLoader.from_file(MAPS_DIR / map_name)
+    return topology, LoraD2DMedium.build_reach_map(topology)
+
+
+@pytest.mark.parametrize("map_name", ["y.json", "intersection.json", "circle.json"])
+def test_assigns_every_node_and_gateways_follow_majority(map_name):
+    topology, reach_map = load(map_name)
+
+    node_to_cluster = multilevel_partition(topology, reach_map, 4)
+
+    assert node_to_cluster.keys() == topology.keys()
+    assert set(node_to_cluster.values()) == {0, 1, 2, 3}
+    for gw_id, info in topology.items():
+        if info.is_gateway:
+            votes = Counter(node_to_cluster[nb] for nb in info.neighbors if nb in node_to_cluster)
+            assert votes[node_to_cluster[gw_id]] == max(votes.values())
+
+
+def test_splits_barbell_along_bridge():
+    # Two cliques of 6 nodes with a single link between 6 and 7
+    cliques = [range(1, 7), range(7, 13)]
+    reach_map = {nid: [(nb, -40.0) for nb in clique if nb != nid] for clique in cliques for nid in clique}
+    reach_map[6].append((7, -40.0))
+    reach_map[7].append((6, -40.0))
+    weights = {nid: 1.0 for nid in reach_map}
+
+    node_to_cluster = multilevel_partition({}, reach_map, 2, weights)
+
+    assert partition_quality(reach_map, node_to_cluster, weights) == {"edge_cut": 2, "reach_edges": 62, "cross_senders": 2, "balance": 1.0}
+
+
+@pytest.mark.parametrize("map_name", ["y.json", "mega_line.json", "final_boss.json"])
+def test_balance_beats_bfs(map_name):
+    topology, reach_map = load(map_name)
+    activity = expected_activity(topology, reach_map)
+
+    quality = {name: partition_quality(reach_map, partition(topology, reach_map, 4, activity), activity) for name, partition in PARTITIONERS.items()}
+
+    assert quality["multilevel"]["balance"] < quality["bfs"]["balance"]
+    assert quality["multilevel"]["balance"] < 1.3
+
+
+def test_stalled_coarsening_keeps_coarsest_level_small(monkeypatch):
+    # Heavy-edge matching alone cannot shrink 3000 isolated nodes or the leaves of a 500-leaf star
+    reach_map = {nid: [] for nid in range(1, 3001)}
+    reach_map[3001] = [(leaf, -40.0) for leaf in range(3002, 3502)]
+    reach_map.update({leaf: [(3001, -40.0)] for leaf in range(3002, 3502)})
+    weights = {nid: 1.0 for nid in reach_map}
+    split_sizes = []
+    fiedler_order = graph_partitioner._fiedler_order
+    monkeypatch.setattr(graph_partitioner, "_fiedler_order", lambda nodes, graph: split_sizes.append(len(nodes)) or fiedler_order(nodes, graph))
+
+    node_to_cluster = multilevel_partition({}, reach_map, 4, weights)
+
+    assert max(split_sizes) <= 2 * 4 * graph_partitioner._COARSEST_PER_CLUSTER
+    assert partition_quality(reach_map, node_to_cluster, weights)["balance"] < 1.1
+
+
+@pytest.mark.serial
+def test_multilevel_run_matches_bfs_partition(tmp_path):
+    bfs_log, _ = run_simulation(tmp_path / "bfs.log", 2_000_000, n_workers=3, partitioner="bfs")
+    multilevel_log, sim = run_simulation(tmp_path / "multilevel.log", 2_000_000, n_workers=3, partitioner="multilevel")
+
+    assert sim.partition_quality["balance"] < 1.3
+    # Worker order decides the order of same-tick lines, nothing else
+    assert sorted(multilevel_log) == sorted(bfs_log)
@@ -0,0 +1,124 @@
+"""
+Tests for conservative lookahead windows in Simulation.run_for.
+
+Covers:
+  - BFSTopologyAnalyzer.lookahead_distances marks boundary nodes and counts intra-cluster hops.
+  - A lookahead run produces the same log as the tick-by-tick run with fewer worker barriers.
+  - A window never dispatches a next wake its node superseded inside the window.
+  - Injections apply at the same tick as in the tick-by-tick run.
+"""
+
+import pytest
+
+from custom_types import NodeMediumInfo, Severity
+from medium.lora_d2d_medium import LoraD2DMedium
+from payload_types import PayloadData
+from sim.bfs_topology_analyzer import BFSTopologyAnalyzer
+from sim.engine import ClusterMediumService, CollectingLogger, _run_window
+
+from .simulation_runs import run_simulation
+
+
+def line_topology(num_nodes: int) -> dict[int, NodeMediumInfo]:
+    """Gateway 1 serving node 2, followed by a straight line of regular nodes."""
+    neighbors = {1: NodeMediumInfo(position=(0, 0), neighbors=[2], gateways_in_range=[], is_gateway=True)}
+    for i in range(2, num_nodes + 1):
+        nbs = [n for n in (i - 1, i + 1) if 2 <= n <= num_nodes]
+        neighbors[i] = NodeMediumInfo(position=(i - 1, 0), neighbors=nbs, gateways_in_range=[1] if i == 2 else [])
+    return neighbors
+
+
+class TestLookaheadDistances:
+    def test_single_cluster_counts_hops_to_wan_nodes(self):
+        topology = line_topology(8)
+        reach_map = LoraD2DMedium.build_reach_map(topology)
+        distances = BFSTopologyAnalyzer.lookahead_distances(topology, reach_map, {nid: 0 for nid in topology})
+
+        assert distances[1] == 0  # gateway
+        assert distances[2] == 0  # has a LoRaWAN receiver
+        # 2-hop reach: every D2D hop can cover two positions on the line
+        assert distances[3] == 1
+        assert distances[4] == 1
+        assert distances[5] == 2
+        assert distances[8] == 3
+
+    def test_cross_cluster_receivers_are_boundary(self):
+        topology = line_topology(8)
+        reach_map = LoraD2DMedium.build_reach_map(topology)
+        node_to_cluster = {nid: 0 if nid <= 5 else 1 for nid in topology}
+        distances = BFSTopologyAnalyzer.lookahead_distances(topology, reach_map, node_to_cluster)
+
+        # 4 and 5 reach 6/7 in the other cluster, 6 and 7 reach back into cluster 0
+        for nid in (4, 5, 6, 7):
+            assert distances[nid] == 0
+        assert distances[8] == 1
+        assert distances[3] == 1
+
+    def test_isolated_node_has_no_distance(self):
+        topology = line_topology(3)
+        topology[9] = NodeMediumInfo(position=(50, 50), neighbors=[], gateways_in_range=[])
+        reach_map = LoraD2DMedium.build_reach_map(topology)
+        distances = BFSTopologyAnalyzer.lookahead_distances(topology, reach_map, {nid: 0 for nid in topology})
+
+        assert 9 not in distances
+
+
+@pytest.mark.serial
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_lookahead_matches_tick_by_tick(n_workers, tmp_path):
+    # 4M ticks: past the 50 min initial sleep and a few slot periods
+    tick_log, tick = run_simulation(tmp_path / "tick.log", n_workers=n_workers)
+    window_log, window = run_simulation(tmp_path / "window.log", n_workers=n_workers, lookahead=True)
+
+    assert len(tick_log) > 1
+    assert window_log == tick_log
+    assert window.stats["ticks"] == tick.stats["ticks"]
+    assert window.stats["suppressed_wakeups"] == tick.stats["suppressed_wakeups"]
+    assert window.stats["barriers"] < tick.stats["barriers"]
+
+
+def payload_for(node_id: int) -> PayloadData:
+    payload = PayloadData(id={node_id})
+    payload.data.sensor1 = 42
+    payload.length_calc()
+    return payload
+
+
+@pytest.mark.serial
+def test_lookahead_injections_match_tick_by_tick(tmp_path):
+    # Tick mode applies an injection at the first global tick at or after its own, often another worker's
+    injections = [{"node_id": nid, "tick": tick, "payload": payload_for(nid)} for nid, tick in ((5, 3_100_001), (12, 3_250_003), (20, 3_400_007), (9, 3_600_011))]
+
+    tick_log, _ = run_simulation(tmp_path / "tick.log", n_workers=2, injection_tasks=injections, log_level=Severity.DEBUG)
+    window_log, _ = run_simulation(tmp_path / "window.log", n_workers=2, lookahead=True, injection_tasks=injections, log_level=Severity.DEBUG)
+
+    injected = [line for line in tick_log if "INJECTED" in line]
+    assert len(injected) == 4
+    assert [line for line in window_log if "INJECTED" in line] == injected
+    # Everything but the run summary, which holds barrier counts
+    summary = "[DEBUG] (SIMULATOR) @ 0:"
+    assert [line for line in window_log if not line.startswith(summary)] == [line for line in tick_log if not line.startswith(summary)]
+
+
+class ScriptedNode:
+    def __init__(self, next_ticks: dict[int, int | None]):
+        self.next_ticks = next_ticks
+        self.ticked: list[int] = []
+
+    def tick(self, current_time: int) -> int | None:
+        self.ticked.append(current_time)
+        return self.next_ticks[current_time]
+
+
+def test_window_drops_next_wake_superseded_beyond_horizon():
+    # Node 1 is due at 20 but a reception wakes it at 10, and it then sleeps past the horizon
+    nodes = {1: ScriptedNode({10: 500}), 2: ScriptedNode({12: 15, 15: None})}
+    medium = ClusterMediumService(owned_nodes=frozenset(nodes), reach_map={})
+    events = [(10, [], [1]), (12, [2], []), (20, [1], [])]
+
+    processed, _, deferred, suppressed = _run_window(nodes, medium, CollectingLogger(), 20, events, [], [])
+
+    assert nodes[1].ticked == [10]
+    assert processed == [10, 12, 15]
+    assert deferred == [(1, 500, True), (2, None, True)]
+    assert suppressed == 1
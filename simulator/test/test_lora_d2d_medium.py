@@ -1,9 +1,17 @@
+import math
+import random
+from pathlib import Path
+
 import pytest
 
 from custom_types import EventNet, EventNetTypes, MediumTypes, NodeMediumInfo
 from logger.ILogger import ILogger
 from medium.lora_d2d_medium import LoraD2DMedium
+from medium.range_reach import RangePropagation, build_range_reach_brute_force
 from sim.device_event_queue import DeviceEventQueue
+from sim.engine import NetworkTopologyLoader
+
+MAPS_DIR = Path(__file__).parent.parent / "maps"
 
 
 class DummyLogger(ILogger):
@@ -210,3 +218,89 @@ def test_9_node_star_network_angle_dependency_45_degree_node_in():
 
     assert 5 and 6 and 8 and 9 in reception_map
     assert 2 and 3 and 4 and 7 not in reception_map
+
+
+def random_topology(n_nodes: int, radius: float, seed: int) -> dict[int, NodeMediumInfo]:
+    """Dense random geometric graph: many triangles, co-located nodes, shuffled and duplicated neighbour lists."""
+    rng = random.Random(seed)
+    positions = {nid: (rng.randint(0, 20), rng.randint(0, 20)) for nid in range(1, n_nodes + 1)}
+    node_neighbors = {}
+    for nid, (x, y) in positions.items():
+        neighbors = [other for other, (ox, oy) in positions.items() if other != nid and (ox - x) ** 2 + (oy - y) ** 2 <= radius**2]
+        rng.shuffle(neighbors)
+        if neighbors and rng.random() < 0.1:
+            neighbors.append(neighbors[0])
+        node_neighbors[nid] = NodeMediumInfo(position=(x, y), neighbors=neighbors, gateways_in_range=[], is_gateway=nid <= 2)
+    return node_neighbors
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS_DIR.glob("*.json")), ids=lambda path: path.name)
+@pytest.mark.parametrize("max_hop_count", [1, 2])
+def test_vectorized_reach_map_matches_recursive_on_maps(map_path, max_hop_count):
+    node_neighbors = NetworkTopologyLoader.from_file(map_path)
+
+    assert LoraD2DMedium.build_reach_map(node_neighbors, max_hop_count) == LoraD2DMedium.build_reach_map_recursive(node_neighbors, max_hop_count)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_angle", [30.0, 45.0, 90.0])
+def test_vectorized_reach_map_matches_recursive_on_dense_graphs(seed, max_angle):
+    # Later direct neighbours are often reached over two hops first and keep the two-hop RSSI
+    node_neighbors = random_topology(120, 4.0, seed)
+
+    assert LoraD2DMedium.build_reach_map(node_neighbors, 2, max_angle) == LoraD2DMedium.build_reach_map_recursive(node_neighbors, 2, max_angle)
+
+
+def test_reach_csr_layout():
+    node_neighbors = {
+        1: NodeMediumInfo(position=(0, 0), neighbors=[2], gateways_in_range=[]),
+        2: NodeMediumInfo(position=(1, 0), neighbors=[1, 3, 4], gateways_in_range=[]),
+        3: NodeMediumInfo(position=(2, 0), neighbors=[2], gateways_in_range=[]),
+        4: NodeMediumInfo(position=(1, 1), neighbors=[2], gateways_in_range=[], is_gateway=True),
+    }
+
+    csr = LoraD2DMedium.build_reach_csr(node_neighbors)
+
+    assert csr.node_ids.tolist() == [1, 2, 3]
+    assert csr.indptr.tolist() == [0, 2, 5, 7]
+    assert csr.receivers.tolist() == [2, 3, 1, 3, 4, 2, 1]
+    assert csr.rssi.tolist() == [-40.0, -52.0, -40.0, -40.0, -40.0, -40.0, -52.0]
+    with pytest.raises(ValueError):
+        LoraD2DMedium.build_reach_csr(node_neighbors, max_hop_count=3)
+
+
+@pytest.mark.parametrize("map_path", [path for path in sorted(MAPS_DIR.glob("*.json")) if path.name != "mega_line.json"], ids=lambda path: path.name)  # the O(N²) reference is too slow for mega_line
+@pytest.mark.parametrize("range_m", [1.0, 2.5, None])
+def test_range_reach_map_matches_brute_force_on_maps(map_path, range_m):
+    node_neighbors = NetworkTopologyLoader.from_file(map_path)
+    propagation = RangePropagation(*NetworkTopologyLoader.scale(map_path), max_range_m=range_m)
+
+    assert dict(LoraD2DMedium.build_range_reach_map(node_neighbors, propagation)) == build_range_reach_brute_force(node_neighbors, propagation)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_range_reach_map_matches_brute_force_with_uneven_scale(seed):
+    node_neighbors = random_topology(300, 4.0, seed)
+    propagation = RangePropagation(m_per_svg_x=3.5, m_per_svg_y=0.8, max_range_m=random.Random(seed).uniform(2.0, 20.0))
+
+    assert dict(LoraD2DMedium.build_range_reach_map(node_neighbors, propagation)) == build_range_reach_brute_force(node_neighbors, propagation)
+
+
+def test_range_reach_map_orders_by_distance_and_skips_gateways():
+    node_neighbors = {
+        1: NodeMediumInfo(position=(0, 0), neighbors=[], gateways_in_range=[]),
+        2: NodeMediumInfo(position=(30, 0), neighbors=[], gateways_in_range=[]),
+        3: NodeMediumInfo(position=(0, 10), neighbors=[], gateways_in_range=[]),
+        4: NodeMediumInfo(position=(1, 1), neighbors=[], gateways_in_range=[], is_gateway=True),
+        5: NodeMediumInfo(position=(500, 0), neighbors=[], gateways_in_range=[]),
+    }
+    propagation = RangePropagation(max_range_m=100.0)
+
+    reach = LoraD2DMedium.build_range_reach_map(node_neighbors, propagation)
+
+    assert [receiver for receiver, _ in reach[1]] == [3, 2]
+    assert reach[5] == [] and 4 not in reach
+    (_, near), (_, far) = reach[1]
+    assert near == pytest.approx(-17.2 - 30, abs=0.1)  # 14 dBm, 31.2 dB to 1 m, exponent 3 over a decade
+    assert near - far == pytest.approx(30 * math.log10(3), abs=1e-9)
+    assert RangePropagation().range_m == pytest.approx(3358, abs=1)  # SF7 link budget, kilometres on metre maps
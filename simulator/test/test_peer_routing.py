@@ -0,0 +1,92 @@
+"""
+Tests for worker-to-worker (peer) routing of cross-cluster D2D.
+
+Covers:
+  - Links only exist between workers sharing a reach-map edge, in the direction of the edge.
+  - Peer batches are handed out in barrier and then sending worker order, later barriers are kept back.
+  - Propagating cross-cluster D2D in the worker gives the receptions main would, cancels included.
+  - A peer-routed run produces the same log as a main-routed one, DEBUG medium lines included.
+  - Options peer routing cannot work with are rejected.
+"""
+
+import pytest
+
+from custom_types import EventNetTypes, MediumTypes, Severity
+from sim.engine import ClusterMediumService, NetworkTopologyLoader, Simulation
+from sim.peer_exchange import PeerExchange, peer_links
+from sim.rebalance import RebalancePolicy
+
+from .simulation_runs import MAPS_DIR, run_simulation
+
+REACH_MAP = {1: [(2, -40.0), (3, -60.0)], 2: [(1, -40.0)], 3: [], 4: [(3, -40.0)]}
+
+
+def test_links_follow_reach_edges():
+    links, connections = peer_links(REACH_MAP, {1: 0, 2: 0, 3: 1, 4: 2}, 3)
+    try:
+        (owner0, out0, in0), (owner1, out1, in1), (owner2, out2, in2) = links
+        assert owner0 == {3: 1} and owner2 == {3: 1} and owner1 == {}
+        assert set(out0) == {1} and set(out2) == {1} and out1 == {}
+        assert set(in1) == {0, 2} and in0 == {} and in2 == {}
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def test_drain_orders_by_barrier_then_worker():
+    links, connections = peer_links(REACH_MAP, {1: 0, 2: 0, 3: 1, 4: 2}, 3)
+    try:
+        sender0, sender2, receiver = (PeerExchange(w, *links[w]) for w in (0, 2, 1))
+        sender2.exchange(5, {1: ["w2@5"]})
+        sender0.exchange(6, {1: ["w0@6"]})
+        sender0.exchange(5, {1: ["w0@5"]})
+        receiver.exchange(5, {1: ["w1@5"]})
+
+        assert receiver.drain(6) == ["w0@5", "w1@5", "w2@5"]
+        assert receiver.drain(7) == ["w0@6"]
+        assert receiver.drain(8) == []
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def test_cross_propagation_matches_main():
+    medium = ClusterMediumService(frozenset({1, 2}), REACH_MAP)
+    medium.transmit(1, MediumTypes.LORA_D2D, b"a", 10, 20)
+    medium.transmit(1, MediumTypes.LORA_WAN, b"w", 10, 20)
+    medium.flush_d2d(10)
+    receptions, wakes = medium.propagate_cross_d2d(previous_tick=9, current_tick=10)
+
+    assert [(r, e.node_id, e.type) for r, e in receptions] == [(2, 1, EventNetTypes.TRANSMIT), (3, 1, EventNetTypes.TRANSMIT)]
+    assert wakes == [(2, 21), (3, 21)]
+    assert [tx[1] for tx in medium.drain_transmissions()] == [MediumTypes.LORA_WAN]
+
+    # Main expires a transmission once a tick at or after its end has been closed
+    medium.cancel_transmission(1, MediumTypes.LORA_D2D, 10, 20)
+    medium.flush_d2d(25)
+    assert medium.propagate_cross_d2d(previous_tick=20, current_tick=25) == ([], [])
+
+    medium.transmit(1, MediumTypes.LORA_D2D, b"b", 30, 40)
+    medium.cancel_transmission(1, MediumTypes.LORA_D2D, 30, 40)
+    medium.flush_d2d(30)
+    receptions, wakes = medium.propagate_cross_d2d(previous_tick=29, current_tick=30)
+    assert [(r, e.type) for r, e in receptions] == [(2, EventNetTypes.TRANSMIT), (3, EventNetTypes.TRANSMIT), (2, EventNetTypes.CANCELED), (3, EventNetTypes.CANCELED)]
+    assert wakes == [(2, 41), (3, 41), (2, 31), (3, 31)]
+
+
+@pytest.mark.serial
+def test_peer_matches_main(tmp_path):
+    # circle.json over 4 workers has cross-cluster D2D; DEBUG keeps the medium's per-receiver lines in the file
+    main_log, main = run_simulation(tmp_path / "main.log", map_name="circle.json", n_workers=4, d2d_routing="main", log_level=Severity.DEBUG)
+    peer_log, peer = run_simulation(tmp_path / "peer.log", map_name="circle.json", n_workers=4, d2d_routing="peer", log_level=Severity.DEBUG)
+
+    assert peer.stats["ticks"] == main.stats["ticks"]
+    assert any("Medium MediumTypes.LORA_D2D transmitting" in line for line in peer_log)
+    # Main logs a tick's propagation after every worker's node lines, a peer worker after its own
+    assert sorted(peer_log) == sorted(main_log)
+
+
+@pytest.mark.parametrize("options", [{"d2d_routing": "broadcast"}, {"d2d_routing": "peer", "lookahead": True}, {"d2d_routing": "peer", "transport": "shm"}, {"d2d_routing": "peer", "rebalance": RebalancePolicy()}])
+def test_rejected_options(tmp_path, options):
+    with pytest.raises(ValueError):
+        Simulation(log_path=str(tmp_path / "sim.log"), device_neighbors=NetworkTopologyLoader.from_file(MAPS_DIR / "y.json"), n_workers=1, **options)
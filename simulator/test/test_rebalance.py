@@ -0,0 +1,80 @@
+"""
+Tests for runtime re-partitioning of worker clusters.
+
+Covers:
+  - plan_migration moves boundary nodes off the busiest worker and respects the threshold and pinned nodes.
+  - Exported node state, mailbox included, continues identically in another worker.
+  - A rebalanced run produces the same events as a run on the static partition.
+"""
+
+import pytest
+
+from custom_types import EventNet, EventNetTypes, MediumTypes
+from node.node import Node
+from sim.engine import _SECOND_TO_GLOBAL_TICK, ClusterMediumService, CollectingLogger
+from sim.rebalance import RebalancePolicy, export_nodes, imbalance, import_nodes, plan_migration
+
+from .simulation_runs import run_simulation
+
+
+def line_reach_map(n: int) -> dict:
+    return {nid: [(nb, -40.0) for nb in (nid - 1, nid + 1) if 1 <= nb <= n] for nid in range(1, n + 1)}
+
+
+class TestPlanMigration:
+    def test_moves_boundary_nodes_to_lighter_worker(self):
+        node_to_worker = {1: 0, 2: 0, 3: 0, 4: 0, 5: 1, 6: 1}
+        node_load = {nid: 1.0 for nid in node_to_worker}
+
+        moves = plan_migration(node_to_worker, line_reach_map(6), node_load, {}, set(), 2, RebalancePolicy(imbalance_threshold=1.0))
+
+        assert moves == {4: 1}
+        assert imbalance([3.0, 3.0]) == 1.0
+
+    def test_balanced_load_stays(self):
+        node_to_worker = {1: 0, 2: 0, 3: 1, 4: 1}
+        moves = plan_migration(node_to_worker, line_reach_map(4), {nid: 1.0 for nid in node_to_worker}, {}, set(), 2, RebalancePolicy())
+
+        assert moves == {}
+
+    def test_pinned_nodes_stay(self):
+        node_to_worker = {1: 0, 2: 0, 3: 0, 4: 0, 5: 1, 6: 1}
+        node_load = {nid: 1.0 for nid in node_to_worker}
+
+        moves = plan_migration(node_to_worker, line_reach_map(6), node_load, {}, {4}, 2, RebalancePolicy(imbalance_threshold=1.0))
+
+        assert moves == {}
+
+
+def test_exported_node_continues_in_another_worker():
+    reach_map = line_reach_map(2)
+    source_medium, source_log = ClusterMediumService(frozenset({1, 2}), reach_map), CollectingLogger()
+    nodes = {1: Node(node_id=1, second_to_global_tick=_SECOND_TO_GLOBAL_TICK, medium_service=source_medium, log=source_log)}
+    reference = Node(node_id=1, second_to_global_tick=_SECOND_TO_GLOBAL_TICK, medium_service=ClusterMediumService(frozenset({1}), reach_map), log=CollectingLogger())
+    for tick in range(1, 500):
+        assert nodes[1].tick(tick) == reference.tick(tick)
+    source_medium.set_incoming(1, [EventNet(2, 480, 490, EventNetTypes.CANCELED, MediumTypes.LORA_D2D, [])])
+
+    blob = export_nodes(nodes, source_medium, source_log, [1])
+    dest_medium, dest_log = ClusterMediumService(frozenset({1}), reach_map), CollectingLogger()
+    adopted: dict = {}
+    import_nodes(adopted, dest_medium, dest_log, blob)
+
+    assert nodes == {}
+    assert source_medium.receive(1, MediumTypes.LORA_D2D) == []
+    assert len(dest_medium.receive(1, MediumTypes.LORA_D2D)) == 1
+    assert adopted[1].transceiver.medium_service is dest_medium
+    for tick in range(500, 3_100_000, 997):
+        assert adopted[1].tick(tick) == reference.tick(tick)
+
+
+@pytest.mark.serial
+def test_rebalanced_run_matches_static_partition(tmp_path):
+    policy = RebalancePolicy(interval_ticks=200_000, imbalance_threshold=1.0, max_moves=4)
+    static_log, _ = run_simulation(tmp_path / "static.log", n_workers=3)
+    rebalanced_log, sim = run_simulation(tmp_path / "rebalanced.log", n_workers=3, rebalance=policy)
+
+    assert sim.stats["migrated_nodes"] > 0
+    assert sim.stats["rebalances"] == sum(1 for *_, moved in sim.rebalance_report if moved)
+    # Worker order decides the order of same-tick lines, nothing else
+    assert sorted(rebalanced_log) == sorted(static_log)
@@ -0,0 +1,68 @@
+"""
+Tests for the memory-mapped topology shared by all workers.
+
+Covers:
+  - A worker attaching through the pickled handle sees the same table and reach map, read-only.
+  - The file is removed on close.
+  - A run with shared worker topology produces the same events as one with sliced topology, also while nodes migrate.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from medium.lora_d2d_medium import LoraD2DMedium
+from medium.reach_map import ReachCSR
+from sim.engine import NetworkTopologyLoader, Simulation
+from sim.rebalance import RebalancePolicy
+from sim.shared_topology import SharedTopology
+from sim.topology_table import TopologyTable
+
+from .simulation_runs import MAPS_DIR, run_simulation
+
+
+@pytest.mark.parametrize("map_name", ["y.json", "mega_line.json"])
+def test_attached_copy_matches(map_name):
+    device_neighbors = NetworkTopologyLoader.from_file(MAPS_DIR / map_name)
+    reach_map = LoraD2DMedium.build_reach_map(device_neighbors)
+    shared = SharedTopology.publish(TopologyTable.from_infos(device_neighbors), ReachCSR.from_dict(reach_map))
+    try:
+        attached = pickle.loads(pickle.dumps(shared))
+        table = attached.table()
+
+        assert table == device_neighbors
+        assert dict(attached.reach_map()) == reach_map
+        assert len(pickle.dumps(shared)) < 1024
+        with pytest.raises(ValueError):
+            table.positions[0, 0] = np.nan
+    finally:
+        shared.close()
+    assert not os.path.exists(shared.path)
+
+
+def test_empty_reach_map():
+    device_neighbors = NetworkTopologyLoader.from_file(MAPS_DIR / "y.json")
+    shared = SharedTopology.publish(TopologyTable.from_infos(device_neighbors), ReachCSR.from_dict({}))
+    try:
+        assert dict(shared.reach_map()) == {}
+    finally:
+        shared.close()
+
+
+@pytest.mark.serial
+def test_shared_run_matches_sliced(tmp_path):
+    policy = RebalancePolicy(interval_ticks=200_000, imbalance_threshold=1.0, max_moves=4)
+    sliced_log, _ = run_simulation(tmp_path / "slice.log", n_workers=3, worker_topology="slice")
+    shared_log, sim = run_simulation(tmp_path / "shared.log", n_workers=3, worker_topology="shared", rebalance=policy)
+
+    assert sim.stats["migrated_nodes"] > 0
+    assert not os.path.exists(sim._shared_topology.path)
+    # Worker order decides the order of same-tick lines, nothing else
+    assert sorted(shared_log) == sorted(sliced_log)
+
+
+def test_unknown_worker_topology(tmp_path):
+    with pytest.raises(ValueError):
+        Simulation(log_path=str(tmp_path / "sim.log"), device_neighbors=NetworkTopologyLoader.from_file(MAPS_DIR / "y.json"), n_workers=1, worker_topology="copy")
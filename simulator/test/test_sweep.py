@@ -0,0 +1,73 @@
+"""
+Tests for headless parameter sweeps.
+
+Covers:
+  - Grid points are combined with every listed run on top of the defaults, unknown keys are rejected.
+  - Run folders are named after the varying keys and change when any other setting changes.
+  - A sweep writes one result per run plus a summary, and a second pass skips finished runs.
+  - NodeConfig reaches the protocol, clock and battery; the default config keeps each node's Random(node_id).
+"""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from custom_types import NodeConfig
+from logger.simple_logger import SimpleLogger
+from node.clock.clock import Clock
+from node.node import Node
+from sim.engine import ClusterMediumService
+from sim.sweep import RUN_DEFAULTS, expand_runs, run_name, run_sweep
+
+MAP = str(Path(__file__).parent.parent / "maps" / "y.json")
+
+
+def test_expand_grid_and_runs():
+    runs = expand_runs({"ticks": 10, "grid": {"seed": [0, 1], "slot_count": [12, 18]}, "runs": [{"n_workers": 1}, {"n_workers": 2}]})
+
+    assert len(runs) == 8
+    assert [(r["n_workers"], r["seed"], r["slot_count"]) for r in runs[:4]] == [(1, 0, 12), (1, 0, 18), (1, 1, 12), (1, 1, 18)]
+    assert all(r["ticks"] == 10 and r["map"] == RUN_DEFAULTS["map"] and r["slot_duration"] == 220 for r in runs)
+    assert len(expand_runs({})) == 1
+
+    with pytest.raises(ValueError):
+        expand_runs({"grid": {"slots": [1, 2]}})
+
+
+def test_run_names():
+    a, b = expand_runs({"grid": {"seed": [0, 1]}})
+
+    assert run_name(a, ["seed"]).startswith("seed=0-")
+    assert run_name(a, ["seed"]) != run_name(b, ["seed"])
+    assert run_name(a, ["seed"]) != run_name({**a, "ticks": 5}, ["seed"])
+
+
+@pytest.mark.serial
+def test_sweep_resumes(tmp_path):
+    spec = {"map": MAP, "ticks": 2_000_000, "grid": {"seed": [0, 1]}}
+    messages = []
+
+    results = run_sweep(spec, tmp_path / "out", jobs=2, cache_dir=str(tmp_path / "cache"), report=messages.append)
+    assert [r["seed"] for r in results] == [0, 1]
+    assert all((tmp_path / "out" / r["name"] / "simulation.log").exists() for r in results)
+    with open(tmp_path / "out" / "summary.csv") as f:
+        assert [row["name"] for row in csv.DictReader(f)] == [r["name"] for r in results]
+
+    messages.clear()
+    assert run_sweep(spec, tmp_path / "out", cache_dir=str(tmp_path / "cache"), report=messages.append) == results
+    assert messages[0] == "2 runs, 2 already done"
+
+
+def test_node_config_reaches_node():
+    medium = ClusterMediumService(frozenset({5}), {5: []})
+    log = SimpleLogger(log_path="unused.log")
+    default = Node(5, 0.001, medium, log)
+    custom = Node(5, 0.001, medium, log, NodeConfig(seed=3, slot_count=12, battery_capacity_joule=2.0))
+
+    assert default.protocol.d2d._rng_seed == 5 and default.protocol.app.rng_seed == 5
+    assert custom.protocol.d2d._rng_seed == (3 << 32) | 5
+    assert default.clock.trend == Clock(log, 5, None, 0.001).trend
+    assert custom.clock.trend != default.clock.trend  # the clock drift follows the seed too
+    assert custom.protocol.d2d._slot_count == 12
+    assert custom.battery.capacity == 2.0
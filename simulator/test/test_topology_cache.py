@@ -0,0 +1,71 @@
+"""
+Tests for the on-disk topology cache.
+
+Covers:
+  - A warm load returns the same table, reach map, partition and partition quality as a cold build.
+  - The cache key follows the file content, not the path.
+  - A simulation started from the cache produces the same events as one without it.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from medium.lora_d2d_medium import LoraD2DMedium
+from sim.engine import NetworkTopologyLoader, Simulation
+from sim.topology_cache import TopologyCache
+
+from .simulation_runs import MAPS_DIR, run_simulation
+
+RADIUS = NetworkTopologyLoader.LORA_WAN_RADIUS_M
+
+
+@pytest.mark.parametrize("map_name", ["y.json", "intersection.json", "mega_line.json"])
+def test_warm_load_matches_cold_build(tmp_path, map_name):
+    map_path = MAPS_DIR / map_name
+    reference = NetworkTopologyLoader.from_file(map_path)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {1: 0}, {"edge_cut": 3, "reach_edges": 7, "cross_senders": 2, "balance": 1.5}
+
+    for _ in range(2):
+        entry = TopologyCache(tmp_path).entry(map_path, RADIUS)
+        device_neighbors = NetworkTopologyLoader.from_file(map_path, cache=entry)
+        reach_map = entry.reach_map(device_neighbors)
+        partition = entry.partition("bfs", 2, build)
+
+        assert device_neighbors == reference
+        assert dict(reach_map) == LoraD2DMedium.build_reach_map(reference)
+        assert partition == ({1: 0}, {"edge_cut": 3, "reach_edges": 7, "cross_senders": 2, "balance": 1.5})
+    assert len(builds) == 1
+
+
+def test_key_follows_file_content(tmp_path):
+    copy = tmp_path / "copy.json"
+    shutil.copy(MAPS_DIR / "y.json", copy)
+    cache = TopologyCache(tmp_path / "cache")
+
+    assert cache.entry(copy, RADIUS).path == cache.entry(MAPS_DIR / "y.json", RADIUS).path
+    assert cache.entry(copy, RADIUS).path != cache.entry(copy, 2 * RADIUS).path
+
+    shutil.copy(MAPS_DIR / "long_line.json", copy)
+    assert cache.entry(copy, RADIUS).path == cache.entry(MAPS_DIR / "long_line.json", RADIUS).path
+
+
+def run_cached(log_path: Path, cache_dir: Path | None) -> tuple[list[str], Simulation]:
+    map_path = MAPS_DIR / "y.json"
+    entry = TopologyCache(cache_dir).entry(map_path, RADIUS) if cache_dir is not None else None
+    return run_simulation(log_path, 1_000_000, device_neighbors=NetworkTopologyLoader.from_file(map_path, cache=entry), n_workers=2, topology_cache=entry)
+
+
+@pytest.mark.serial
+def test_cached_run_matches_uncached(tmp_path):
+    reference_log, reference = run_cached(tmp_path / "reference.log", None)
+    run_cached(tmp_path / "cold.log", tmp_path / "cache")
+    cached_log, cached = run_cached(tmp_path / "warm.log", tmp_path / "cache")
+
+    assert cached.partition_quality == reference.partition_quality
+    assert cached_log == reference_log
@@ -0,0 +1,75 @@
+"""
+Tests for the streaming topology loader.
+
+Covers:
+  - JsonObjectStream decodes values cut at any chunk boundary.
+  - from_json (streaming) returns exactly the from_json_eager table on every bundled map.
+  - Unreachable nodes, dangling neighbour ids, overlapping gateways and mixed int/float points.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from sim.engine import NetworkTopologyLoader
+from sim.topology_stream import JsonObjectStream, read_topology
+
+MAPS_DIR = Path(__file__).parent.parent / "maps"
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 2, 3, 7, 64])
+def test_stream_decodes_values_across_chunk_boundaries(chunk_chars):
+    document = {"metadata": {"total_nodes": 123456789, "scale": -1.25e-3}, "empty": {}, "nodes": {"1": {"point": [10, 20.5], "neighbours": [2, 30000]}, "2": {"point": [0, 0]}}, "flag": True, "none": None}
+    text = json.dumps(document, indent=2)
+
+    stream = JsonObjectStream(io.StringIO(text), chunk_chars=chunk_chars)
+    decoded = {}
+    for key in stream.items():
+        if key in ("nodes", "empty"):
+            decoded[key] = {sub: stream.value() for sub in stream.items()}
+        else:
+            decoded[key] = stream.value()
+
+    assert decoded == document
+
+
+def test_stream_rejects_malformed_separator():
+    stream = JsonObjectStream(io.StringIO('{"a": 1 "b": 2}'))
+    with pytest.raises(ValueError, match="Expected ','"):
+        for _ in stream.items():
+            stream.value()
+
+
+@pytest.mark.parametrize("map_path", sorted(MAPS_DIR.glob("*.json")), ids=lambda path: path.name)
+def test_streaming_loader_matches_eager_loader(map_path):
+    streamed, eager = NetworkTopologyLoader.from_json(str(map_path)), NetworkTopologyLoader.from_json_eager(str(map_path))
+
+    assert streamed == eager
+    # Same insertion order and the same int/float position types
+    assert repr(streamed) == repr(eager)
+
+
+def test_streaming_loader_edge_cases(tmp_path):
+    document = {
+        "metadata": {"m_per_svg_x": 2, "m_per_svg_y": 0.5},
+        "nodes": {
+            "1": {"point": [0, 0], "neighbours": [2]},
+            "2": {"point": [100.5, 3], "neighbours": [1, 3, 99]},  # 99 has no entry of its own
+            "3": {"point": [140, 0.0], "neighbours": ["2"]},
+            "4": {"point": [1000, 1000], "neighbours": [5]},  # unreachable pair
+            "5": {"point": [1001, 1000], "neighbours": [4]},
+            "6": {"point": [149.5, 1], "neighbours": []},
+        },
+        "gateways": {"2": {"point": [150, 0]}, "1": {"point": [0, 0.5]}},
+    }
+    path = tmp_path / "edge.json"
+    path.write_text(json.dumps(document))
+
+    streamed, eager = NetworkTopologyLoader.from_json(str(path)), NetworkTopologyLoader.from_json_eager(str(path))
+
+    assert repr(streamed) == repr(eager)
+    assert 4 not in streamed and 5 not in streamed
+    assert streamed[2].neighbors == [1, 3, 99]
+    assert read_topology(str(path)).extra == {"metadata": document["metadata"]}
@@ -0,0 +1,73 @@
+"""
+Tests for the columnar TopologyTable.
+
+Covers:
+  - The table reads like the NodeMediumInfo dict it was built from and survives pickling.
+  - A reach map built from the table equals one built from the dict.
+  - subset() and halo() give a worker its own rows plus the nodes around them.
+  - A migrating node takes its reach row along to the worker that adopts it.
+"""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from custom_types import NodeMediumInfo
+from medium.lora_d2d_medium import LoraD2DMedium
+from sim.engine import ClusterMediumService, NetworkTopologyLoader
+from sim.topology_table import TopologyTable
+
+MAPS_DIR = Path(__file__).parent.parent / "maps"
+
+
+def line_topology(n: int) -> dict[int, NodeMediumInfo]:
+    """Nodes 1..n on a line, gateway n + 1 serving node 1."""
+    topology = {nid: NodeMediumInfo(position=(nid, 0), neighbors=[nb for nb in (nid - 1, nid + 1) if 1 <= nb <= n], gateways_in_range=[n + 1] if nid == 1 else []) for nid in range(1, n + 1)}
+    topology[n + 1] = NodeMediumInfo(position=(0, 0), neighbors=[1], gateways_in_range=[], is_gateway=True)
+    return topology
+
+
+@pytest.mark.parametrize("map_name", ["y.json", "intersection.json", "mega_line.json"])
+def test_table_matches_dict(map_name):
+    device_neighbors = NetworkTopologyLoader.from_file(MAPS_DIR / map_name)
+    table = TopologyTable.from_infos(device_neighbors)
+
+    assert list(table) == list(device_neighbors)
+    assert table == device_neighbors
+    assert pickle.loads(pickle.dumps(table)) == device_neighbors
+    assert LoraD2DMedium.build_reach_map(table) == LoraD2DMedium.build_reach_map(device_neighbors)
+
+
+def test_dict_lookups():
+    table = TopologyTable.from_infos(line_topology(4))
+
+    assert 3 in table and 99 not in table
+    assert table.get(99) is None
+    assert table[1] == NodeMediumInfo(position=(1.0, 0.0), neighbors=[2], gateways_in_range=[5], is_gateway=False)
+    assert table[5].is_gateway
+    assert table.node_ids.dtype.name == "int32" and table.positions.dtype.name == "float64"
+
+
+def test_subset_and_halo():
+    topology = line_topology(6)
+    table = TopologyTable.from_infos(topology)
+    reach_map = {1: [(2, -40.0), (3, -60.0)], 2: [(1, -40.0), (3, -40.0)]}
+
+    assert table.halo({1, 2}) == {3, 7}
+    assert table.halo({1, 2}, reach_map) == {3, 7}
+    assert table.halo({5, 6}) == {4}
+
+    part = table.subset({6, 1, 2, 99})
+    assert list(part) == [1, 2, 6]
+    assert dict(part) == {nid: topology[nid] for nid in (1, 2, 6)}
+    assert len(pickle.dumps(part)) < len(pickle.dumps(table))
+
+
+def test_migrated_node_brings_its_reach_row():
+    source = ClusterMediumService(frozenset({1, 2}), {1: [(2, -40.0)], 2: [(1, -40.0)]})
+    dest = ClusterMediumService(frozenset({3}), {3: []})
+
+    dest.import_node(1, source.export_node(1))
+
+    assert dest._reach_map[1] == [(2, -40.0)]
@@ -0,0 +1,159 @@
+"""
+Tests for the main <-> worker transports.
+
+Covers:
+  - Record codec round trips for tick/window tasks and results, including frame relay through main.
+  - ShmRing wrap-around and overflow.
+  - The medium shares one reception of a packed D2D frame between receivers, each with its own RSSI.
+  - A shm transport run produces the same log as the pipe transport.
+"""
+
+from copy import replace
+
+import pytest
+
+from custom_types import EventNet, EventNetTypes, LoRaD2DFrame, LoRaD2DFrameType, MediumTypes, NodeMediumInfo
+from logger.simple_logger import SimpleLogger
+from medium.lora_d2d_medium import LoraD2DMedium
+from payload_types import PayloadHopCntFull
+from sim.device_event_queue import DeviceEventQueue
+from sim.transport import WORKER_STOP, WORKER_TICK, WORKER_WINDOW, PackedFrame, PackedRSSIFrame, ShmRing, create_channel_pair, decode_result, decode_task, encode_result, encode_task
+
+from .simulation_runs import run_simulation
+
+
+def make_frame(source: int) -> LoRaD2DFrame:
+    payload = PayloadHopCntFull(cnt=3, slot_period_counter=1, use_slot=2, time_offset_from_period_start=5, local_time=100)
+    return LoRaD2DFrame(source_node_id=source, destination_node_id={source + 1}, type=LoRaD2DFrameType.CURRENT_HOP_COUNT, payload=payload)
+
+
+class TestCodec:
+    def test_tick_task_round_trip(self):
+        frame = replace(make_frame(1), rssi=-52.5)
+        incoming = [(2, [EventNet(1, 10, 70, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, frame), EventNet(3, 20, 80, EventNetTypes.CANCELED, MediumTypes.LORA_D2D, [])])]
+        injections = [{"node_id": 2, "payload": "x", "tick": 5}]
+        task = (WORKER_TICK, 100, [2, 5, 7], incoming, injections)
+
+        assert decode_task(encode_task(task)) == task
+
+    def test_window_task_and_control_messages(self):
+        task = (WORKER_WINDOW, 500, [(100, [1, 2], []), (130, [4], [6, 7])], [], [])
+
+        assert decode_task(encode_task(task)) == task
+        assert decode_task(encode_task(WORKER_STOP)) == WORKER_STOP
+
+    def test_untagged_messages_travel_pickled(self):
+        # Shaped like a tick task or result but without the kind tag: nothing may be dropped or reordered
+        task = (100, [2, 5], [], [], 7, 99)
+        result = ([(1, 200)], [], [], ["a\n"], [])
+
+        assert decode_task(encode_task(task)) == task
+        assert decode_result(encode_result(result)) == result
+
+    def test_tick_result_keeps_frames_packed_for_main(self):
+        frame = make_frame(4)
+        reception = EventNet(4, 10, 70, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, replace(frame, rssi=-40))
+        result = (WORKER_TICK, [(1, 200), (2, None)], [(4, MediumTypes.LORA_D2D, frame, 10, 70)], [(5, MediumTypes.LORA_WAN, 11, 90)], ["[INFO] (x) @ 1: é, \n", "line\n"], [(6, reception, 71)])
+
+        kind, next_ticks, transmissions, cancellations, logs, intra = decode_result(encode_result(result))
+
+        assert kind == WORKER_TICK
+        assert next_ticks == [(1, 200), (2, None)]
+        assert cancellations == result[3]
+        assert logs == result[4]
+        assert isinstance(transmissions[0][2], PackedRSSIFrame)
+        assert intra[0][0] == 6 and intra[0][2] == 71
+        assert intra[0][1].data.rssi == -40
+
+    def test_window_result_round_trip(self):
+        result = (WORKER_WINDOW, [100, 100, 130], [(130, 1, [(4, MediumTypes.LORA_WAN, [1, 2], 130, 190)], [], ["a\n"])], [(4, 191, True), (5, None, True), (6, 150, False)], 3)
+
+        kind, processed, per_tick, deferred, suppressed = decode_result(encode_result(result))
+
+        assert kind == WORKER_WINDOW
+        assert processed == [100, 100, 130]
+        assert deferred == [(4, 191, True), (5, None, True), (6, 150, False)]
+        assert suppressed == 3
+        tick, round_, transmissions, _, logs = per_tick[0]
+        assert tick == 130 and round_ == 1 and logs == ["a\n"]
+        assert isinstance(transmissions[0][2], PackedFrame)
+
+    def test_frame_relayed_by_main_reaches_worker_with_receiver_rssi(self):
+        frame = make_frame(4)
+        _, _, transmissions, _, _, _ = decode_result(encode_result((WORKER_TICK, [], [(4, MediumTypes.LORA_D2D, frame, 10, 70)], [], [], [])))
+        packed = transmissions[0][2]
+
+        # What BaseMedium does: one reception shared by both receivers, shipped to one worker
+        reception = EventNet(4, 10, 70, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, packed, rssi={5: -40.0, 6: -52})
+        incoming = [(nid, [reception]) for nid in (5, 6)]
+        _, _, _, delivered, _ = decode_task(encode_task((WORKER_TICK, 71, [5, 6], incoming, [])))
+
+        assert [events[0].data for _, events in delivered] == [replace(frame, rssi=-40.0), replace(frame, rssi=-52)]
+        assert isinstance(delivered[1][1][0].data.rssi, int)
+
+
+def test_medium_shares_packed_frames_with_receiver_rssi(tmp_path):
+    node_neighbors = {
+        1: NodeMediumInfo(position=(0, 0), neighbors=[2], gateways_in_range=[]),
+        2: NodeMediumInfo(position=(1, 0), neighbors=[1, 3], gateways_in_range=[]),
+        3: NodeMediumInfo(position=(2, 0), neighbors=[2], gateways_in_range=[]),
+    }
+    medium = LoraD2DMedium(node_neighbors=node_neighbors, event_queue=DeviceEventQueue(), log=SimpleLogger(str(tmp_path / "log.txt")))
+    medium.add_transmission_event(EventNet(1, 0, 10, EventNetTypes.TRANSMIT, MediumTypes.LORA_D2D, PackedRSSIFrame(b"frame")))
+    medium.propagate_queue(0)
+
+    reception = medium.node_receptions[2][0]
+    assert medium.node_receptions[3][0] is reception
+    assert reception.data_for(2) == PackedRSSIFrame(b"frame", -40.0)
+    assert reception.data_for(3) == PackedRSSIFrame(b"frame", -52.0)
+
+
+class TestShmRing:
+    def test_wrap_around(self):
+        ring = ShmRing.create(64)
+        reader = ShmRing.attach(ring.name)
+        try:
+            # Keep one message in flight so the ring never drains and rewinds
+            pending = b"first"
+            assert ring.write(pending)
+            for i in range(50):
+                msg = bytes([i]) * (7 + i % 20)
+                assert ring.write(msg)
+                assert reader.read(len(pending)) == pending
+                pending = msg
+            assert ring.shm.buf[:8].tobytes() != bytes(8)  # cursors kept growing
+        finally:
+            reader.close()
+            ring.close()
+
+    def test_full_ring_rejects_write(self):
+        ring = ShmRing.create(64)
+        try:
+            assert ring.write(b"x" * 40)
+            assert not ring.write(b"y" * 30)
+        finally:
+            ring.close()
+
+    def test_oversized_message_travels_inline(self):
+        main_end, worker_end = create_channel_pair("shm", ring_bytes=64)
+        try:
+            task = (WORKER_TICK, 1, list(range(100)), [], [])
+            main_end.send(task)
+            assert worker_end.recv() == task
+        finally:
+            worker_end.close()
+            main_end.close()
+
+    def test_unknown_transport(self):
+        with pytest.raises(ValueError):
+            create_channel_pair("carrier-pigeon")
+
+
+@pytest.mark.serial
+@pytest.mark.parametrize("lookahead", [False, True])
+def test_shm_transport_matches_pipe(lookahead, tmp_path):
+    pipe_log, _ = run_simulation(tmp_path / "pipe.log", n_workers=2, lookahead=lookahead, transport="pipe")
+    shm_log, _ = run_simulation(tmp_path / "shm.log", n_workers=2, lookahead=lookahead, transport="shm")
+
+    assert len(pipe_log) > 1
+    assert shm_log == pipe_log